@@ -6,6 +6,7 @@ from services.data_mysql_service import get_energy_from_db, get_gdp_from_db
 # from services.scheduler_service import initialize_scheduler  # DISABLED: Tidak reliable di lokal
 from services.database_service import init_database
 from services.data_mysql_service import init_data_tables
+from services.response_cache import cached_response
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-change-this-in-production'  # Untuk session management
@@ -32,6 +33,7 @@ def metode():
     return render_template("metode.html")
 
 @app.route('/api/dashboard/actual-gdp')
+@cached_response
 def api_actual_gdp():
 
     energy_rows = get_energy_from_db()
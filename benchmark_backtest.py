@@ -0,0 +1,89 @@
+"""
+Benchmark backtest rolling-origin: fit ulang per origin vs extend state
+
+Data energi & GDP dari data store (atau fixture sintetis dengan --synthetic).
+Dibandingkan:
+
+1. Fit SARIMAX penuh di setiap origin (cara models/rolling_forecast_validation.py)
+2. backtest_service.rolling_backtest: fit sekali, lalu extend() per origin
+3. rolling_backtest dengan refit parsial (warm start) setiap k origin
+
+Yang diukur: wall time dan selisih MAPE per horizon terhadap cara 1.
+
+Usage:
+    python benchmark_backtest.py [--order 1 1 1] [--horizon 3] [--min-train 30] [--refit-every 5]
+"""
+
+import argparse
+import time
+import numpy as np
+
+from services import data_store
+from services.backtest_service import rolling_backtest, _fit, _error_summary
+
+
+def synthetic_data(n_years=60, seed=42):
+    rng = np.random.default_rng(seed)
+    gdp = 100 * np.cumprod(1 + rng.normal(0.05, 0.02, n_years))
+    energy = 50 + 0.8 * gdp + np.cumsum(rng.normal(0, 5, n_years))
+    return energy, gdp, np.arange(1965, 1965 + n_years)
+
+
+def refit_backtest(y, exog, order, horizon, min_train):
+    """Cara lama: fit penuh dari awal di setiap origin"""
+    exog = exog.reshape(len(y), -1)
+    actual_by_step = [[] for _ in range(horizon)]
+    predicted_by_step = [[] for _ in range(horizon)]
+    for origin in range(min_train, len(y)):
+        result = _fit(y[:origin], exog[:origin], order)
+        steps = min(horizon, len(y) - origin)
+        forecast = np.asarray(result.forecast(steps=steps, exog=exog[origin:origin + steps]), dtype=float)
+        for step in range(steps):
+            actual_by_step[step].append(y[origin + step])
+            predicted_by_step[step].append(forecast[step])
+    return [_error_summary(a, p) for a, p in zip(actual_by_step, predicted_by_step) if a]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--order', type=int, nargs=3, default=[1, 1, 1])
+    parser.add_argument('--horizon', type=int, default=3)
+    parser.add_argument('--min-train', type=int, default=30)
+    parser.add_argument('--refit-every', type=int, default=5)
+    parser.add_argument('--synthetic', action='store_true')
+    args = parser.parse_args()
+
+    df = None if args.synthetic else data_store.get_aligned_data()
+    if df is not None and not df.empty:
+        y, exog, years = df['energy'].to_numpy(), df['gdp'].to_numpy(), df['year'].to_numpy()
+        source = "data store"
+    else:
+        y, exog, years = synthetic_data()
+        source = "sintetis"
+    order = tuple(args.order)
+
+    print("=" * 80)
+    print(f"BENCHMARK BACKTEST ROLLING-ORIGIN ARIMAX{order} ({len(y)} tahun {source}, "
+          f"{len(y) - args.min_train} origin, horizon {args.horizon})")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    reference = refit_backtest(y, exog, order, args.horizon, args.min_train)
+    t_refit = time.perf_counter() - start
+
+    runs = [("fit ulang per origin", t_refit, reference)]
+    for name, refit_every in (("extend (fit sekali)", 0), (f"extend + refit tiap {args.refit_every}", args.refit_every)):
+        start = time.perf_counter()
+        result = rolling_backtest(y, exog, order, years=years, horizon=args.horizon,
+                                  min_train=args.min_train, refit_every=refit_every)
+        runs.append((name, time.perf_counter() - start, result['per_horizon']))
+
+    print(f"\n{'cara':<28} {'waktu (ms)':>11} " + " ".join(f"{'MAPE h' + str(h + 1):>9}" for h in range(args.horizon)))
+    for name, elapsed, per_horizon in runs:
+        mapes = " ".join(f"{row['mape']:>9.3f}" for row in per_horizon)
+        print(f"{name:<28} {elapsed * 1000:>11.1f} {mapes}")
+    print(f"\nSpeedup extend vs fit ulang: {t_refit / runs[1][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark bulk upsert energy/GDP vs loop per baris (iterrows)
+
+Untuk 1k dan 100k baris sintetis dibandingkan:
+1. Konversi DataFrame: df.iterrows() vs dataframe_to_rows (NumPy)
+2. Upsert ke MySQL: satu INSERT per baris vs bulk_upsert (executemany per batch)
+
+Bagian MySQL memakai tabel sementara `bench_energy_data` (dibuat & dihapus
+oleh script ini), jadi data energy_data asli tidak tersentuh. Jika MySQL
+tidak tersedia, hanya bagian konversi yang dijalankan.
+
+Usage:
+    python benchmark_bulk_upsert.py [--rows 1000 100000]
+"""
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from services.database_service import get_db_connection
+from services.data_mysql_service import dataframe_to_rows, bulk_upsert
+
+BENCH_TABLE = "bench_energy_data"
+BENCH_QUERY = f"""
+    INSERT INTO {BENCH_TABLE} (year, fossil_fuels_twh)
+    VALUES (%s, %s)
+    ON DUPLICATE KEY UPDATE
+        fossil_fuels_twh = VALUES(fossil_fuels_twh),
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
+def synthetic_energy(n_rows, seed=42):
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(10, 2000, n_rows)
+    values[rng.random(n_rows) < 0.01] = np.nan
+    return pd.DataFrame({'Year': np.arange(1, n_rows + 1), 'fossil_fuels__twh': values})
+
+
+def rows_iterrows(df):
+    rows = []
+    for _, row in df.iterrows():
+        value = float(row['fossil_fuels__twh']) if pd.notna(row['fossil_fuels__twh']) else None
+        if value is not None:
+            rows.append((int(row['Year']), value))
+    return rows
+
+
+def upsert_row_by_row(connection, rows):
+    cursor = connection.cursor()
+    cursor.execute(f"DELETE FROM {BENCH_TABLE}")
+    for row in rows:
+        cursor.execute(BENCH_QUERY, row)
+    connection.commit()
+    cursor.close()
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 100000])
+    args = parser.parse_args()
+
+    connection = get_db_connection()
+    if connection:
+        cursor = connection.cursor()
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {BENCH_TABLE} (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                year INT NOT NULL UNIQUE,
+                entity VARCHAR(100) DEFAULT 'Indonesia',
+                fossil_fuels_twh DECIMAL(15, 4),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            )
+        """)
+        connection.commit()
+        cursor.close()
+    else:
+        print("⚠ MySQL tidak tersedia, hanya benchmark konversi DataFrame")
+
+    print("=" * 80)
+    print("BENCHMARK BULK UPSERT")
+    print("=" * 80)
+
+    try:
+        for n_rows in args.rows:
+            df = synthetic_energy(n_rows)
+            print(f"\n{n_rows:,} baris:")
+
+            t_iter = timed(rows_iterrows, df)
+            t_numpy = timed(dataframe_to_rows, df, 'Year', 'fossil_fuels__twh')
+            assert rows_iterrows(df) == dataframe_to_rows(df, 'Year', 'fossil_fuels__twh')
+            print(f"  Konversi : iterrows {t_iter * 1000:9.1f} ms | numpy {t_numpy * 1000:9.1f} ms "
+                  f"| {t_iter / t_numpy:6.1f}x")
+
+            if connection:
+                rows = dataframe_to_rows(df, 'Year', 'fossil_fuels__twh')
+                t_loop = timed(upsert_row_by_row, connection, rows)
+                t_bulk = timed(lambda: bulk_upsert(connection, BENCH_TABLE, rows, query=BENCH_QUERY))
+                print(f"  Upsert   : per baris {t_loop * 1000:8.1f} ms | bulk  {t_bulk * 1000:9.1f} ms "
+                      f"| {t_loop / t_bulk:6.1f}x")
+    finally:
+        if connection:
+            cursor = connection.cursor()
+            cursor.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+            connection.commit()
+            cursor.close()
+            connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark fetch energi + GDP: berurutan vs bersamaan (download_sources)
+
+Server HTTP lokal menggantikan OWID & World Bank dengan latency buatan per
+sumber. Cache di-nonaktifkan (TTL 0, payload tanpa ETag) supaya setiap fetch
+benar-benar mengunduh. Yang dicek:
+
+1. Latency: berurutan ~ jumlah latency, bersamaan ~ latency terlama
+2. Retry: sumber yang gagal (503) sekali tetap berhasil lewat backoff
+3. Deadline: sumber yang lebih lambat dari deadline dibatalkan (TimeoutError)
+
+Usage:
+    python benchmark_concurrent_fetch.py [--energy-delay 0.8] [--gdp-delay 0.5]
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from services import http_cache
+from services.update_data_api import download_sources
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Payload statis dengan delay per path; server.failures {path: n} -> n kali 503"""
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        time.sleep(self.server.delays.get(path, 0))
+        if self.server.failures.get(path, 0) > 0:
+            self.server.failures[path] -= 1
+            self.send_error(503)
+            return
+        payload = b"x" * 256 * 1024
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(delays):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    server.delays = delays
+    server.failures = {}
+    server.handle_error = lambda request, client_address: None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--energy-delay', type=float, default=0.8)
+    parser.add_argument('--gdp-delay', type=float, default=0.5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        http_cache.configure_cache(ttl=0, cache_dir=tmp_dir)
+        server = start_server({'/energy.csv': args.energy_delay, '/gdp.json': args.gdp_delay})
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        urls = {'energy': f"{base_url}/energy.csv", 'gdp': f"{base_url}/gdp.json"}
+
+        print("=" * 80)
+        print(f"BENCHMARK FETCH BERSAMAAN (delay energi {args.energy_delay} s, GDP {args.gdp_delay} s)")
+        print("=" * 80)
+
+        try:
+            start = time.perf_counter()
+            for url in urls.values():
+                http_cache.fetch(url)
+            sequential = time.perf_counter() - start
+
+            start = time.perf_counter()
+            download_sources(urls)
+            concurrent = time.perf_counter() - start
+            print(f"\nBerurutan : {sequential * 1000:7.0f} ms")
+            print(f"Bersamaan : {concurrent * 1000:7.0f} ms ({sequential / concurrent:.2f}x)")
+
+            server.failures['/gdp.json'] = 1
+            start = time.perf_counter()
+            results = download_sources(urls, retries=2)
+            print(f"\nRetry     : GDP gagal 1x lalu {results['gdp'].status} dalam "
+                  f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+            server.delays['/energy.csv'] = 5.0
+            http_cache.clear_cache()
+            start = time.perf_counter()
+            try:
+                download_sources(urls, deadline=1.5)
+                print("\n✗ Deadline tidak berlaku")
+            except TimeoutError as e:
+                print(f"\nDeadline  : {e} setelah {(time.perf_counter() - start) * 1000:.0f} ms")
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
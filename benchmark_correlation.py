@@ -0,0 +1,81 @@
+"""
+Benchmark ACF/PACF bersama (services.correlation)
+
+Untuk data energi (dan random walk sintetis yang lebih panjang) dibandingkan:
+
+1. Cara lama: acf(fft=False) + pacf(method='ywm') untuk identifikasi, lalu
+   plot_acf + plot_pacf menghitung ulang keduanya untuk plot
+2. correlations(): ACF lewat FFT + PACF Durbin-Levinson, sekali (cache kosong)
+3. correlations() dengan cache terisi (identifikasi & plot memakai hasil sama)
+
+Yang diukur: waktu hitung saja (tanpa render plot) dan selisih maksimum
+nilai ACF/PACF terhadap statsmodels.
+
+Usage:
+    python benchmark_correlation.py [--nlags 20] [--d 2] [--repeat 20] [--sizes 600 6000]
+"""
+
+import argparse
+import time
+import warnings
+import numpy as np
+from statsmodels.tsa.stattools import acf, pacf
+
+from services import data_store
+from services import correlation
+
+
+def legacy(series, nlags):
+    # Identifikasi + plot_acf/plot_pacf (alpha=0.05) = dua kali hitung
+    values = acf(series, nlags=nlags, fft=False), pacf(series, nlags=nlags, method='ywm')
+    acf(series, nlags=nlags, fft=False, alpha=0.05)
+    pacf(series, nlags=nlags, method='ywm', alpha=0.05)
+    return values
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nlags', type=int, default=20)
+    parser.add_argument('--d', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--sizes', type=int, nargs='*', default=[600, 6000])
+    args = parser.parse_args()
+
+    datasets = []
+    df = data_store.get_aligned_data()
+    if df is not None and not df.empty:
+        datasets.append(("energi", df['energy'].to_numpy(dtype=float)))
+    rng = np.random.default_rng(0)
+    for size in args.sizes:
+        datasets.append((f"sintetis n={size}", np.cumsum(np.cumsum(rng.normal(size=size)))))
+
+    print("=" * 80)
+    print(f"BENCHMARK ACF/PACF (nlags={args.nlags}, d={args.d}, {args.repeat} run)")
+    print("=" * 80)
+    print(f"\n{'data':<20} {'lama (ms)':>11} {'kosong (ms)':>12} {'terisi (ms)':>12} {'selisih maks':>13}")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for label, values in datasets:
+            series = np.diff(values, n=args.d)
+            (acf_ref, pacf_ref), t_legacy = timed(lambda: legacy(series, args.nlags), args.repeat)
+
+            def cold():
+                correlation.clear_cache()
+                return correlation.correlations(values, nlags=args.nlags, d=args.d)
+
+            result, t_cold = timed(cold, args.repeat)
+            _, t_warm = timed(lambda: correlation.correlations(values, nlags=args.nlags, d=args.d), args.repeat)
+            max_diff = max(np.abs(result['acf'] - acf_ref).max(), np.abs(result['pacf'] - pacf_ref).max())
+            print(f"{label:<20} {t_legacy * 1000:>11.3f} {t_cold * 1000:>12.3f} {t_warm * 1000:>12.3f} {max_diff:>13.1e}")
+
+
+if __name__ == "__main__":
+    main()
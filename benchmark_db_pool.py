@@ -0,0 +1,91 @@
+"""
+Benchmark connection pool MySQL vs koneksi baru per request
+
+Mensimulasikan satu page load dashboard (beberapa endpoint, masing-masing
+membuka koneksi dan menjalankan query kecil) dengan dua cara:
+1. mysql.connector.connect() baru untuk setiap query (cara lama)
+2. services.db_pool.get_connection() (koneksi dipakai ulang)
+
+Jumlah handshake TCP/auth diukur dari counter server
+`SHOW GLOBAL STATUS LIKE 'Connections'`.
+
+Usage:
+    python benchmark_db_pool.py [--page-loads 200] [--host localhost] [--user root]
+                                [--password ''] [--database arimax_forecasting]
+"""
+
+import argparse
+import time
+import mysql.connector
+
+from services import db_pool
+
+# Query per page load dashboard: energy, gdp, active model (2x), simpan prediksi
+QUERIES_PER_PAGE_LOAD = 5
+
+
+def server_connections(config):
+    connection = mysql.connector.connect(**config)
+    cursor = connection.cursor()
+    cursor.execute("SHOW GLOBAL STATUS LIKE 'Connections'")
+    value = int(cursor.fetchone()[1])
+    cursor.close()
+    connection.close()
+    return value
+
+
+def run_queries(open_connection, page_loads):
+    start = time.perf_counter()
+    for _ in range(page_loads):
+        for _ in range(QUERIES_PER_PAGE_LOAD):
+            connection = open_connection()
+            cursor = connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            cursor.close()
+            connection.close()
+    return time.perf_counter() - start
+
+
+def measure(label, config, open_connection, page_loads):
+    before = server_connections(config)
+    elapsed = run_queries(open_connection, page_loads)
+    # -1: koneksi yang dibuka server_connections() sendiri
+    handshakes = server_connections(config) - before - 1
+    total = page_loads * QUERIES_PER_PAGE_LOAD
+    print(f"  {label:<22} {elapsed * 1000:>10.1f} ms total  "
+          f"{elapsed / total * 1000:>7.3f} ms/query  {handshakes:>6} handshakes")
+    return elapsed, handshakes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--page-loads', type=int, default=200)
+    parser.add_argument('--host', default=db_pool.DB_CONFIG['host'])
+    parser.add_argument('--user', default=db_pool.DB_CONFIG['user'])
+    parser.add_argument('--password', default=db_pool.DB_CONFIG['password'])
+    parser.add_argument('--database', default=db_pool.DB_CONFIG['database'])
+    args = parser.parse_args()
+
+    config = {'host': args.host, 'user': args.user, 'password': args.password, 'database': args.database}
+    db_pool.configure_pool(**config)
+
+    print("=" * 80)
+    print(f"BENCHMARK CONNECTION POOL ({args.page_loads} page loads x {QUERIES_PER_PAGE_LOAD} query)")
+    print("=" * 80)
+
+    direct_time, direct_handshakes = measure(
+        "connect() per query", config, lambda: mysql.connector.connect(**config), args.page_loads
+    )
+    pool_time, pool_handshakes = measure(
+        "db_pool.get_connection", config, db_pool.get_connection, args.page_loads
+    )
+
+    print()
+    print(f"Speedup: {direct_time / pool_time:.1f}x, "
+          f"handshake dihemat: {direct_handshakes - pool_handshakes}")
+    print(f"Pool stats: {db_pool.get_pool_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark ingest CSV energi OWID: pd.read_csv + filter vs streaming
+
+Membuat fixture CSV besar bergaya OWID (Entity,code,Year,fossil_fuels__twh,
+terurut per entity, Indonesia di tengah) lalu menyajikannya lewat HTTP
+server lokal sebagai pengganti URL OWID. Dibandingkan:
+
+1. pd.read_csv(url) lalu filter Entity == Indonesia (cara lama)
+2. energy_ingest.read_energy_csv(url) (streaming + berhenti setelah blok)
+3. read_energy_csv dengan stop_after_block=False (scan seluruh file)
+
+Yang diukur: wall time, peak memori Python (tracemalloc), dan kesamaan
+hasil dengan cara lama.
+
+Usage:
+    python benchmark_energy_ingest.py [--entities 5000] [--years 1800 2024]
+"""
+
+import argparse
+import functools
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+import numpy as np
+import pandas as pd
+
+from services.energy_ingest import read_energy_csv, ENERGY_ENTITY
+
+
+def write_fixture(path, n_entities, start_year, end_year, seed=42):
+    """Fixture OWID sintetis: n_entities negara x rentang tahun, terurut per entity"""
+    rng = np.random.default_rng(seed)
+    # Awalan huruf acak supaya Indonesia berada di tengah urutan entity
+    prefixes = rng.choice(list("ABCDEFGHJKLMNOPRSTUVWZ"), n_entities - 1)
+    names = sorted({f"{prefix}-country {i:05d}" for i, prefix in enumerate(prefixes)} | {ENERGY_ENTITY})
+    years = np.arange(start_year, end_year + 1)
+    with open(path, 'w', newline='') as f:
+        f.write("Entity,code,Year,fossil_fuels__twh\n")
+        for name in names:
+            code = "IDN" if name == ENERGY_ENTITY else f"C{abs(hash(name)) % 100000:05d}"
+            values = rng.uniform(1, 5000, len(years)).round(4)
+            f.writelines(f"{name},{code},{year},{value}\n" for year, value in zip(years, values))
+    return len(names) * len(years)
+
+
+def serve_directory(directory):
+    handler = functools.partial(QuietHandler, directory=directory)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    # Client yang berhenti lebih awal memutus koneksi; bukan error
+    server.handle_error = lambda request, client_address: None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def read_full(url):
+    energy_df = pd.read_csv(url)
+    return energy_df[energy_df["Entity"] == ENERGY_ENTITY].reset_index(drop=True)
+
+
+def measure(func, *args, **kwargs):
+    """Wall time (tanpa tracemalloc, karena overhead-nya besar) lalu peak memori"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entities', type=int, default=5000)
+    parser.add_argument('--years', type=int, nargs=2, default=[1800, 2024])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fixture = os.path.join(tmp_dir, "fossil-fuel-primary-energy.csv")
+        n_rows = write_fixture(fixture, args.entities, *args.years)
+        server = serve_directory(tmp_dir)
+        url = f"http://127.0.0.1:{server.server_address[1]}/fossil-fuel-primary-energy.csv"
+
+        print("=" * 80)
+        print(f"BENCHMARK INGEST CSV ENERGI ({n_rows:,} baris, {os.path.getsize(fixture) / 1e6:.1f} MB)")
+        print("=" * 80)
+
+        try:
+            reference, t_full, m_full = measure(read_full, url)
+            streamed, t_stream, m_stream = measure(read_energy_csv, url)
+            scanned, t_scan, m_scan = measure(read_energy_csv, url, stop_after_block=False)
+        finally:
+            server.shutdown()
+
+        for df in (streamed, scanned):
+            pd.testing.assert_frame_equal(df, reference, check_dtype=False)
+
+        print(f"\n{'cara':<28} {'waktu (ms)':>11} {'peak (MB)':>10} {'baris':>7}")
+        for name, elapsed, peak, df in (
+            ("pd.read_csv + filter", t_full, m_full, reference),
+            ("streaming (stop di blok)", t_stream, m_stream, streamed),
+            ("streaming (scan penuh)", t_scan, m_scan, scanned),
+        ):
+            print(f"{name:<28} {elapsed * 1000:>11.1f} {peak / 1e6:>10.2f} {len(df):>7}")
+        print(f"\n✓ Hasil streaming sama dengan pd.read_csv + filter ({len(reference)} baris {ENERGY_ENTITY})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark cara membuat model final ARIMAX (train_service.fit_final_model)
+
+Untuk beberapa order dibandingkan mode final_fit:
+- full   : fit ulang dari awal di semua data (cara lama)
+- warm   : fit ulang dengan start_params dari hasil fit data training
+- append : hasil fit training diperluas dengan data test (refit=False)
+
+Yang diukur: wall time, selisih parameter & log-likelihood terhadap 'full',
+dan selisih forecast 10 tahun (GDP tumbuh 5%/tahun).
+
+Usage:
+    python benchmark_final_fit.py [--orders 1,2,1 3,2,6 0,2,10] [--split 0.8] [--repeat 3]
+"""
+
+import argparse
+import time
+import warnings
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+warnings.filterwarnings('ignore')
+
+from services.train_service import fit_final_model, FINAL_FIT_MODES
+
+
+def load_data():
+    energy = pd.read_csv("data/raw/energy.csv")[["Year", "fossil_fuels__twh"]]
+    energy.columns = ["year", "energy"]
+    gdp = pd.read_csv("data/raw/gdp.csv")[["year", "gdp"]]
+    df = pd.merge(
+        energy.drop_duplicates(subset=["year"]),
+        gdp.drop_duplicates(subset=["year"]),
+        on="year", how="inner"
+    ).dropna().sort_values("year").reset_index(drop=True)
+    return df["energy"], df[["gdp"]]
+
+
+def future_exog(exog, steps=10, growth=0.05):
+    last_gdp = float(exog["gdp"].iloc[-1])
+    return pd.DataFrame({"gdp": last_gdp * np.cumprod(np.full(steps, 1 + growth))})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--orders', nargs='+', default=['1,2,1', '3,2,6', '0,2,10'])
+    parser.add_argument('--split', type=float, default=0.8)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    y, exog = load_data()
+    train_size = int(len(y) * args.split)
+    y_train, y_test = y.iloc[:train_size], y.iloc[train_size:]
+    exog_train, exog_test = exog.iloc[:train_size], exog.iloc[train_size:]
+    exog_future = future_exog(exog)
+
+    print("=" * 80)
+    print(f"BENCHMARK FINAL FIT ({len(y)} data, train {train_size}, repeat {args.repeat})")
+    print("=" * 80)
+
+    for order_text in args.orders:
+        order = tuple(int(x) for x in order_text.split(','))
+        train_result = SARIMAX(
+            y_train, exog=exog_train, order=order,
+            enforce_stationarity=False, enforce_invertibility=False
+        ).fit(disp=False)
+
+        print(f"\nOrder {order}:")
+        print(f"  {'mode':<8} {'waktu (ms)':>11} {'max |Δparam|':>13} {'Δllf':>10} {'max |Δforecast|':>16}")
+
+        reference = None
+        for mode in ('full',) + tuple(m for m in FINAL_FIT_MODES if m != 'full'):
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                final_result = fit_final_model(train_result, y, exog, order, y_test, exog_test, mode)
+                times.append(time.perf_counter() - start)
+
+            forecast = np.asarray(final_result.forecast(steps=len(exog_future), exog=exog_future))
+            if reference is None:
+                reference = (np.asarray(final_result.params), final_result.llf, forecast)
+
+            param_diff = np.max(np.abs(np.asarray(final_result.params) - reference[0]))
+            llf_diff = final_result.llf - reference[1]
+            forecast_diff = np.max(np.abs(forecast - reference[2]))
+            print(f"  {mode:<8} {np.median(times) * 1000:>11.1f} {param_diff:>13.4g} {llf_diff:>10.3f} {forecast_diff:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
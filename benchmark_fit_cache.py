@@ -0,0 +1,84 @@
+"""
+Benchmark cache hasil fit SARIMAX (services.fit_cache)
+
+Grid kandidat order (seperti mode auto retrain_model) di-fit tiga kali
+dengan database cache sementara:
+
+1. Cache nonaktif (cara lama)
+2. Cache kosong (fit + tulis ke cache)
+3. Cache terisi (rekonstruksi dari parameter tersimpan, tanpa optimizer)
+
+Yang diukur: wall time, jumlah hit/miss, dan kesamaan AIC & MAPE dengan
+hasil tanpa cache.
+
+Usage:
+    python benchmark_fit_cache.py [--d 2] [--max-p 3] [--max-q 3] [--split 0.8]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+
+from services import data_store
+from services import fit_cache
+from services.order_search import build_order_grid, search_orders
+
+
+def run(label, y_train, exog_train, y_test, exog_test, candidates):
+    before = fit_cache.get_cache_stats()
+    start = time.perf_counter()
+    result = search_orders(y_train, exog_train, candidates, y_test, exog_test, max_workers=1, patience=None)
+    elapsed = time.perf_counter() - start
+    after = fit_cache.get_cache_stats()
+    hits = after['hits'] - before['hits']
+    misses = after['misses'] - before['misses']
+    print(f"{label:<22} {elapsed * 1000:>11.1f} {hits:>6} {misses:>6}  best={result['best_order']}")
+    return {tuple(row['order']): row for row in result['results']}, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--d', type=int, default=2)
+    parser.add_argument('--max-p', type=int, default=3)
+    parser.add_argument('--max-q', type=int, default=3)
+    parser.add_argument('--split', type=float, default=0.8)
+    args = parser.parse_args()
+
+    df = data_store.get_aligned_data()
+    if df is None or df.empty:
+        print("⚠ Data energi & GDP belum tersedia, benchmark dibatalkan")
+        return
+
+    train_size = int(len(df) * args.split)
+    y, exog = df['energy'], df[['gdp']]
+    y_train, y_test = y.iloc[:train_size], y.iloc[train_size:]
+    exog_train, exog_test = exog.iloc[:train_size], exog.iloc[train_size:]
+    candidates = build_order_grid(args.d, max_p=args.max_p, max_q=args.max_q)
+
+    print("=" * 80)
+    print(f"BENCHMARK CACHE FIT SARIMAX ({len(candidates)} kandidat, d={args.d}, train {train_size}, test {len(y_test)})")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fit_cache.configure_cache(path=os.path.join(tmp_dir, "fit_cache.db"))
+        print(f"\n{'cara':<22} {'waktu (ms)':>11} {'hit':>6} {'miss':>6}")
+
+        fit_cache.configure_cache(enabled=False)
+        reference, t_plain = run("tanpa cache", y_train, exog_train, y_test, exog_test, candidates)
+        fit_cache.configure_cache(enabled=True)
+        _, t_cold = run("cache kosong", y_train, exog_train, y_test, exog_test, candidates)
+        cached, t_warm = run("cache terisi", y_train, exog_train, y_test, exog_test, candidates)
+
+    max_diff = max(
+        abs(cached[order][metric] - row[metric])
+        for order, row in reference.items() if row['status'] == 'success'
+        for metric in ('aic', 'mape')
+    )
+    print(f"\nSelisih maksimum AIC/MAPE vs tanpa cache: {max_diff:.2e}")
+    print(f"Speedup cache terisi vs tanpa cache: {t_plain / t_warm:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Benchmark query staging & ringkasan training_history sebelum/sesudah index
+
+Tabel sementara `bench_training_history` diisi N baris sintetis (default
+100k), lalu query berikut dijalankan tanpa index dan setelah index dari
+database_service.HISTORY_INDEXES ditambahkan:
+
+- model aktif     : WHERE model_status = 'active' ORDER BY activated_at DESC
+- kandidat        : WHERE model_status = 'candidate' ORDER BY training_date DESC
+- riwayat         : ORDER BY training_date DESC LIMIT 50
+- hari ini (lama) : DATE(training_date) = CURDATE()
+- hari ini (baru) : training_date >= CURDATE() AND < CURDATE() + 1 hari
+- total           : COUNT(*) vs history_counters (lookup primary key)
+
+Untuk tiap query ditampilkan EXPLAIN (type, key, rows) dan latency median.
+Tabel benchmark dihapus di akhir, data asli tidak tersentuh.
+
+Usage:
+    python benchmark_history_queries.py [--rows 100000] [--repeat 20]
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+import numpy as np
+
+from services.database_service import get_db_connection, HISTORY_INDEXES
+
+BENCH_TABLE = "bench_training_history"
+BENCH_COUNTERS = "bench_history_counters"
+
+QUERIES = [
+    ("model aktif", f"""
+        SELECT id, activated_at FROM {BENCH_TABLE}
+        WHERE model_status = 'active' ORDER BY activated_at DESC LIMIT 1
+    """),
+    ("kandidat", f"""
+        SELECT id, training_date, mape FROM {BENCH_TABLE}
+        WHERE model_status = 'candidate' ORDER BY training_date DESC LIMIT 10
+    """),
+    ("riwayat", f"""
+        SELECT id, training_date, mape FROM {BENCH_TABLE}
+        ORDER BY training_date DESC LIMIT 50
+    """),
+    ("hari ini (DATE())", f"""
+        SELECT COUNT(*) FROM {BENCH_TABLE} WHERE DATE(training_date) = CURDATE()
+    """),
+    ("hari ini (range)", f"""
+        SELECT COUNT(*) FROM {BENCH_TABLE}
+        WHERE training_date >= CURDATE() AND training_date < CURDATE() + INTERVAL 1 DAY
+    """),
+    ("total COUNT(*)", f"SELECT COUNT(*) FROM {BENCH_TABLE}"),
+    ("total counter", f"SELECT value FROM {BENCH_COUNTERS} WHERE name = 'training_history'"),
+]
+
+
+def create_tables(cursor):
+    cursor.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+    cursor.execute(f"""
+        CREATE TABLE {BENCH_TABLE} (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            training_date DATETIME NOT NULL,
+            p INT NOT NULL,
+            d INT NOT NULL,
+            q INT NOT NULL,
+            mape DECIMAL(10, 4),
+            model_status VARCHAR(20) DEFAULT 'candidate',
+            activated_at DATETIME NULL,
+            notes TEXT
+        )
+    """)
+    cursor.execute(f"DROP TABLE IF EXISTS {BENCH_COUNTERS}")
+    cursor.execute(f"""
+        CREATE TABLE {BENCH_COUNTERS} (
+            name VARCHAR(50) PRIMARY KEY,
+            value BIGINT NOT NULL DEFAULT 0
+        )
+    """)
+
+
+def seed_rows(connection, n_rows, batch_size=5000, seed=42):
+    """Mayoritas archived, sebagian kecil candidate, satu active"""
+    rng = np.random.default_rng(seed)
+    now = datetime.now()
+    offsets = np.sort(rng.uniform(0, 5 * 365 * 24 * 3600, n_rows))[::-1]
+    statuses = np.where(rng.random(n_rows) < 0.02, 'candidate', 'archived')
+    statuses[-1] = 'active'
+
+    rows = []
+    for i in range(n_rows):
+        training_date = now - timedelta(seconds=float(offsets[i]))
+        activated_at = training_date if statuses[i] != 'candidate' else None
+        rows.append((
+            training_date, int(rng.integers(0, 4)), 1, int(rng.integers(0, 4)),
+            float(rng.uniform(1, 20)), str(statuses[i]), activated_at, 'benchmark'
+        ))
+
+    cursor = connection.cursor()
+    for start in range(0, n_rows, batch_size):
+        cursor.executemany(f"""
+            INSERT INTO {BENCH_TABLE} (training_date, p, d, q, mape, model_status, activated_at, notes)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """, rows[start:start + batch_size])
+    cursor.execute(
+        f"INSERT INTO {BENCH_COUNTERS} (name, value) SELECT 'training_history', COUNT(*) FROM {BENCH_TABLE}"
+    )
+    connection.commit()
+    cursor.close()
+
+
+def explain(cursor, query):
+    cursor.execute("EXPLAIN " + query)
+    plan = cursor.fetchall()[0]
+    return f"type={plan['type']}, key={plan['key']}, rows={plan['rows']}, extra={plan['Extra'] or '-'}"
+
+
+def measure(cursor, query, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cursor.execute(query)
+        cursor.fetchall()
+        times.append(time.perf_counter() - start)
+    return np.median(times) * 1000
+
+
+def run_queries(connection, label, repeat):
+    print(f"\n{label}:")
+    cursor = connection.cursor(dictionary=True)
+    latencies = {}
+    for name, query in QUERIES:
+        latencies[name] = measure(cursor, query, repeat)
+        print(f"  {name:<18} {latencies[name]:8.2f} ms  | {explain(cursor, query)}")
+    cursor.close()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    connection = get_db_connection()
+    if not connection:
+        print("⚠ MySQL/MariaDB tidak tersedia, benchmark dibatalkan")
+        return
+
+    print("=" * 80)
+    print(f"BENCHMARK QUERY TRAINING_HISTORY ({args.rows:,} baris, repeat {args.repeat})")
+    print("=" * 80)
+
+    try:
+        cursor = connection.cursor()
+        create_tables(cursor)
+        cursor.close()
+
+        start = time.perf_counter()
+        seed_rows(connection, args.rows)
+        print(f"Seed: {time.perf_counter() - start:.1f} s")
+
+        before = run_queries(connection, "Tanpa index", args.repeat)
+
+        cursor = connection.cursor()
+        for index_name, columns in HISTORY_INDEXES['training_history']:
+            cursor.execute(f"ALTER TABLE {BENCH_TABLE} ADD INDEX {index_name} ({columns})")
+        cursor.execute(f"ANALYZE TABLE {BENCH_TABLE}")
+        cursor.fetchall()
+        cursor.close()
+
+        after = run_queries(connection, "Dengan index", args.repeat)
+
+        print("\nSpeedup:")
+        for name, _ in QUERIES:
+            print(f"  {name:<18} {before[name]:8.2f} ms -> {after[name]:8.2f} ms  ({before[name] / after[name]:6.1f}x)")
+    finally:
+        cursor = connection.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+        cursor.execute(f"DROP TABLE IF EXISTS {BENCH_COUNTERS}")
+        connection.commit()
+        cursor.close()
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
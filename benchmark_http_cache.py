@@ -0,0 +1,147 @@
+"""
+Benchmark & cek perilaku cache HTTP (services/http_cache) dengan server lokal
+
+Server HTTP lokal menggantikan OWID & World Bank: menyajikan CSV energi dan
+JSON GDP dengan ETag, menjawab If-None-Match dengan 304, dan menghitung
+jumlah request. Yang dicek:
+
+1. http_cache.fetch: miss (200) -> fresh (TTL preview, tanpa request)
+   -> revalidated (TTL default 0, 304) -> downloaded lagi setelah payload berubah
+2. fetch_data_from_api: fetch kedua dengan sumber tidak berubah melewati
+   parsing & upsert (unchanged=True), fetch setelah sumber berubah diproses
+3. Server mati: payload lama dipakai (status 'stale'), fetch_data_from_api
+   melaporkan staleSources dan tidak menganggap data tidak berubah
+
+Semua file (cache, data/raw) ditulis di direktori sementara.
+
+Usage:
+    python benchmark_http_cache.py [--entities 2000]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import benchmark_energy_ingest
+from services import http_cache
+from services import update_data_api
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Menyajikan payload dari server.payloads {path: bytes} dengan ETag"""
+
+    def do_GET(self):
+        self.server.request_count += 1
+        payload = self.server.payloads.get(self.path.split('?')[0])
+        if payload is None:
+            self.send_error(404)
+            return
+        etag = '"' + hashlib.sha1(payload).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.server.not_modified_count += 1
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(payloads):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.payloads = payloads
+    server.request_count = 0
+    server.not_modified_count = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def gdp_payload(scale=1.0):
+    rows = [{"date": str(year), "value": 5e11 * 1.05 ** (year - 1960) * scale} for year in range(2023, 1959, -1)]
+    return json.dumps([{"page": 1, "pages": 1}, rows]).encode('utf-8')
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entities', type=int, default=2000)
+    args = parser.parse_args()
+
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fixture = os.path.join(tmp_dir, "energy.csv")
+        benchmark_energy_ingest.write_fixture(fixture, args.entities, 1900, 2024)
+        with open(fixture, 'rb') as f:
+            energy_payload = f.read()
+
+        server = start_server({'/energy.csv': energy_payload, '/gdp.json': gdp_payload()})
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        energy_url, gdp_url = f"{base_url}/energy.csv", f"{base_url}/gdp.json"
+
+        os.chdir(tmp_dir)
+        update_data_api.ENERGY_URL = energy_url
+        update_data_api.GDP_URL = gdp_url
+
+        print("=" * 80)
+        print(f"BENCHMARK HTTP CACHE (CSV energi {len(energy_payload) / 1e6:.1f} MB)")
+        print("=" * 80)
+
+        try:
+            print("\n1. http_cache.fetch")
+            steps = [
+                ("miss", {}, 'downloaded'),
+                ("TTL preview", {'ttl': http_cache.PREVIEW_CACHE_TTL}, 'fresh'),
+                ("TTL default", {}, 'revalidated'),
+            ]
+            for label, kwargs, expected in steps:
+                before = server.request_count
+                cached, elapsed = timed(http_cache.fetch, energy_url, **kwargs)
+                assert cached.status == expected, (label, cached.status)
+                print(f"  {label:<16} {cached.status:<12} {elapsed:8.1f} ms  request: {server.request_count - before}")
+
+            server.payloads['/energy.csv'] = energy_payload + b"Zimbabwe,ZWE,2024,1.0\n"
+            cached, elapsed = timed(http_cache.fetch, energy_url)
+            assert cached.status == 'downloaded' and not cached.not_modified
+            print(f"  {'payload berubah':<16} {cached.status:<12} {elapsed:8.1f} ms  not_modified: {cached.not_modified}")
+
+            print("\n2. fetch_data_from_api (TTL default 0: selalu revalidasi ke server)")
+            os.makedirs("data/raw", exist_ok=True)
+            for label in ("pertama", "tidak berubah", "GDP berubah"):
+                if label == "GDP berubah":
+                    server.payloads['/gdp.json'] = gdp_payload(scale=1.01)
+                result, elapsed = timed(update_data_api.fetch_data_from_api, 'all', 1965, 2023)
+                assert result["success"], result
+                print(f"  {label:<16} {elapsed:8.1f} ms  unchanged: {result.get('unchanged', False)}  "
+                      f"energi: {result['energyCount']}  GDP: {result['gdpCount']}")
+            print(f"\n✓ Total request ke server: {server.request_count} ({server.not_modified_count} x 304)")
+
+            print("\n3. Server mati")
+            server.shutdown()
+            server.server_close()
+            result, elapsed = timed(update_data_api.fetch_data_from_api, 'all', 1965, 2023)
+            assert result["success"] and not result.get('unchanged') and result.get('staleSources'), result
+            print(f"  {'cache lama':<16} {elapsed:8.1f} ms  staleSources: {result['staleSources']}")
+        finally:
+            os.chdir(original_cwd)
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark analisis stasioneritas (services.stationarity)
+
+Data energi dari data store diuji ADF & KPSS untuk d=0..max_d:
+
+1. Cara lama: np.diff dari data asli + adfuller & kpss per level, setiap run
+2. Cache kosong (hitung semua level, tulis ke cache)
+3. Cache memori terisi (seperti retrain kedua di proses yang sama)
+4. Cache disk terisi (seperti script metodologi di proses baru)
+
+Yang diukur: waktu rata-rata per run dan kesamaan p-value dengan cara lama.
+
+Usage:
+    python benchmark_stationarity.py [--max-d 2] [--repeat 20]
+"""
+
+import argparse
+import tempfile
+import time
+import warnings
+import numpy as np
+from statsmodels.tsa.stattools import adfuller, kpss
+
+from services import data_store
+from services import stationarity
+
+
+def legacy(values, max_d):
+    p_values = []
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for d in range(max_d + 1):
+            series = np.diff(values, n=d) if d else values
+            p_values.append((adfuller(series, autolag='AIC')[1], kpss(series, regression='ct', nlags='auto')[1]))
+    return p_values
+
+
+def timed(label, func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<26} {elapsed * 1000:>12.3f}")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--max-d', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    df = data_store.get_aligned_data()
+    if df is None or df.empty:
+        print("⚠ Data energi & GDP belum tersedia, benchmark dibatalkan")
+        return
+    values = df['energy'].to_numpy(dtype=float)
+
+    print("=" * 80)
+    print(f"BENCHMARK ANALISIS STASIONERITAS ({len(values)} tahun, d=0..{args.max_d}, {args.repeat} run)")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        stationarity.configure_cache(cache_dir=tmp_dir)
+        print(f"\n{'cara':<26} {'ms per run':>12}")
+
+        reference, t_legacy = timed("tanpa memoization", lambda: legacy(values, args.max_d), args.repeat)
+        _, t_cold = timed("cache kosong", lambda: stationarity.analyze_stationarity(values, max_d=args.max_d), 1)
+        _, t_memory = timed("cache memori", lambda: stationarity.analyze_stationarity(values, max_d=args.max_d), args.repeat)
+
+        def from_disk():
+            stationarity.clear_memory_cache()
+            return stationarity.analyze_stationarity(values, max_d=args.max_d)
+
+        analysis, t_disk = timed("cache disk", from_disk, args.repeat)
+
+    max_diff = max(
+        abs(level[test]['p_value'] - p_value)
+        for level, p_values in zip(analysis['levels'], reference)
+        for test, p_value in zip(('adf', 'kpss'), p_values)
+    )
+    print(f"\nd (ADF & KPSS): {analysis['d']}, d ADF: {analysis['d_adf']}, d KPSS: {analysis['d_kpss']}")
+    print(f"Selisih maksimum p-value vs cara lama: {max_diff:.2e}")
+    print(f"Speedup cache memori: {t_legacy / t_memory:.0f}x, cache disk: {t_legacy / t_disk:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
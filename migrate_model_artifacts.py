@@ -0,0 +1,119 @@
+"""
+Konversi file model lama (pickle SARIMAXResults penuh) ke artifact ringkas
+
+Memproses models/arimax_model.pkl dan semua models/arimax_model_{id}.pkl.
+File yang sudah berformat artifact dilewati. Untuk tiap file dicek bahwa
+forecast model hasil rebuild sama dengan model aslinya sebelum ditimpa.
+
+Usage:
+    python migrate_model_artifacts.py           # dry run (hanya laporan)
+    python migrate_model_artifacts.py --write   # timpa file dengan artifact
+"""
+
+import glob
+import os
+import pickle
+import sys
+import time
+import numpy as np
+import pandas as pd
+import warnings
+warnings.filterwarnings('ignore')
+
+from services.model_artifact import build_model_artifact, is_model_artifact, rebuild_results
+
+
+def migrate_file(path, write=False):
+    with open(path, 'rb') as f:
+        model_info = pickle.load(f)
+
+    if is_model_artifact(model_info):
+        return None
+
+    if isinstance(model_info, dict) and 'model' in model_info:
+        results = model_info['model']
+    else:
+        results = model_info
+        model_info = {}
+
+    artifact = build_model_artifact(
+        results,
+        y_test=model_info.get('y_test'),
+        y_pred=model_info.get('y_pred'),
+        test_years=model_info.get('test_years'),
+        metrics=model_info.get('metrics')
+    )
+
+    # Verifikasi: forecast 10 tahun dengan GDP tumbuh 5% harus identik
+    last_gdp = float(np.asarray(results.data.orig_exog)[-1, 0])
+    future_exog = pd.DataFrame({artifact['exog_names'][0]: last_gdp * np.cumprod(np.full(10, 1.05))})
+    expected = results.get_forecast(steps=10, exog=future_exog)
+    actual = rebuild_results(artifact).get_forecast(steps=10, exog=future_exog)
+    if not np.allclose(expected.predicted_mean, actual.predicted_mean) or \
+       not np.allclose(expected.conf_int(), actual.conf_int()):
+        raise ValueError("forecast hasil rebuild tidak sama dengan model asli")
+
+    payload = pickle.dumps(artifact, protocol=pickle.HIGHEST_PROTOCOL)
+    old_size = os.path.getsize(path)
+
+    if write:
+        with open(path, 'wb') as f:
+            f.write(payload)
+
+    return old_size, len(payload)
+
+
+def main():
+    write = '--write' in sys.argv
+    paths = sorted(glob.glob("models/arimax_model.pkl") + glob.glob("models/arimax_model_*.pkl"))
+
+    print("=" * 80)
+    print(f"MIGRASI ARTIFACT MODEL ({'WRITE' if write else 'DRY RUN'})")
+    print("=" * 80)
+
+    total_old = 0
+    total_new = 0
+    for path in paths:
+        try:
+            result = migrate_file(path, write=write)
+        except Exception as e:
+            print(f"  ✗ {path}: {e}")
+            continue
+
+        if result is None:
+            print(f"  - {path}: sudah artifact, dilewati")
+            continue
+
+        old_size, new_size = result
+        total_old += old_size
+        total_new += new_size
+        print(f"  ✓ {path}: {old_size / 1024:.1f} KB -> {new_size / 1024:.1f} KB")
+
+    if total_new:
+        print()
+        print(f"Total: {total_old / 1024:.1f} KB -> {total_new / 1024:.1f} KB ({total_old / total_new:.1f}x lebih kecil)")
+
+    # Bandingkan waktu load (cold start) satu file
+    sample = "models/arimax_model.pkl"
+    if os.path.exists(sample) and total_new:
+        with open(sample, 'rb') as f:
+            raw = f.read()
+        start = time.perf_counter()
+        legacy = pickle.loads(raw)
+        legacy_time = time.perf_counter() - start
+
+        results = legacy['model'] if isinstance(legacy, dict) and 'model' in legacy else legacy
+        if not is_model_artifact(legacy):
+            payload = pickle.dumps(build_model_artifact(results), protocol=pickle.HIGHEST_PROTOCOL)
+            start = time.perf_counter()
+            rebuild_results(pickle.loads(payload))
+            slim_time = time.perf_counter() - start
+            print(f"Load time {sample}: pickle lama {legacy_time * 1000:.1f} ms, artifact {slim_time * 1000:.1f} ms")
+
+    if not write:
+        print()
+        print("Dry run selesai. Jalankan dengan --write untuk menimpa file.")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,18 +18,23 @@ Date: January 2026
 
 import pandas as pd
 import numpy as np
-from statsmodels.tsa.statespace.sarimax import SARIMAX
-from statsmodels.stats.diagnostic import acorr_ljungbox
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.fit_cache import fit_sarimax
+from services.experiment_runner import EXPERIMENT_SPECS, load_experiment_data, run_experiment
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 import warnings
 warnings.filterwarnings('ignore')
 
-def test_with_different_splits(y, exog, order, model_name="ARIMAX"):
-    """
-    Test model dengan berbagai split ratio dan tampilkan koefisien GDP
+def test_with_different_splits(runs, order, model_name="ARIMAX"):
     """
+    Tampilkan hasil model dengan berbagai split ratio dan koefisien GDP
     
-    splits = [0.70, 0.75, 0.80, 0.85]
+    Args:
+        runs: DataFrame hasil run_experiment('gdp_exogenous')
+        order: tuple (p,d,q)
+    """
     
     print(f"\n{'='*80}")
     print(f"TEST BERBAGAI SPLIT: {model_name}{order}")
@@ -37,87 +42,47 @@ def test_with_different_splits(y, exog, order, model_name="ARIMAX"):
     
     results = []
     
-    for ratio in splits:
-        train_size = int(len(y) * ratio)
-        test_size = len(y) - train_size
-        
-        if test_size < 5:
+    rows = runs[(runs['Order'] == str(tuple(order))) & (runs['Model'] == model_name)]
+    for _, row in rows.iterrows():
+        if row['Status'] != 'Success':
+            print(f"Split {row['Split']} - FAILED: {str(row['Status'])[:50]}\n")
             continue
         
-        y_train = y.iloc[:train_size]
-        y_test = y.iloc[train_size:]
-        exog_train = exog.iloc[:train_size]
-        exog_test = exog.iloc[train_size:]
+        mape, r2 = row['MAPE'], row['R2']
+        converged, no_autocorr = bool(row['Converged']), bool(row['No_Autocorr'])
         
-        split_label = f"{int(ratio*100)}:{int((1-ratio)*100)}"
+        # KOEFISIEN GDP (variabel eksogen)
+        gdp_coef = row['GDP_Coef']
+        gdp_pvalue = row['GDP_pvalue']
+        gdp_significant = gdp_pvalue < 0.05
         
-        try:
-            # Train model
-            model = SARIMAX(
-                y_train,
-                exog=exog_train,
-                order=order,
-                enforce_stationarity=False,
-                enforce_invertibility=False
-            )
-            result = model.fit(disp=False, maxiter=200, method='lbfgs')
-            
-            # Predict
-            predictions = result.forecast(steps=len(y_test), exog=exog_test)
-            
-            # Metrics
-            mae = mean_absolute_error(y_test, predictions)
-            rmse = np.sqrt(mean_squared_error(y_test, predictions))
-            mape = np.mean(np.abs((y_test - predictions) / y_test)) * 100
-            
-            ss_res = np.sum((y_test - predictions) ** 2)
-            ss_tot = np.sum((y_test - np.mean(y_test)) ** 2)
-            r2 = 1 - (ss_res / ss_tot)
-            
-            # Check convergence
-            converged = not hasattr(result, 'mle_retvals') or \
-                       (hasattr(result, 'mle_retvals') and result.mle_retvals.get('converged', True))
-            
-            # Check residual autocorrelation
-            residuals = result.resid
-            lb_test = acorr_ljungbox(residuals, lags=10, return_df=True)
-            no_autocorr = (lb_test['lb_pvalue'] > 0.05).all()
-            
-            # EXTRACT KOEFISIEN GDP (variabel eksogen)
-            gdp_coef = result.params['gdp']
-            gdp_pvalue = result.pvalues['gdp']
-            gdp_significant = gdp_pvalue < 0.05
-            
-            print(f"Split {split_label} (Train: {train_size}, Test: {test_size})")
-            print(f"  MAPE          : {mape:>6.2f}%")
-            print(f"  R²            : {r2:>6.4f}")
-            print(f"  Converged     : {'✓' if converged else '⚠'}")
-            print(f"  No Autocorr   : {'✓' if no_autocorr else '✗'}")
-            print(f"  ")
-            print(f"  📊 KOEFISIEN GDP (β):")
-            print(f"     Nilai      : {gdp_coef:>10.6f}")
-            print(f"     p-value    : {gdp_pvalue:>10.6f} {'(Signifikan ✓)' if gdp_significant else '(Tidak signifikan ✗)'}")
-            print(f"     Interpretasi: Setiap GDP naik 1 Trillion → Energi {'naik' if gdp_coef > 0 else 'turun'} {abs(gdp_coef):.2f} TWh")
-            print()
-            
-            results.append({
-                'Model': f"{model_name}{order}",
-                'Split': split_label,
-                'Train_Size': train_size,
-                'Test_Size': test_size,
-                'MAPE': mape,
-                'R2': r2,
-                'MAE': mae,
-                'RMSE': rmse,
-                'GDP_Coef': gdp_coef,
-                'GDP_pvalue': gdp_pvalue,
-                'GDP_Significant': gdp_significant,
-                'Converged': converged,
-                'No_Autocorr': no_autocorr
-            })
-            
-        except Exception as e:
-            print(f"Split {split_label} - FAILED: {str(e)[:50]}\n")
+        print(f"Split {row['Split']} (Train: {int(row['Train_Size'])}, Test: {int(row['Test_Size'])})")
+        print(f"  MAPE          : {mape:>6.2f}%")
+        print(f"  R²            : {r2:>6.4f}")
+        print(f"  Converged     : {'✓' if converged else '⚠'}")
+        print(f"  No Autocorr   : {'✓' if no_autocorr else '✗'}")
+        print(f"  ")
+        print(f"  📊 KOEFISIEN GDP (β):")
+        print(f"     Nilai      : {gdp_coef:>10.6f}")
+        print(f"     p-value    : {gdp_pvalue:>10.6f} {'(Signifikan ✓)' if gdp_significant else '(Tidak signifikan ✗)'}")
+        print(f"     Interpretasi: Setiap GDP naik 1 Trillion → Energi {'naik' if gdp_coef > 0 else 'turun'} {abs(gdp_coef):.2f} TWh")
+        print()
+        
+        results.append({
+            'Model': f"{model_name}{order}",
+            'Split': row['Split'],
+            'Train_Size': int(row['Train_Size']),
+            'Test_Size': int(row['Test_Size']),
+            'MAPE': mape,
+            'R2': r2,
+            'MAE': row['MAE'],
+            'RMSE': row['RMSE'],
+            'GDP_Coef': gdp_coef,
+            'GDP_pvalue': gdp_pvalue,
+            'GDP_Significant': gdp_significant,
+            'Converged': converged,
+            'No_Autocorr': no_autocorr
+        })
     
     return pd.DataFrame(results)
 
@@ -158,8 +123,7 @@ def compare_arima_vs_arimax_detailed(y, exog, order, split_ratio=0.8):
     print("  ❌ TIDAK ADA GDP dalam persamaan!")
     print()
     
-    model_arima = SARIMAX(y_train, order=order, enforce_stationarity=False, enforce_invertibility=False)
-    result_arima = model_arima.fit(disp=False)
+    result_arima = fit_sarimax(y_train, None, order)
     pred_arima = result_arima.forecast(steps=len(y_test))
     
     mape_arima = np.mean(np.abs((y_test - pred_arima) / y_test)) * 100
@@ -204,14 +168,7 @@ def compare_arima_vs_arimax_detailed(y, exog, order, split_ratio=0.8):
     print("  ✅ GDP MASUK SEBAGAI PREDICTOR TAMBAHAN!")
     print()
     
-    model_arimax = SARIMAX(
-        y_train,
-        exog=exog_train,
-        order=order,
-        enforce_stationarity=False,
-        enforce_invertibility=False
-    )
-    result_arimax = model_arimax.fit(disp=False)
+    result_arimax = fit_sarimax(y_train, exog_train, order)
     pred_arimax = result_arimax.forecast(steps=len(y_test), exog=exog_test)
     
     mape_arimax = np.mean(np.abs((y_test - pred_arimax) / y_test)) * 100
@@ -328,32 +285,7 @@ def main():
     print()
     
     # Load data
-    energy = pd.read_csv("data/raw/energy.csv")
-    gdp = pd.read_csv("data/raw/gdp.csv")
-    
-    # Preprocessing
-    energy_year_col = "Year" if "Year" in energy.columns else "year"
-    gdp_year_col = "year" if "year" in gdp.columns else "Year"
-    
-    energy_value_col = None
-    for col in ["fossil_fuels__twh", "fossil_fuels", "value", "Energy"]:
-        if col in energy.columns:
-            energy_value_col = col
-            break
-    
-    gdp_value_col = "gdp" if "gdp" in gdp.columns else "GDP"
-    
-    energy_clean = energy[[energy_year_col, energy_value_col]].copy()
-    energy_clean.columns = ["year", "energy"]
-    
-    gdp_clean = gdp[[gdp_year_col, gdp_value_col]].copy()
-    gdp_clean.columns = ["year", "gdp"]
-    
-    energy_clean = energy_clean.drop_duplicates(subset=["year"]).sort_values("year")
-    gdp_clean = gdp_clean.drop_duplicates(subset=["year"]).sort_values("year")
-    
-    df = pd.merge(energy_clean, gdp_clean, on="year", how="inner")
-    df = df.dropna()
+    df = load_experiment_data()
     
     y = df["energy"]
     exog = df[["gdp"]]
@@ -366,16 +298,14 @@ def main():
     print("BAGIAN 1: TEST KANDIDAT TERBAIK DENGAN BERBAGAI SPLIT")
     print("="*80)
     
-    candidates = [
-        (3, 2, 1),  # Best dari validasi sebelumnya
-        (1, 1, 1),  # Baseline
-        (3, 1, 1),  # Alternative
-    ]
+    # (3,2,1) best validasi sebelumnya, (1,1,1) baseline, (3,1,1) alternatif
+    # x split 70-85% dijalankan oleh experiment_runner (spec 'gdp_exogenous')
+    runs = run_experiment('gdp_exogenous', df=df)
     
     all_results = []
     
-    for order in candidates:
-        df_result = test_with_different_splits(y, exog, order, "ARIMAX")
+    for order in EXPERIMENT_SPECS['gdp_exogenous']['orders']:
+        df_result = test_with_different_splits(runs, order, "ARIMAX")
         all_results.append(df_result)
     
     df_all = pd.concat(all_results, ignore_index=True)
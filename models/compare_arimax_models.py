@@ -4,15 +4,16 @@ ARIMAX Model Comparison Tool
 Script untuk membandingkan performa beberapa ARIMAX model dengan order berbeda.
 Menampilkan tabel perbandingan metrics di terminal.
 
-Cara pakai:
-$ cd models
-$ python compare_arimax_models.py
+Cara pakai (dari root project):
+$ python models/compare_arimax_models.py
 """
 
 import pandas as pd
 import numpy as np
-from statsmodels.tsa.statespace.sarimax import SARIMAX
-from sklearn.metrics import mean_absolute_error, mean_squared_error
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.experiment_runner import EXPERIMENT_SPECS, load_experiment_data, run_experiment
 from pmdarima import auto_arima
 import warnings
 warnings.filterwarnings('ignore')
@@ -44,158 +45,68 @@ def print_warning(text):
     print(f"{Color.WARNING}⚠ {text}{Color.ENDC}")
 
 def load_and_prepare_data():
-    """Load dan prepare data untuk training"""
+    """Load data (data store) dan tampilkan ukuran split 80:20"""
     print_header("LOADING DATA")
     
-    # Load data
-    energy = pd.read_csv('../data/raw/energy.csv')
-    gdp = pd.read_csv('../data/raw/gdp.csv')
-    
-    print_info(f"Data energi: {len(energy)} records")
-    print_info(f"Data GDP: {len(gdp)} records")
-    
-    # Standardize column names
-    energy_year_col = "Year" if "Year" in energy.columns else "year"
-    gdp_year_col = "year" if "year" in gdp.columns else "Year"
-    
-    # Identifikasi kolom nilai energi
-    energy_value_col = None
-    for col in ["fossil_fuels__twh", "fossil_fuels", "value", "Energy"]:
-        if col in energy.columns:
-            energy_value_col = col
-            break
-    
-    if not energy_value_col:
-        raise ValueError(f"Kolom energi tidak ditemukan. Available: {list(energy.columns)}")
-    
-    gdp_value_col = "gdp" if "gdp" in gdp.columns else "GDP"
-    
-    # Prepare data
-    energy_clean = energy[[energy_year_col, energy_value_col]].copy()
-    energy_clean.columns = ["year", "energy"]
-    
-    gdp_clean = gdp[[gdp_year_col, gdp_value_col]].copy()
-    gdp_clean.columns = ["year", "gdp"]
+    df = load_experiment_data()
+    print_success(f"Data merged: {len(df)} records ({int(df['year'].min())}-{int(df['year'].max())})")
     
-    # Merge dengan inner join
-    df = pd.merge(energy_clean, gdp_clean, on="year", how="inner")
-    df = df.dropna()
-    df = df.sort_values("year")
+    train_size = int(len(df) * EXPERIMENT_SPECS['arimax_orders']['splits'][0])
+    print_info(f"Train size: {train_size} records")
+    print_info(f"Test size: {len(df) - train_size} records")
     
-    print_success(f"Data merged: {len(df)} records ({df['year'].min()}-{df['year'].max()})")
-    
-    # Train-test split
-    train_size = int(len(df) * 0.8)
-    
-    y = df["energy"]
-    exog = df[["gdp"]]
-    
-    y_train = y.iloc[:train_size]
-    y_test = y.iloc[train_size:]
-    exog_train = exog.iloc[:train_size]
-    exog_test = exog.iloc[train_size:]
-    
-    print_info(f"Train size: {len(y_train)} records")
-    print_info(f"Test size: {len(y_test)} records")
-    
-    return y_train, y_test, exog_train, exog_test
+    return df, train_size
 
-def calculate_metrics(y_true, y_pred):
-    """Hitung metrics"""
-    mae = mean_absolute_error(y_true, y_pred)
-    rmse = np.sqrt(mean_squared_error(y_true, y_pred))
-    mape = np.mean(np.abs((y_true - y_pred) / y_true)) * 100
-    
-    # R-squared
-    ss_res = np.sum((y_true - y_pred) ** 2)
-    ss_tot = np.sum((y_true - np.mean(y_true)) ** 2)
-    r2 = 1 - (ss_res / ss_tot)
+def test_models(df, orders=None):
+    """
+    Test ARIMAX untuk setiap order lewat experiment_runner (spec 'arimax_orders')
+    
+    Returns:
+        list dict (Order, p, d, q, MAE, RMSE, MAPE, R2, AIC, BIC, Status)
+    """
+    spec = dict(EXPERIMENT_SPECS['arimax_orders'])
+    if orders is not None:
+        spec['orders'] = orders
+    runs = run_experiment('arimax_orders', spec=spec, df=df)
     
-    return {
-        'MAE': mae,
-        'RMSE': rmse,
-        'MAPE': mape,
-        'R2': r2
-    }
-
-def test_model(order, y_train, y_test, exog_train, exog_test):
-    """Test satu ARIMAX model dengan order tertentu"""
-    try:
-        model = SARIMAX(
-            y_train,
-            exog=exog_train,
-            order=order,
-            enforce_stationarity=False,
-            enforce_invertibility=False
-        )
-        
-        result = model.fit(disp=False)
-        predictions = result.forecast(steps=len(y_test), exog=exog_test)
-        
-        metrics = calculate_metrics(y_test, predictions)
-        metrics['Status'] = 'Success'
-        metrics['AIC'] = result.aic
-        metrics['BIC'] = result.bic
-        
-        return metrics
-        
-    except Exception as e:
-        return {
-            'MAE': float('inf'),
-            'RMSE': float('inf'),
-            'MAPE': float('inf'),
-            'R2': -float('inf'),
-            'AIC': float('inf'),
-            'BIC': float('inf'),
-            'Status': f'Failed: {str(e)[:30]}'
-        }
+    results = []
+    for _, row in runs.iterrows():
+        success = row['Status'] == 'Success'
+        results.append({
+            'Order': row['Order'],
+            'p': int(row['p']),
+            'd': int(row['d']),
+            'q': int(row['q']),
+            'MAE': row['MAE'] if success else float('inf'),
+            'RMSE': row['RMSE'] if success else float('inf'),
+            'MAPE': row['MAPE'] if success else float('inf'),
+            'R2': row['R2'] if success else -float('inf'),
+            'Status': row['Status'],
+            'AIC': row['AIC'] if success else float('inf'),
+            'BIC': row['BIC'] if success else float('inf')
+        })
+    return results
 
 def main():
     print_header("ARIMAX MODEL COMPARISON TOOL")
     
     # Load data
-    y_train, y_test, exog_train, exog_test = load_and_prepare_data()
+    df, train_size = load_and_prepare_data()
     
-    # Definisikan beberapa model untuk di-test
+    # Order yang di-test: EXPERIMENT_SPECS['arimax_orders']
     print_header("TESTING MODELS")
     
-    models_to_test = [
-        (1, 1, 1),
-        (2, 1, 1),
-        (1, 1, 2),
-        (2, 2, 1),
-        (1, 2, 2),
-        (2, 1, 2),
-        (3, 1, 1),
-        (1, 1, 3),
-        (2, 2, 2),
-        (3, 2, 1),
-    ]
-    
-    results = []
+    models_to_test = EXPERIMENT_SPECS['arimax_orders']['orders']
     
     print_info("Testing predefined orders...")
-    for i, order in enumerate(models_to_test, 1):
-        print(f"  {i}/{len(models_to_test)} Testing ARIMAX{order}...", end='')
-        metrics = test_model(order, y_train, y_test, exog_train, exog_test)
-        results.append({
-            'Order': str(order),
-            'p': order[0],
-            'd': order[1],
-            'q': order[2],
-            **metrics
-        })
-        if metrics['Status'] == 'Success':
-            print(f" {Color.OKGREEN}✓{Color.ENDC}")
-        else:
-            print(f" {Color.FAIL}✗{Color.ENDC}")
+    results = test_models(df)
     
     # Auto ARIMA
     print_info("\nRunning Auto ARIMA to find optimal order...")
     try:
         auto_model = auto_arima(
-            y_train,
-            exogenous=exog_train,
+            df['energy'].iloc[:train_size],
+            exogenous=df[['gdp']].iloc[:train_size],
             start_p=0,
             start_q=0,
             max_p=3,
@@ -213,14 +124,9 @@ def main():
         
         # Test auto order jika belum ada di list
         if auto_order not in models_to_test:
-            metrics = test_model(auto_order, y_train, y_test, exog_train, exog_test)
-            results.append({
-                'Order': f"{auto_order} (AUTO)",
-                'p': auto_order[0],
-                'd': auto_order[1],
-                'q': auto_order[2],
-                **metrics
-            })
+            auto_result = test_models(df, orders=[auto_order])[0]
+            auto_result['Order'] = f"{auto_order} (AUTO)"
+            results.append(auto_result)
         else:
             # Mark which one is auto-selected
             for r in results:
@@ -299,8 +205,8 @@ def main():
     print(f"📊 Model ini memberikan MAPE terendah: {Color.BOLD}{best['MAPE']:.2f}%{Color.ENDC}")
     
     # Save results to CSV
-    df_success.to_csv('arimax_comparison_results.csv', index=False)
-    print_success(f"\nResults saved to: arimax_comparison_results.csv")
+    df_success.to_csv('models/arimax_comparison_results.csv', index=False)
+    print_success(f"\nResults saved to: models/arimax_comparison_results.csv")
     
     print("\n" + "="*80 + "\n")
 
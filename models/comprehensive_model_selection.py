@@ -19,8 +19,10 @@ Date: January 2026
 
 import pandas as pd
 import numpy as np
-from statsmodels.tsa.statespace.sarimax import SARIMAX
-from sklearn.metrics import mean_absolute_error, mean_squared_error
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.experiment_runner import EXPERIMENT_SPECS, load_experiment_data, run_experiment, split_label as format_split
 from statsmodels.tsa.stattools import adfuller, acf, pacf
 import warnings
 warnings.filterwarnings('ignore')
@@ -37,114 +39,8 @@ def get_candidate_models():
     Plus baseline dari literatur: (1,1,1)
     """
     
-    # Kandidat dari identifikasi manual
-    candidates = []
-    
-    # d tetap = 2 (dari ADF test)
-    d = 2
-    
-    # p candidates (dari PACF)
-    p_values = [1, 2, 3]
-    
-    # q candidates (dari ACF)
-    q_values = [1, 4, 5, 6]
-    
-    # Generate kombinasi yang masuk akal
-    # Hindari model terlalu kompleks (p+q > 7)
-    for p in p_values:
-        for q in q_values:
-            if p + q <= 7:  # Rule of thumb: total parameters tidak terlalu banyak
-                candidates.append((p, d, q))
-    
-    # Tambah baseline dari literatur
-    baseline_models = [
-        (1, 1, 1),  # Standard ARIMA baseline
-        (0, 1, 0),  # Random walk with drift
-        (1, 1, 0),  # AR(1) with differencing
-        (0, 1, 1),  # MA(1) with differencing
-    ]
-    
-    for model in baseline_models:
-        if model not in candidates:
-            candidates.append(model)
-    
-    return sorted(candidates)
-
-def test_model_all_splits(y, exog, order, split_ratios):
-    """
-    Test satu model dengan berbagai split ratio
-    """
-    results = []
-    
-    for ratio in split_ratios:
-        train_size = int(len(y) * ratio)
-        
-        # Validasi minimal training size
-        if train_size < 30 or (len(y) - train_size) < 5:
-            continue
-        
-        y_train = y.iloc[:train_size]
-        y_test = y.iloc[train_size:]
-        exog_train = exog.iloc[:train_size]
-        exog_test = exog.iloc[train_size:]
-        
-        try:
-            # Train model
-            model = SARIMAX(
-                y_train,
-                exog=exog_train,
-                order=order,
-                enforce_stationarity=False,
-                enforce_invertibility=False
-            )
-            result = model.fit(disp=False, maxiter=200, method='lbfgs')
-            
-            # Predict
-            predictions = result.forecast(steps=len(y_test), exog=exog_test)
-            
-            # Calculate metrics
-            mae = mean_absolute_error(y_test, predictions)
-            rmse = np.sqrt(mean_squared_error(y_test, predictions))
-            mape = np.mean(np.abs((y_test - predictions) / y_test)) * 100
-            
-            ss_res = np.sum((y_test - predictions) ** 2)
-            ss_tot = np.sum((y_test - np.mean(y_test)) ** 2)
-            r2 = 1 - (ss_res / ss_tot)
-            
-            # Check convergence
-            converged = not hasattr(result, 'mle_retvals') or \
-                       (hasattr(result, 'mle_retvals') and result.mle_retvals.get('converged', True))
-            
-            results.append({
-                'Order': str(order),
-                'p': order[0],
-                'd': order[1],
-                'q': order[2],
-                'Split': f"{int(ratio*100)}:{int((1-ratio)*100)}",
-                'Split_Ratio': ratio,
-                'Train_Size': train_size,
-                'Test_Size': len(y_test),
-                'MAPE': mape,
-                'MAE': mae,
-                'RMSE': rmse,
-                'R2': r2,
-                'AIC': result.aic,
-                'BIC': result.bic,
-                'Converged': converged,
-                'Status': 'Success' if converged else 'Warning'
-            })
-            
-        except Exception as e:
-            results.append({
-                'Order': str(order),
-                'p': order[0],
-                'd': order[1],
-                'q': order[2],
-                'Split': f"{int(ratio*100)}:{int((1-ratio)*100)}",
-                'Status': f'Failed: {str(e)[:30]}'
-            })
-    
-    return results
+    # Kombinasi p+q <= 7 ditambah baseline, didefinisikan di spec experiment_runner
+    return list(EXPERIMENT_SPECS['comprehensive_model_selection']['orders'])
 
 def main():
     print("="*80)
@@ -154,35 +50,7 @@ def main():
     print()
     
     # Load data
-    energy = pd.read_csv("data/raw/energy.csv")
-    gdp = pd.read_csv("data/raw/gdp.csv")
-    
-    # Preprocessing
-    energy_year_col = "Year" if "Year" in energy.columns else "year"
-    gdp_year_col = "year" if "year" in gdp.columns else "Year"
-    
-    energy_value_col = None
-    for col in ["fossil_fuels__twh", "fossil_fuels", "value", "Energy"]:
-        if col in energy.columns:
-            energy_value_col = col
-            break
-    
-    gdp_value_col = "gdp" if "gdp" in gdp.columns else "GDP"
-    
-    energy_clean = energy[[energy_year_col, energy_value_col]].copy()
-    energy_clean.columns = ["year", "energy"]
-    
-    gdp_clean = gdp[[gdp_year_col, gdp_value_col]].copy()
-    gdp_clean.columns = ["year", "gdp"]
-    
-    energy_clean = energy_clean.drop_duplicates(subset=["year"]).sort_values("year")
-    gdp_clean = gdp_clean.drop_duplicates(subset=["year"]).sort_values("year")
-    
-    df = pd.merge(energy_clean, gdp_clean, on="year", how="inner")
-    df = df.dropna()
-    
-    y = df["energy"]
-    exog = df[["gdp"]]
+    df = load_experiment_data()
     
     print(f"Dataset: {len(df)} observasi ({int(df['year'].min())}-{int(df['year'].max())})")
     print()
@@ -207,7 +75,7 @@ def main():
     print()
     
     # Split ratios berdasarkan referensi jurnal
-    split_ratios = [0.70, 0.75, 0.80, 0.85]
+    split_ratios = EXPERIMENT_SPECS['comprehensive_model_selection']['splits']
     
     print("="*80)
     print("SPLIT RATIOS (Berdasarkan Referensi Jurnal)")
@@ -224,29 +92,15 @@ def main():
     print("="*80)
     print()
     
-    all_results = []
-    total_tests = len(candidates) * len(split_ratios)
-    current = 0
-    
-    for order in candidates:
-        print(f"Testing ARIMAX{order}...")
-        results = test_model_all_splits(y, exog, order, split_ratios)
-        all_results.extend(results)
-        
-        # Progress
-        current += len(split_ratios)
-        progress = (current / total_tests) * 100
-        print(f"  Progress: {current}/{total_tests} ({progress:.1f}%)")
-        
-        # Summary untuk model ini
-        success_results = [r for r in results if r['Status'] == 'Success']
-        if success_results:
-            best = min(success_results, key=lambda x: x['MAPE'])
-            print(f"  Best: Split {best['Split']}, MAPE {best['MAPE']:.2f}%")
-        print()
+    # Kartesius kandidat x split dijalankan paralel oleh experiment_runner
+    runs = run_experiment('comprehensive_model_selection', df=df)
     
-    # Convert to DataFrame
-    df_results = pd.DataFrame(all_results)
+    # Format tabel lama (models/comprehensive_model_selection.csv):
+    # fit yang tidak konvergen ditandai 'Warning'
+    df_results = runs[['Order', 'p', 'd', 'q', 'Split', 'Split_Ratio', 'Train_Size', 'Test_Size',
+                       'MAPE', 'MAE', 'RMSE', 'R2', 'AIC', 'BIC', 'Converged', 'Status']].copy()
+    not_converged = (df_results['Status'] == 'Success') & (df_results['Converged'] == False)
+    df_results.loc[not_converged, 'Status'] = 'Warning'
     
     # Filter successful results only
     df_success = df_results[df_results['Status'] == 'Success'].copy()
@@ -311,7 +165,7 @@ def main():
     print()
     
     for ratio in split_ratios:
-        split_label = f"{int(ratio*100)}:{int((1-ratio)*100)}"
+        split_label = format_split(ratio)
         df_split = df_success[df_success['Split'] == split_label]
         
         if len(df_split) > 0:
@@ -18,14 +18,18 @@ Date: January 2026
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from statsmodels.tsa.stattools import adfuller, acf, pacf
-from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
 from statsmodels.tsa.statespace.sarimax import SARIMAX
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 import warnings
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.experiment_runner import load_experiment_data
+from services.stationarity import analyze_stationarity
+from services.correlation import correlations, plot_correlation
 warnings.filterwarnings('ignore')
 
-def adf_test(series, name="Series"):
+def adf_test(series, name="Series", adf=None):
     """
     Augmented Dickey-Fuller Test untuk uji stasioneritas
     H0: Data tidak stasioner (ada unit root)
@@ -33,27 +37,30 @@ def adf_test(series, name="Series"):
     
     Jika p-value < 0.05 → Reject H0 → Data STASIONER
     Jika p-value >= 0.05 → Terima H0 → Data TIDAK STASIONER
+    
+    adf: Hasil ADF dari services.stationarity (None = hitung untuk series)
     """
-    result = adfuller(series, autolag='AIC')
+    if adf is None:
+        adf = analyze_stationarity(series, max_d=0)['levels'][0]['adf']
     
     print(f"\n{'='*70}")
     print(f"Augmented Dickey-Fuller Test: {name}")
     print(f"{'='*70}")
-    print(f"ADF Statistic     : {result[0]:.6f}")
-    print(f"p-value           : {result[1]:.6f}")
+    print(f"ADF Statistic     : {adf['test_statistic']:.6f}")
+    print(f"p-value           : {adf['p_value']:.6f}")
     print(f"Critical Values   :")
-    for key, value in result[4].items():
+    for key, value in adf['critical_values'].items():
         print(f"  {key:8s}       : {value:.3f}")
     print(f"{'-'*70}")
     
-    if result[1] <= 0.05:
-        print(f"✓ STASIONER (p-value {result[1]:.4f} < 0.05)")
+    if adf['p_value'] <= 0.05:
+        print(f"✓ STASIONER (p-value {adf['p_value']:.4f} < 0.05)")
         print(f"  → Data sudah stasioner, TIDAK perlu differencing")
-        return True, result[1]
+        return True, adf['p_value']
     else:
-        print(f"✗ TIDAK STASIONER (p-value {result[1]:.4f} >= 0.05)")
+        print(f"✗ TIDAK STASIONER (p-value {adf['p_value']:.4f} >= 0.05)")
         print(f"  → Data belum stasioner, PERLU differencing")
-        return False, result[1]
+        return False, adf['p_value']
 
 def identify_d(series, max_diff=3):
     """
@@ -73,6 +80,9 @@ def identify_d(series, max_diff=3):
     print("Jika p-value >= 0.05 → Perlu differencing")
     print()
     
+    # ADF untuk semua level 0..max_diff dihitung sekali (memoized)
+    analysis = analyze_stationarity(series, max_d=max_diff)
+    
     current_series = series.copy()
     d = 0
     
@@ -82,7 +92,7 @@ def identify_d(series, max_diff=3):
         else:
             name = f"Setelah Differencing {i}x (d={i})"
         
-        is_stationary, pvalue = adf_test(current_series, name)
+        is_stationary, pvalue = adf_test(current_series, name, adf=analysis['levels'][i]['adf'])
         
         if is_stationary:
             print(f"\n{'='*70}")
@@ -121,11 +131,13 @@ def identify_p_q(series_diff, max_lag=20):
     print()
     
     # Hitung ACF dan PACF
-    acf_values = acf(series_diff, nlags=max_lag, fft=False)
-    pacf_values = pacf(series_diff, nlags=max_lag, method='ywm')
+    # (FFT + Durbin-Levinson, di-cache dan dipakai ulang untuk plot di bawah)
+    correlation = correlations(series_diff, nlags=max_lag)
+    acf_values = correlation['acf']
+    pacf_values = correlation['pacf']
     
     # Confidence interval (95%)
-    conf_interval = 1.96 / np.sqrt(len(series_diff))
+    conf_interval = correlation['white_noise_band']
     
     print(f"Confidence Interval (95%): ±{conf_interval:.4f}")
     print()
@@ -183,7 +195,7 @@ def identify_p_q(series_diff, max_lag=20):
     # Plot ACF dan PACF
     fig, axes = plt.subplots(1, 2, figsize=(14, 5))
     
-    plot_acf(series_diff, lags=max_lag, ax=axes[0], alpha=0.05)
+    plot_correlation(axes[0], correlation, 'acf')
     axes[0].set_title('ACF - Autocorrelation Function\n(untuk identifikasi q)', fontsize=12, fontweight='bold')
     axes[0].set_xlabel('Lag')
     axes[0].set_ylabel('ACF')
@@ -193,7 +205,7 @@ def identify_p_q(series_diff, max_lag=20):
     axes[0].legend()
     axes[0].grid(alpha=0.3)
     
-    plot_pacf(series_diff, lags=max_lag, ax=axes[1], alpha=0.05, method='ywm')
+    plot_correlation(axes[1], correlation, 'pacf')
     axes[1].set_title('PACF - Partial Autocorrelation Function\n(untuk identifikasi p)', fontsize=12, fontweight='bold')
     axes[1].set_xlabel('Lag')
     axes[1].set_ylabel('PACF')
@@ -330,32 +342,7 @@ def main():
     print()
     
     # Load data
-    energy = pd.read_csv("data/raw/energy.csv")
-    gdp = pd.read_csv("data/raw/gdp.csv")
-    
-    # Preprocessing
-    energy_year_col = "Year" if "Year" in energy.columns else "year"
-    gdp_year_col = "year" if "year" in gdp.columns else "Year"
-    
-    energy_value_col = None
-    for col in ["fossil_fuels__twh", "fossil_fuels", "value", "Energy"]:
-        if col in energy.columns:
-            energy_value_col = col
-            break
-    
-    gdp_value_col = "gdp" if "gdp" in gdp.columns else "GDP"
-    
-    energy_clean = energy[[energy_year_col, energy_value_col]].copy()
-    energy_clean.columns = ["year", "energy"]
-    
-    gdp_clean = gdp[[gdp_year_col, gdp_value_col]].copy()
-    gdp_clean.columns = ["year", "gdp"]
-    
-    energy_clean = energy_clean.drop_duplicates(subset=["year"]).sort_values("year")
-    gdp_clean = gdp_clean.drop_duplicates(subset=["year"]).sort_values("year")
-    
-    df = pd.merge(energy_clean, gdp_clean, on="year", how="inner")
-    df = df.dropna()
+    df = load_experiment_data()
     
     print(f"Dataset: {len(df)} observasi ({int(df['year'].min())}-{int(df['year'].max())})")
     print()
@@ -17,109 +17,68 @@ Date: January 2026
 
 import pandas as pd
 import numpy as np
-from statsmodels.tsa.statespace.sarimax import SARIMAX
-from sklearn.metrics import mean_absolute_error
 import warnings
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.experiment_runner import EXPERIMENT_SPECS, load_experiment_data, run_experiment
 warnings.filterwarnings('ignore')
 
-def test_rolling_forecast(y, exog, order, start_year=2022, model_name="ARIMAX"):
+def rolling_forecast_table(results, order, model_name="ARIMAX"):
     """
-    Test model dengan rolling forecast per tahun
+    Ubah hasil eksperimen 'rolling_forecast' (services.experiment_runner)
+    untuk satu order ke tabel per tahun test
     
     Args:
-        y: Series energi
-        exog: DataFrame GDP
+        results: DataFrame hasil run_experiment('rolling_forecast')
         order: tuple (p,d,q)
-        start_year: Tahun mulai test (default 2022)
         model_name: Nama model untuk display
     """
-    results = []
-    
-    # Get year dari index
-    years = y.index.tolist()
-    
-    # Tentukan range test
-    test_years = [yr for yr in years if yr >= start_year]
+    rows = results[(results['Order'] == str(tuple(order))) & (results['Model'] == model_name)]
+    summary = rows[rows['Origin_Year'].isna()]
+    detail = rows[rows['Origin_Year'].notna()]
     
     print(f"\n{'='*80}")
     print(f"ROLLING FORECAST: {model_name}{order}")
     print(f"{'='*80}\n")
     
-    for test_year in test_years:
-        # Find index untuk split
-        test_idx = years.index(test_year)
-        
-        if test_idx < 30:  # Minimal 30 tahun untuk training
-            continue
-        
-        # Split data
-        y_train = y.iloc[:test_idx]
-        y_test_single = y.iloc[test_idx]  # Single value
-        exog_train = exog.iloc[:test_idx]
-        exog_test_single = exog.iloc[test_idx:test_idx+1]  # Single row as DataFrame
+    if detail.empty:
+        status = summary['Status'].iloc[0] if not summary.empty else "Failed"
+        print(f"FAILED: {str(status)[:50]}")
+        print()
+        return pd.DataFrame([{'Error': 'Failed', 'Model': f"{model_name}{order}"}])
+    
+    results_table = []
+    for _, row in detail.iterrows():
+        actual = row['Actual']
+        prediction = row['Predicted']
+        error = actual - prediction
+        pct_error = (error / actual) * 100
+        converged = bool(row['Converged'])
+        status = "✓" if converged else "⚠"
         
-        train_years = f"{int(years[0])}-{int(years[test_idx-1])}"
+        print(f"Test Year: {int(row['Origin_Year'])} (Train: {row['Train_Years']}, n={int(row['Train_Size'])})")
+        print(f"  Actual     : {actual:>10.2f} TWh")
+        print(f"  Predicted  : {prediction:>10.2f} TWh")
+        print(f"  Error      : {error:>10.2f} TWh ({pct_error:>+6.2f}%)")
+        print(f"  APE        : {abs(pct_error):>10.2f}%")
+        print(f"  Converged  : {status}")
+        print()
         
-        try:
-            # Train model
-            model = SARIMAX(
-                y_train,
-                exog=exog_train,
-                order=order,
-                enforce_stationarity=False,
-                enforce_invertibility=False
-            )
-            result = model.fit(disp=False, maxiter=200, method='lbfgs')
-            
-            # Predict 1 step ahead
-            prediction = result.forecast(steps=1, exog=exog_test_single).iloc[0]
-            
-            # Calculate errors
-            actual = y_test_single
-            error = actual - prediction
-            pct_error = (error / actual) * 100
-            abs_pct_error = abs(pct_error)
-            
-            # Check convergence
-            converged = not hasattr(result, 'mle_retvals') or \
-                       (hasattr(result, 'mle_retvals') and result.mle_retvals.get('converged', True))
-            
-            status = "✓" if converged else "⚠"
-            
-            print(f"Test Year: {int(test_year)} (Train: {train_years}, n={len(y_train)})")
-            print(f"  Actual     : {actual:>10.2f} TWh")
-            print(f"  Predicted  : {prediction:>10.2f} TWh")
-            print(f"  Error      : {error:>10.2f} TWh ({pct_error:>+6.2f}%)")
-            print(f"  APE        : {abs_pct_error:>10.2f}%")
-            print(f"  Converged  : {status}")
-            print()
-            
-            results.append({
-                'Test_Year': int(test_year),
-                'Train_Period': train_years,
-                'Train_Size': len(y_train),
-                'Actual': actual,
-                'Predicted': prediction,
-                'Error': error,
-                'Pct_Error': pct_error,
-                'APE': abs_pct_error,
-                'Converged': converged,
-                'Model': f"{model_name}{order}"
-            })
-            
-        except Exception as e:
-            print(f"Test Year: {int(test_year)} - FAILED: {str(e)[:50]}")
-            print()
-            
-            results.append({
-                'Test_Year': int(test_year),
-                'Train_Period': train_years,
-                'Train_Size': len(y_train),
-                'Error': 'Failed',
-                'Model': f"{model_name}{order}"
-            })
-    
-    return pd.DataFrame(results)
+        results_table.append({
+            'Test_Year': int(row['Origin_Year']),
+            'Train_Period': row['Train_Years'],
+            'Train_Size': int(row['Train_Size']),
+            'Actual': actual,
+            'Predicted': prediction,
+            'Error': error,
+            'Pct_Error': pct_error,
+            'APE': abs(pct_error),
+            'Converged': converged,
+            'Model': f"{model_name}{order}"
+        })
+    
+    return pd.DataFrame(results_table)
 
 def main():
     print("="*80)
@@ -129,51 +88,20 @@ def main():
     print()
     
     # Load data
-    energy = pd.read_csv("data/raw/energy.csv")
-    gdp = pd.read_csv("data/raw/gdp.csv")
-    
-    # Preprocessing
-    energy_year_col = "Year" if "Year" in energy.columns else "year"
-    gdp_year_col = "year" if "year" in gdp.columns else "Year"
-    
-    energy_value_col = None
-    for col in ["fossil_fuels__twh", "fossil_fuels", "value", "Energy"]:
-        if col in energy.columns:
-            energy_value_col = col
-            break
-    
-    gdp_value_col = "gdp" if "gdp" in gdp.columns else "GDP"
-    
-    energy_clean = energy[[energy_year_col, energy_value_col]].copy()
-    energy_clean.columns = ["year", "energy"]
-    
-    gdp_clean = gdp[[gdp_year_col, gdp_value_col]].copy()
-    gdp_clean.columns = ["year", "gdp"]
-    
-    energy_clean = energy_clean.drop_duplicates(subset=["year"]).sort_values("year")
-    gdp_clean = gdp_clean.drop_duplicates(subset=["year"]).sort_values("year")
-    
-    df = pd.merge(energy_clean, gdp_clean, on="year", how="inner")
-    df = df.dropna()
+    df = load_experiment_data()
     df = df.set_index('year')
     
-    y = df["energy"]
-    exog = df[["gdp"]]
-    
     print(f"Dataset: {len(df)} observasi ({int(df.index.min())}-{int(df.index.max())})")
     print()
     
-    # Test berbagai model
-    models_to_test = [
-        ((3, 2, 6), "ARIMAX"),  # Dari identifikasi manual
-        ((1, 1, 1), "ARIMAX"),  # Baseline
-        ((3, 2, 1), "ARIMAX"),  # Best dari grid search
-    ]
+    # Test berbagai model: (3,2,6) identifikasi manual, (1,1,1) baseline,
+    # (3,2,1) best grid search (lihat EXPERIMENT_SPECS['rolling_forecast'])
+    results = run_experiment('rolling_forecast', df=df.reset_index())
     
     all_results = []
     
-    for order, model_name in models_to_test:
-        df_result = test_rolling_forecast(y, exog, order, start_year=2022, model_name=model_name)
+    for order in EXPERIMENT_SPECS['rolling_forecast']['orders']:
+        df_result = rolling_forecast_table(results, order, model_name="ARIMAX")
         all_results.append(df_result)
     
     # Combine results
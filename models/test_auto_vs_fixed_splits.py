@@ -12,7 +12,11 @@ Date: January 2026
 
 import pandas as pd
 import numpy as np
-from statsmodels.tsa.statespace.sarimax import SARIMAX
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.fit_cache import fit_sarimax
+from services.experiment_runner import load_experiment_data
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 from pmdarima import auto_arima
 import warnings
@@ -25,32 +29,7 @@ def test_auto_arima_splits():
     print()
     
     # Load data
-    energy = pd.read_csv("data/raw/energy.csv")
-    gdp = pd.read_csv("data/raw/gdp.csv")
-    
-    # Preprocessing
-    energy_year_col = "Year" if "Year" in energy.columns else "year"
-    gdp_year_col = "year" if "year" in gdp.columns else "Year"
-    
-    energy_value_col = None
-    for col in ["fossil_fuels__twh", "fossil_fuels", "value", "Energy"]:
-        if col in energy.columns:
-            energy_value_col = col
-            break
-    
-    gdp_value_col = "gdp" if "gdp" in gdp.columns else "GDP"
-    
-    energy_clean = energy[[energy_year_col, energy_value_col]].copy()
-    energy_clean.columns = ["year", "energy"]
-    
-    gdp_clean = gdp[[gdp_year_col, gdp_value_col]].copy()
-    gdp_clean.columns = ["year", "gdp"]
-    
-    energy_clean = energy_clean.drop_duplicates(subset=["year"]).sort_values("year")
-    gdp_clean = gdp_clean.drop_duplicates(subset=["year"]).sort_values("year")
-    
-    df = pd.merge(energy_clean, gdp_clean, on="year", how="inner")
-    df = df.dropna()
+    df = load_experiment_data()
     
     print(f"Total data: {len(df)} observasi")
     print(f"Period: {int(df['year'].min())}-{int(df['year'].max())}")
@@ -148,14 +127,7 @@ def test_auto_arima_splits():
         # ===== FIXED (1,1,1) =====
         print("  [FIXED 111] Training...")
         try:
-            model_fixed = SARIMAX(
-                y_train,
-                exog=exog_train,
-                order=(1, 1, 1),
-                enforce_stationarity=False,
-                enforce_invertibility=False
-            )
-            result_fixed = model_fixed.fit(disp=False)
+            result_fixed = fit_sarimax(y_train, exog_train, (1, 1, 1))
             predictions_fixed = result_fixed.forecast(steps=len(y_test), exog=exog_test)
             
             mae_fixed = mean_absolute_error(y_test, predictions_fixed)
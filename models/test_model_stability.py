@@ -15,92 +15,78 @@ Date: January 2026
 
 import pandas as pd
 import numpy as np
-from statsmodels.tsa.statespace.sarimax import SARIMAX
-from sklearn.metrics import mean_absolute_error, mean_squared_error
 from pmdarima import auto_arima
 import warnings
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.experiment_runner import EXPERIMENT_SPECS, load_experiment_data, run_experiment
 warnings.filterwarnings('ignore')
 
-def test_model_with_data_size(df, order, start_size, end_size, step=1):
+def stability_table(df, order, sizes):
     """
-    Test model performance dengan berbagai ukuran data
+    Fit order pada n data pertama untuk setiap n di sizes lewat experiment_runner
+    (spec 'model_stability': split 80:20, minimal 3 test points), hasilnya
+    dalam format tabel lama
     """
-    results = []
+    spec = {**EXPERIMENT_SPECS['model_stability'], 'orders': [order], 'data_sizes': list(sizes)}
+    runs = run_experiment('model_stability', spec=spec, df=df)
     
-    for size in range(start_size, min(end_size + 1, len(df) + 1), step):
-        if size < 20:  # Minimal data untuk testing
-            continue
-            
-        # Gunakan data dari awal sampai size
-        df_subset = df.iloc[:size].copy()
-        
-        # Train-test split 80-20
-        train_size = int(len(df_subset) * 0.8)
-        if len(df_subset) - train_size < 3:  # Minimal 3 test points
-            continue
-        
-        y = df_subset["energy"]
-        exog = df_subset[["gdp"]]
-        
-        y_train = y.iloc[:train_size]
-        y_test = y.iloc[train_size:]
-        exog_train = exog.iloc[:train_size]
-        exog_test = exog.iloc[train_size:]
-        
-        try:
-            # Train dengan order yang diberikan
-            model = SARIMAX(y_train, exog=exog_train, order=order,
-                          enforce_stationarity=False, enforce_invertibility=False)
-            result = model.fit(disp=False)
-            
-            # Predict
-            predictions = result.forecast(steps=len(y_test), exog=exog_test)
-            
-            # Metrics
-            mae = mean_absolute_error(y_test, predictions)
-            rmse = np.sqrt(mean_squared_error(y_test, predictions))
-            mape = np.mean(np.abs((y_test - predictions) / y_test)) * 100
-            
-            ss_res = np.sum((y_test - predictions) ** 2)
-            ss_tot = np.sum((y_test - np.mean(y_test)) ** 2)
-            r2 = 1 - (ss_res / ss_tot)
-            
-            results.append({
-                'data_size': size,
-                'train_size': train_size,
-                'test_size': len(y_test),
-                'year_range': f"{int(df_subset['year'].min())}-{int(df_subset['year'].max())}",
-                'order': str(order),
-                'mape': mape,
-                'rmse': rmse,
-                'mae': mae,
-                'r2': r2,
-                'aic': result.aic,
-                'status': 'Success'
-            })
-        except Exception as e:
+    years = df['year'].to_numpy()
+    results = []
+    for _, row in runs.iterrows():
+        size = int(row['Data_Size'])
+        if row['Status'] != 'Success':
             results.append({
                 'data_size': size,
                 'order': str(order),
-                'status': f'Failed: {str(e)[:50]}'
+                'status': row['Status']
             })
+            continue
+        results.append({
+            'data_size': size,
+            'train_size': int(row['Train_Size']),
+            'test_size': int(row['Test_Size']),
+            'year_range': f"{int(years[0])}-{int(years[size - 1])}",
+            'order': str(order),
+            'mape': row['MAPE'],
+            'rmse': row['RMSE'],
+            'mae': row['MAE'],
+            'r2': row['R2'],
+            'aic': row['AIC'],
+            'status': 'Success'
+        })
     
     return pd.DataFrame(results)
 
 
-def compare_fixed_vs_auto(df, sizes_to_test):
+def test_model_with_data_size(df, order, start_size, end_size, step=1):
+    """
+    Test model performance dengan berbagai ukuran data
+    """
+    sizes = [size for size in range(start_size, min(end_size + 1, len(df) + 1), step) if size >= 20]
+    return stability_table(df, order, sizes)
+
+
+def compare_fixed_vs_auto(df, sizes_to_test, fixed_results=None):
     """
     Bandingkan ARIMAX(1,1,1) fixed vs auto_arima untuk berbagai ukuran data
+    
+    Args:
+        fixed_results: Hasil test_model_with_data_size untuk (1,1,1); jika
+            tidak mencakup semua ukuran, dijalankan ulang lewat experiment_runner
     """
+    sizes_to_test = [size for size in sizes_to_test if 20 <= size <= len(df)]
+    if fixed_results is None or not set(sizes_to_test) <= set(fixed_results.get('data_size', [])):
+        fixed_results = stability_table(df, (1, 1, 1), sizes_to_test)
+    fixed_by_size = fixed_results.set_index('data_size')
+    
     comparison_results = []
     
     print("Testing model stability across different data sizes...")
     print("=" * 80)
     
     for size in sizes_to_test:
-        if size > len(df) or size < 20:
-            continue
-            
         print(f"\nTesting with {size} records...")
         
         df_subset = df.iloc[:size].copy()
@@ -113,20 +99,17 @@ def compare_fixed_vs_auto(df, sizes_to_test):
         exog_train = exog.iloc[:train_size]
         exog_test = exog.iloc[train_size:]
         
-        # Test FIXED (1,1,1)
-        try:
-            model_fixed = SARIMAX(y_train, exog=exog_train, order=(1,1,1),
-                                 enforce_stationarity=False, enforce_invertibility=False)
-            result_fixed = model_fixed.fit(disp=False)
-            pred_fixed = result_fixed.forecast(steps=len(y_test), exog=exog_test)
-            mape_fixed = np.mean(np.abs((y_test - pred_fixed) / y_test)) * 100
-            r2_fixed = 1 - (np.sum((y_test - pred_fixed) ** 2) / np.sum((y_test - np.mean(y_test)) ** 2))
-            
+        # FIXED (1,1,1) dari experiment_runner
+        fixed = fixed_by_size.loc[size] if size in fixed_by_size.index else None
+        if fixed is not None and fixed['status'] == 'Success':
+            mape_fixed = fixed['mape']
+            r2_fixed = fixed['r2']
             print(f"  ✓ FIXED (1,1,1): MAPE={mape_fixed:.2f}%, R²={r2_fixed:.4f}")
-        except Exception as e:
+        else:
             mape_fixed = None
             r2_fixed = None
-            print(f"  ✗ FIXED (1,1,1): Failed - {str(e)[:50]}")
+            status = fixed['status'] if fixed is not None else 'Failed'
+            print(f"  ✗ FIXED (1,1,1): {str(status)[:58]}")
         
         # Test AUTO ARIMA
         try:
@@ -169,32 +152,7 @@ def main():
     print()
     
     # Load data
-    energy = pd.read_csv("data/raw/energy.csv")
-    gdp = pd.read_csv("data/raw/gdp.csv")
-    
-    # Preprocessing (sama seperti sistem)
-    energy_year_col = "Year" if "Year" in energy.columns else "year"
-    gdp_year_col = "year" if "year" in gdp.columns else "Year"
-    
-    energy_value_col = None
-    for col in ["fossil_fuels__twh", "fossil_fuels", "value", "Energy"]:
-        if col in energy.columns:
-            energy_value_col = col
-            break
-    
-    gdp_value_col = "gdp" if "gdp" in gdp.columns else "GDP"
-    
-    energy_clean = energy[[energy_year_col, energy_value_col]].copy()
-    energy_clean.columns = ["year", "energy"]
-    
-    gdp_clean = gdp[[gdp_year_col, gdp_value_col]].copy()
-    gdp_clean.columns = ["year", "gdp"]
-    
-    energy_clean = energy_clean.drop_duplicates(subset=["year"]).sort_values("year")
-    gdp_clean = gdp_clean.drop_duplicates(subset=["year"]).sort_values("year")
-    
-    df = pd.merge(energy_clean, gdp_clean, on="year", how="inner")
-    df = df.dropna()
+    df = load_experiment_data()
     
     print(f"Total data available: {len(df)} records ({df['year'].min():.0f}-{df['year'].max():.0f})")
     print()
@@ -235,7 +193,7 @@ def main():
     
     # Test dengan berbagai ukuran: 30, 35, 40, 45, 50
     sizes_to_test = [30, 35, 40, 45, 50]
-    comparison_df = compare_fixed_vs_auto(df, sizes_to_test)
+    comparison_df = compare_fixed_vs_auto(df, sizes_to_test, stability_results)
     
     print("\n" + "=" * 80)
     print("RINGKASAN PERBANDINGAN:")
@@ -10,8 +10,10 @@ Date: January 2026
 
 import pandas as pd
 import numpy as np
-from statsmodels.tsa.statespace.sarimax import SARIMAX
-from sklearn.metrics import mean_absolute_error, mean_squared_error
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.experiment_runner import load_experiment_data, run_experiment
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -22,128 +24,36 @@ def test_train_test_split():
     print()
     
     # Load data
-    energy = pd.read_csv("data/raw/energy.csv")
-    gdp = pd.read_csv("data/raw/gdp.csv")
-    
-    # Preprocessing
-    energy_year_col = "Year" if "Year" in energy.columns else "year"
-    gdp_year_col = "year" if "year" in gdp.columns else "Year"
-    
-    energy_value_col = None
-    for col in ["fossil_fuels__twh", "fossil_fuels", "value", "Energy"]:
-        if col in energy.columns:
-            energy_value_col = col
-            break
-    
-    gdp_value_col = "gdp" if "gdp" in gdp.columns else "GDP"
-    
-    energy_clean = energy[[energy_year_col, energy_value_col]].copy()
-    energy_clean.columns = ["year", "energy"]
-    
-    gdp_clean = gdp[[gdp_year_col, gdp_value_col]].copy()
-    gdp_clean.columns = ["year", "gdp"]
-    
-    energy_clean = energy_clean.drop_duplicates(subset=["year"]).sort_values("year")
-    gdp_clean = gdp_clean.drop_duplicates(subset=["year"]).sort_values("year")
-    
-    df = pd.merge(energy_clean, gdp_clean, on="year", how="inner")
-    df = df.dropna()
+    df = load_experiment_data()
     
     print(f"Total data: {len(df)} observasi")
     print(f"Period: {int(df['year'].min())}-{int(df['year'].max())}")
     print()
     
-    # Prepare data
-    y = df["energy"]
-    exog = df[["gdp"]]
-    
-    # Test berbagai split ratios
-    split_ratios = [0.60, 0.65, 0.70, 0.75, 0.80, 0.85, 0.90]
-    
-    results = []
-    
+    # Kartesius split x order dijalankan oleh experiment_runner (spec 'train_test_splits')
     print("=" * 80)
     print("TESTING BERBAGAI TRAIN/TEST SPLIT RATIOS")
     print("=" * 80)
     print()
     
-    for ratio in split_ratios:
-        train_size = int(len(df) * ratio)
-        test_size = len(df) - train_size
-        
-        # Validasi: test set minimal 5 observasi
-        if test_size < 5:
-            print(f"Skip {int(ratio*100)}:{int((1-ratio)*100)} - Test set terlalu kecil ({test_size} obs)")
-            continue
-        
-        # Validasi: train set minimal 30 observasi
-        if train_size < 30:
-            print(f"Skip {int(ratio*100)}:{int((1-ratio)*100)} - Train set terlalu kecil ({train_size} obs)")
-            continue
-        
-        y_train = y.iloc[:train_size]
-        y_test = y.iloc[train_size:]
-        exog_train = exog.iloc[:train_size]
-        exog_test = exog.iloc[train_size:]
-        
-        print(f"Testing {int(ratio*100)}:{int((1-ratio)*100)} split...")
-        print(f"  Train: {train_size} obs ({int(df['year'].iloc[0])}-{int(df['year'].iloc[train_size-1])})")
-        print(f"  Test:  {test_size} obs ({int(df['year'].iloc[train_size])}-{int(df['year'].iloc[-1])})")
-        
-        try:
-            # Train ARIMAX(1,1,1)
-            model = SARIMAX(
-                y_train,
-                exog=exog_train,
-                order=(1, 1, 1),
-                enforce_stationarity=False,
-                enforce_invertibility=False
-            )
-            result = model.fit(disp=False)
-            
-            # Predict
-            predictions = result.forecast(steps=len(y_test), exog=exog_test)
-            
-            # Metrics
-            mae = mean_absolute_error(y_test, predictions)
-            rmse = np.sqrt(mean_squared_error(y_test, predictions))
-            mape = np.mean(np.abs((y_test - predictions) / y_test)) * 100
-            
-            ss_res = np.sum((y_test - predictions) ** 2)
-            ss_tot = np.sum((y_test - np.mean(y_test)) ** 2)
-            r2 = 1 - (ss_res / ss_tot)
-            
-            print(f"  ✓ MAPE: {mape:.2f}%, RMSE: {rmse:.2f}, MAE: {mae:.2f}, R²: {r2:.4f}")
-            
-            results.append({
-                'Split': f"{int(ratio*100)}:{int((1-ratio)*100)}",
-                'Train_Pct': int(ratio*100),
-                'Test_Pct': int((1-ratio)*100),
-                'Train_Size': train_size,
-                'Test_Size': test_size,
-                'Train_Years': f"{int(df['year'].iloc[0])}-{int(df['year'].iloc[train_size-1])}",
-                'Test_Years': f"{int(df['year'].iloc[train_size])}-{int(df['year'].iloc[-1])}",
-                'MAPE': mape,
-                'RMSE': rmse,
-                'MAE': mae,
-                'R2': r2,
-                'AIC': result.aic,
-                'Status': 'Success'
-            })
-            
-        except Exception as e:
-            print(f"  ✗ FAILED: {str(e)[:50]}")
-            results.append({
-                'Split': f"{int(ratio*100)}:{int((1-ratio)*100)}",
-                'Train_Size': train_size,
-                'Test_Size': test_size,
-                'Status': f'Failed: {str(e)[:30]}'
-            })
-        
-        print()
-    
-    # Create DataFrame
-    df_results = pd.DataFrame(results)
+    runs = run_experiment('train_test_splits', df=df)
+    
+    # Format tabel lama (models/train_test_split_comparison.csv)
+    df_results = pd.DataFrame({
+        'Split': runs['Split'],
+        'Train_Pct': (runs['Split_Ratio'] * 100).round().astype(int),
+        'Test_Pct': 100 - (runs['Split_Ratio'] * 100).round().astype(int),
+        'Train_Size': runs['Train_Size'],
+        'Test_Size': runs['Test_Size'],
+        'Train_Years': runs['Train_Years'],
+        'Test_Years': runs['Test_Years'],
+        'MAPE': runs['MAPE'],
+        'RMSE': runs['RMSE'],
+        'MAE': runs['MAE'],
+        'R2': runs['R2'],
+        'AIC': runs['AIC'],
+        'Status': runs['Status']
+    })
     
     # Sort by MAPE
     df_results_sorted = df_results[df_results['Status'] == 'Success'].sort_values('MAPE')
@@ -23,10 +23,12 @@ Date: January 2026
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from statsmodels.tsa.statespace.sarimax import SARIMAX
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.fit_cache import fit_sarimax
+from services.experiment_runner import EXPERIMENT_SPECS, load_experiment_data, run_experiment
 from statsmodels.stats.diagnostic import acorr_ljungbox
-from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
-from sklearn.metrics import mean_absolute_error, mean_squared_error
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -175,9 +177,10 @@ def analyze_acf_pacf_ranges():
     
     return candidates
 
-def test_all_valid_candidates(y, exog):
+def test_all_valid_candidates(df):
     """
     Test semua kandidat valid dari ACF/PACF dengan split 70:30
+    (spec 'acf_pacf_candidates' di experiment_runner)
     """
     
     # Get candidates
@@ -188,79 +191,36 @@ def test_all_valid_candidates(y, exog):
     print("="*80)
     print()
     
-    train_size = int(len(y) * 0.7)
-    y_train = y.iloc[:train_size]
-    y_test = y.iloc[train_size:]
-    exog_train = exog.iloc[:train_size]
-    exog_test = exog.iloc[train_size:]
+    spec = {**EXPERIMENT_SPECS['acf_pacf_candidates'], 'orders': candidates}
+    runs = run_experiment('acf_pacf_candidates', spec=spec, df=df)
     
     results = []
     
-    for order in candidates:
-        print(f"Testing ARIMAX{order}...")
-        
-        try:
-            # Train
-            model = SARIMAX(
-                y_train,
-                exog=exog_train,
-                order=order,
-                enforce_stationarity=False,
-                enforce_invertibility=False
-            )
-            result = model.fit(disp=False, maxiter=200, method='lbfgs')
-            
-            # Predict
-            predictions = result.forecast(steps=len(y_test), exog=exog_test)
-            
-            # Metrics
-            mae = mean_absolute_error(y_test, predictions)
-            rmse = np.sqrt(mean_squared_error(y_test, predictions))
-            mape = np.mean(np.abs((y_test - predictions) / y_test)) * 100
-            
-            ss_res = np.sum((y_test - predictions) ** 2)
-            ss_tot = np.sum((y_test - np.mean(y_test)) ** 2)
-            r2 = 1 - (ss_res / ss_tot)
-            
-            # Check convergence
-            converged = not hasattr(result, 'mle_retvals') or \
-                       (hasattr(result, 'mle_retvals') and result.mle_retvals.get('converged', True))
-            
-            # Check residual autocorrelation
-            residuals = result.resid
-            lb_test = acorr_ljungbox(residuals, lags=10, return_df=True)
-            no_autocorr = (lb_test['lb_pvalue'] > 0.05).all()
-            
-            results.append({
-                'Order': str(order),
-                'p': order[0],
-                'd': order[1],
-                'q': order[2],
-                'MAPE': mape,
-                'R2': r2,
-                'MAE': mae,
-                'RMSE': rmse,
-                'AIC': result.aic,
-                'BIC': result.bic,
-                'Converged': converged,
-                'No_Autocorr': no_autocorr,
-                'N_Params': order[0] + order[2] + 1,  # p + q + exog
-                'Status': 'Success'
-            })
-            
-            conv_str = "✓" if converged else "⚠"
-            auto_str = "✓" if no_autocorr else "✗"
-            
-            print(f"  MAPE: {mape:>6.2f}%  R²: {r2:>6.4f}  Conv: {conv_str}  No-Autocorr: {auto_str}")
-            
-        except Exception as e:
-            print(f"  FAILED: {str(e)[:50]}")
+    for _, row in runs.iterrows():
+        order = (int(row['p']), int(row['d']), int(row['q']))
+        if row['Status'] != 'Success':
             results.append({
                 'Order': str(order),
                 'Status': 'Failed'
             })
+            continue
         
-        print()
+        results.append({
+            'Order': str(order),
+            'p': order[0],
+            'd': order[1],
+            'q': order[2],
+            'MAPE': row['MAPE'],
+            'R2': row['R2'],
+            'MAE': row['MAE'],
+            'RMSE': row['RMSE'],
+            'AIC': row['AIC'],
+            'BIC': row['BIC'],
+            'Converged': bool(row['Converged']),
+            'No_Autocorr': bool(row['No_Autocorr']),
+            'N_Params': order[0] + order[2] + 1,  # p + q + exog
+            'Status': 'Success'
+        })
     
     return pd.DataFrame(results)
 
@@ -271,38 +231,13 @@ def main():
     print()
     
     # Load data
-    energy = pd.read_csv("data/raw/energy.csv")
-    gdp = pd.read_csv("data/raw/gdp.csv")
-    
-    # Preprocessing
-    energy_year_col = "Year" if "Year" in energy.columns else "year"
-    gdp_year_col = "year" if "year" in gdp.columns else "Year"
-    
-    energy_value_col = None
-    for col in ["fossil_fuels__twh", "fossil_fuels", "value", "Energy"]:
-        if col in energy.columns:
-            energy_value_col = col
-            break
-    
-    gdp_value_col = "gdp" if "gdp" in gdp.columns else "GDP"
-    
-    energy_clean = energy[[energy_year_col, energy_value_col]].copy()
-    energy_clean.columns = ["year", "energy"]
-    
-    gdp_clean = gdp[[gdp_year_col, gdp_value_col]].copy()
-    gdp_clean.columns = ["year", "gdp"]
-    
-    energy_clean = energy_clean.drop_duplicates(subset=["year"]).sort_values("year")
-    gdp_clean = gdp_clean.drop_duplicates(subset=["year"]).sort_values("year")
-    
-    df = pd.merge(energy_clean, gdp_clean, on="year", how="inner")
-    df = df.dropna()
+    df = load_experiment_data()
     
     y = df["energy"]
     exog = df[["gdp"]]
     
     # Test all candidates
-    df_results = test_all_valid_candidates(y, exog)
+    df_results = test_all_valid_candidates(df)
     
     # Filter success only
     df_success = df_results[df_results['Status'] == 'Success'].copy()
@@ -347,9 +282,7 @@ def main():
     for _, row in top3.iterrows():
         order = eval(row['Order'])  # Convert string back to tuple
         
-        model = SARIMAX(y_train, exog=exog_train, order=order,
-                       enforce_stationarity=False, enforce_invertibility=False)
-        result = model.fit(disp=False, maxiter=200, method='lbfgs')
+        result = fit_sarimax(y_train, exog_train, order, fit_kwargs={'maxiter': 200, 'method': 'lbfgs'})
         
         residuals = result.resid
         
@@ -11,9 +11,13 @@ Date: January 2026
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from statsmodels.tsa.stattools import adfuller, acf, pacf
-from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
 import warnings
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.experiment_runner import load_experiment_data
+from services.stationarity import analyze_stationarity
+from services.correlation import correlations, plot_correlation
 warnings.filterwarnings('ignore')
 
 # Atur style untuk plot yang lebih menarik
@@ -26,32 +30,7 @@ def main():
     print()
     
     # Load data
-    energy = pd.read_csv("data/raw/energy.csv")
-    gdp = pd.read_csv("data/raw/gdp.csv")
-    
-    # Preprocessing
-    energy_year_col = "Year" if "Year" in energy.columns else "year"
-    gdp_year_col = "year" if "year" in gdp.columns else "Year"
-    
-    energy_value_col = None
-    for col in ["fossil_fuels__twh", "fossil_fuels", "value", "Energy"]:
-        if col in energy.columns:
-            energy_value_col = col
-            break
-    
-    gdp_value_col = "gdp" if "gdp" in gdp.columns else "GDP"
-    
-    energy_clean = energy[[energy_year_col, energy_value_col]].copy()
-    energy_clean.columns = ["year", "energy"]
-    
-    gdp_clean = gdp[[gdp_year_col, gdp_value_col]].copy()
-    gdp_clean.columns = ["year", "gdp"]
-    
-    energy_clean = energy_clean.drop_duplicates(subset=["year"]).sort_values("year")
-    gdp_clean = gdp_clean.drop_duplicates(subset=["year"]).sort_values("year")
-    
-    df = pd.merge(energy_clean, gdp_clean, on="year", how="inner")
-    df = df.dropna()
+    df = load_experiment_data()
     
     # Split 70:30
     train_size = int(len(df) * 0.7)
@@ -61,30 +40,31 @@ def main():
     print("LANGKAH 1: Differencing untuk Stasioneritas")
     print("-" * 80)
     
-    # Test stasioneritas
-    result = adfuller(y_train, autolag='AIC')
+    # Test stasioneritas d=0..2 (sekali, memoized)
+    levels = analyze_stationarity(y_train, max_d=2)['levels']
+    result = levels[0]['adf']
     print(f"Data asli (d=0):")
-    print(f"  ADF Statistic: {result[0]:.6f}")
-    print(f"  p-value      : {result[1]:.6f}")
-    print(f"  Kesimpulan   : {'Stasioner' if result[1] < 0.05 else 'TIDAK Stasioner'}")
+    print(f"  ADF Statistic: {result['test_statistic']:.6f}")
+    print(f"  p-value      : {result['p_value']:.6f}")
+    print(f"  Kesimpulan   : {'Stasioner' if result['p_value'] < 0.05 else 'TIDAK Stasioner'}")
     print()
     
     # Differencing 1x
     y_diff1 = y_train.diff().dropna()
-    result1 = adfuller(y_diff1, autolag='AIC')
+    result1 = levels[1]['adf']
     print(f"Setelah differencing 1x (d=1):")
-    print(f"  ADF Statistic: {result1[0]:.6f}")
-    print(f"  p-value      : {result1[1]:.6f}")
-    print(f"  Kesimpulan   : {'Stasioner' if result1[1] < 0.05 else 'TIDAK Stasioner'}")
+    print(f"  ADF Statistic: {result1['test_statistic']:.6f}")
+    print(f"  p-value      : {result1['p_value']:.6f}")
+    print(f"  Kesimpulan   : {'Stasioner' if result1['p_value'] < 0.05 else 'TIDAK Stasioner'}")
     print()
     
     # Differencing 2x
     y_diff2 = y_diff1.diff().dropna()
-    result2 = adfuller(y_diff2, autolag='AIC')
+    result2 = levels[2]['adf']
     print(f"Setelah differencing 2x (d=2):")
-    print(f"  ADF Statistic: {result2[0]:.6f}")
-    print(f"  p-value      : {result2[1]:.6f}")
-    print(f"  Kesimpulan   : {'✓ STASIONER' if result2[1] < 0.05 else 'TIDAK Stasioner'}")
+    print(f"  ADF Statistic: {result2['test_statistic']:.6f}")
+    print(f"  p-value      : {result2['p_value']:.6f}")
+    print(f"  Kesimpulan   : {'✓ STASIONER' if result2['p_value'] < 0.05 else 'TIDAK Stasioner'}")
     print()
     
     print(f"→ Hasil: d = 2 (perlu differencing 2 kali)")
@@ -99,12 +79,14 @@ def main():
     print()
     
     # Hitung ACF dan PACF
+    # (FFT + Durbin-Levinson, di-cache dan dipakai ulang untuk plot di bawah)
     max_lag = 20
-    acf_values = acf(series_diff, nlags=max_lag, fft=False)
-    pacf_values = pacf(series_diff, nlags=max_lag, method='ywm')
+    correlation = correlations(series_diff, nlags=max_lag)
+    acf_values = correlation['acf']
+    pacf_values = correlation['pacf']
     
     # Confidence interval (95%)
-    conf_interval = 1.96 / np.sqrt(len(series_diff))
+    conf_interval = correlation['white_noise_band']
     
     print("CARA MEMBACA PLOT:")
     print("-" * 80)
@@ -185,7 +167,7 @@ def main():
     
     # ACF plot
     ax1 = plt.subplot(2, 1, 1)
-    plot_acf(series_diff, lags=max_lag, ax=ax1, alpha=0.05)
+    plot_correlation(ax1, correlation, 'acf')
     ax1.set_title('ACF (Autocorrelation Function) - Untuk Menentukan q (MA Order)', 
                   fontsize=14, fontweight='bold', pad=20)
     ax1.set_xlabel('Lag', fontsize=12)
@@ -217,7 +199,7 @@ def main():
     
     # PACF plot
     ax2 = plt.subplot(2, 1, 2)
-    plot_pacf(series_diff, lags=max_lag, ax=ax2, alpha=0.05, method='ywm')
+    plot_correlation(ax2, correlation, 'pacf')
     ax2.set_title('PACF (Partial Autocorrelation Function) - Untuk Menentukan p (AR Order)', 
                   fontsize=14, fontweight='bold', pad=20)
     ax2.set_xlabel('Lag', fontsize=12)
@@ -9,6 +9,7 @@ from services.update_data_api import (
     get_gdp_data
 )
 from services.train_service import retrain_model
+from services.incremental_update import incremental_update, DRIFT_THRESHOLD, DEFAULT_REFINE_ITERATIONS
 from datetime import datetime
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin', template_folder='../templates/admin')
@@ -46,7 +47,15 @@ def update_data_and_train():
     last_update_info["energy"] = now
     last_update_info["gdp"] = now
 
-    train_result = retrain_model()
+    # Default: update inkremental (append tahun baru ke model aktif);
+    # retrain penuh hanya jika diminta (?mode=full) atau drift melewati threshold
+    if request.args.get("mode") == "full":
+        train_result = retrain_model()
+    else:
+        train_result = incremental_update(
+            drift_threshold=request.args.get("drift_threshold", DRIFT_THRESHOLD, type=float),
+            refine_iterations=request.args.get("refine_iterations", DEFAULT_REFINE_ITERATIONS, type=int)
+        )
 
     return jsonify({
         "message": "Data updated & model retrained",
@@ -1,8 +1,17 @@
-from flask import Blueprint, request, jsonify
+import os
+from flask import Blueprint, request, jsonify, send_file
 from decimal import Decimal
 from datetime import datetime
 from sqlalchemy import text
-from services.predict_service import predict_energy_service
+from services.predict_service import predict_energy_service, predict_batch_service, SCENARIOS
+from services.model_registry import get_model_info, ACTIVE_MODEL
+from services.simulation_service import (
+    simulate_fan_chart,
+    historical_growth_rates,
+    DEFAULT_N_PATHS,
+    DEFAULT_SEED,
+    MAX_N_PATHS
+)
 from services.update_data_api import (
     fetch_data_from_api,
     upload_data_from_files,
@@ -12,7 +21,9 @@ from services.update_data_api import (
 )
 
 from services.data_validator import validate_data_compatibility, get_data_alignment_report
-from services.train_service import retrain_model
+from services.train_service import retrain_model, TOTAL_TRAINING_STEPS, FINAL_FIT_MODES
+from services.job_service import submit_job, get_job
+from services.response_cache import cached_response
 from services.database_service import (
     get_training_history,
     get_data_update_history,
@@ -25,8 +36,14 @@ from services.database_service import (
     get_candidate_models,
     activate_model,
     delete_candidate_model,
-    get_all_models_comparison
+    get_all_models_comparison,
+    get_training_detail as fetch_training_detail,
+    get_latest_prediction as fetch_latest_prediction
 )
+from services.plot_store import PLOT_NAMES, PLOT_CACHE_MAX_AGE, get_plot_file, plot_urls
+from services.backtest_service import backtest_model, DEFAULT_HORIZON, MAX_HORIZON, MIN_TRAIN_SIZE
+from services.stationarity import analyze_stationarity, DEFAULT_MAX_D, DEFAULT_KPSS_REGRESSION
+from services.data_store import get_aligned_data
 from services.data_mysql_service import (
     get_energy_from_db,
     get_gdp_from_db,
@@ -72,6 +89,68 @@ def predict():
         "saved_to_database": save_to_db
     })
 
+@api_bp.route("/predict/batch", methods=["POST"])
+def predict_batch():
+    """Forecast beberapa skenario (dan horizon) sekaligus dalam satu request"""
+    data = request.json or {}
+    scenarios = data.get("scenarios")
+    growth_rates = data.get("growthRates") or []
+    years = data.get("years", 3)
+    baseline = data.get("baseline")
+    horizons = years if isinstance(years, list) else [years]
+
+    if (scenarios is not None and not isinstance(scenarios, list)) or not isinstance(growth_rates, list):
+        return jsonify({"error": "scenarios dan growthRates harus berupa list"}), 400
+    if scenarios is not None and any(scenario not in SCENARIOS for scenario in scenarios):
+        return jsonify({"error": "Invalid scenario"}), 400
+    if scenarios == [] and not growth_rates:
+        return jsonify({"error": "Minimal satu skenario atau growthRates harus diisi"}), 400
+
+    try:
+        horizons = [int(y) for y in horizons]
+        growth_rates = [float(g) for g in growth_rates]
+        baseline = float(baseline) if baseline is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "years, growthRates dan baseline harus berupa angka"}), 400
+
+    if not horizons or any(y < 1 or y > 10 for y in horizons):
+        return jsonify({"error": "Periode prediksi max 10 tahun"}), 400
+
+    try:
+        forecasts = predict_batch_service(scenarios, growth_rates, horizons, baseline)
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+    return jsonify({
+        "status": "success",
+        "years": sorted(set(horizons)),
+        "forecasts": forecasts
+    })
+
+@api_bp.route("/predict/fan-chart", methods=["GET"])
+def predict_fan_chart():
+    """Fan chart Monte Carlo: persentil forecast energi dengan jalur GDP bootstrap"""
+    n_paths = request.args.get("paths", DEFAULT_N_PATHS, type=int)
+    years = request.args.get("years", 10, type=int)
+    seed = request.args.get("seed", DEFAULT_SEED, type=int)
+
+    if n_paths < 100 or n_paths > MAX_N_PATHS:
+        return jsonify({"error": f"Jumlah jalur harus antara 100 - {MAX_N_PATHS}"}), 400
+    if years < 1 or years > 10:
+        return jsonify({"error": "Periode prediksi max 10 tahun"}), 400
+
+    try:
+        # Cache per ID model aktif (fallback ke file model aktif)
+        active_model = get_active_model()
+        model_id = active_model['id'] if active_model else ACTIVE_MODEL
+        if get_model_info(model_id) is None:
+            model_id = ACTIVE_MODEL
+
+        result = simulate_fan_chart(n_paths=n_paths, years=years, seed=seed, model_id=model_id)
+        return jsonify({"status": "success", **result})
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
 def get_avg_gdp_growth():
     result = db.session.execute(text("""
         SELECT tahun, nilai FROM gdp ORDER BY tahun
@@ -145,6 +224,7 @@ def upload_data():
 
 
 @api_bp.route("/data/energy", methods=["GET"])
+@cached_response
 def energy_data():
     """Get preview data energi dari MySQL"""
     try:
@@ -188,6 +268,7 @@ def energy_data():
 
 
 @api_bp.route("/data/gdp", methods=["GET"])
+@cached_response
 def gdp_data():
     """Get preview data GDP dari MySQL"""
     try:
@@ -251,15 +332,8 @@ def get_gdp_scenario():
         # Urutkan berdasarkan tahun
         data_sorted = sorted(data, key=lambda x: x['year'])
 
-        growth_rates = []
-
-        for i in range(1, len(data_sorted)):
-            prev = float(data_sorted[i-1]['gdp'])
-            curr = float(data_sorted[i]['gdp'])
-
-            if prev != 0:
-                growth = ((curr - prev) / prev) * 100
-                growth_rates.append(growth)
+        # Growth yang sama dipakai untuk bootstrap simulasi fan chart
+        growth_rates = historical_growth_rates([row['gdp'] for row in data_sorted]) * 100
 
         if len(growth_rates) == 0:
             return jsonify({
@@ -267,7 +341,7 @@ def get_gdp_scenario():
                 "message": "Tidak ada growth rate yang valid"
             })
 
-        avg_growth = sum(growth_rates) / len(growth_rates)
+        avg_growth = float(growth_rates.mean())
 
         return jsonify({
             "success": True,
@@ -354,6 +428,42 @@ def alignment_report():
         }), 500
 
 
+@api_bp.route("/data/stationarity", methods=["GET"])
+def data_stationarity():
+    """
+    Uji ADF & KPSS untuk data energi pada level differencing 0..max_d
+    (memoized per hash data, sama dengan yang dipakai retrain)
+    
+    Query params:
+        max_d: Order differencing tertinggi (default 2, maks 3)
+        kpss_regression: 'c' atau 'ct' (default 'ct')
+    """
+    try:
+        max_d = min(max(int(request.args.get('max_d', DEFAULT_MAX_D)), 0), 3)
+        kpss_regression = request.args.get('kpss_regression', DEFAULT_KPSS_REGRESSION)
+        if kpss_regression not in ('c', 'ct'):
+            return jsonify({"success": False, "message": "kpss_regression harus 'c' atau 'ct'"}), 400
+        
+        df = get_aligned_data()
+        if df is None or df.empty:
+            return jsonify({"success": False, "message": "Data energi & GDP belum tersedia"}), 404
+        
+        analysis = analyze_stationarity(df['energy'].to_numpy(), max_d=max_d, kpss_regression=kpss_regression)
+        return jsonify({
+            "success": True,
+            "years": [int(df['year'].min()), int(df['year'].max())],
+            "stationarity": analysis
+        })
+        
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": str(e)
+        }), 500
+
+
 # ===== MODEL TRAINING API ENDPOINTS =====
 
 @api_bp.route("/model/train", methods=["POST"])
@@ -366,6 +476,7 @@ def train_model():
         forecast_years = data.get('forecastYears', 3)  # Number of years to forecast
         order_mode = data.get('orderMode', 'auto')  # 'auto' or 'manual'
         manual_order = None
+        final_fit = data.get('finalFit', 'warm')  # 'warm', 'full', atau 'append'
         
         # Validasi range
         if train_test_split < 0.5 or train_test_split > 0.95:
@@ -374,6 +485,12 @@ def train_model():
                 "message": "Train/test split harus antara 50% - 95%"
             }), 400
         
+        if final_fit not in FINAL_FIT_MODES:
+            return jsonify({
+                "success": False,
+                "message": f"finalFit harus salah satu dari: {', '.join(FINAL_FIT_MODES)}"
+            }), 400
+        
         # Get manual order if specified
         if order_mode == 'manual':
             order_data = data.get('order', {})
@@ -385,50 +502,101 @@ def train_model():
         
         print(f"Training with mode={order_mode}, manual_order={manual_order}, forecast_years={forecast_years}")
         
-        # Call train_service untuk retrain model
-        result = retrain_model(
-            train_test_split=train_test_split,
-            order_mode=order_mode,
-            manual_order=manual_order,
-            forecast_years=forecast_years
+        train_kwargs = {
+            "train_test_split": train_test_split,
+            "order_mode": order_mode,
+            "manual_order": manual_order,
+            "forecast_years": forecast_years,
+            "final_fit": final_fit
+        }
+        
+        # Mode sinkron (lama) tetap tersedia untuk client yang mengirim async=false
+        if not data.get('async', True):
+            response, status_code = _build_train_response(retrain_model(**train_kwargs))
+            return jsonify(response), status_code
+        
+        # Jalankan training di background, langsung kembalikan task id
+        task_id = submit_job(
+            'training',
+            _run_training_job,
+            total_steps=TOTAL_TRAINING_STEPS,
+            **train_kwargs
         )
         
-        if result["status"] == "success":
-            return jsonify({
-                "success": True,
-                "message": result["message"],
-                "taskId": "training_complete",
-                "details": {
-                    "rows_used": result.get("rows_used"),
-                    "year_range": result.get("year_range"),
-                    "energy_stats": result.get("energy_stats"),
-                    "gdp_stats": result.get("gdp_stats")
-                },
-                "metrics": result.get("metrics", {})
-            })
-        else:
-            return jsonify({
-                "success": False,
-                "message": result["message"],
-                "details": result.get("details")
-            }), 400
+        return jsonify({
+            "success": True,
+            "status": "queued",
+            "taskId": task_id,
+            "message": "Training dimulai di background"
+        }), 202
             
     except Exception as e:
         return jsonify({
             "success": False,
             "message": f"Error training model: {str(e)}"
         }), 500
+
+
+def _build_train_response(result):
+    """Format hasil retrain_model menjadi response API (body, status code)"""
+    if result["status"] == "success":
+        return {
+            "success": True,
+            "message": result["message"],
+            "taskId": "training_complete",
+            "details": {
+                "rows_used": result.get("rows_used"),
+                "year_range": result.get("year_range"),
+                "energy_stats": result.get("energy_stats"),
+                "gdp_stats": result.get("gdp_stats")
+            },
+            "metrics": result.get("metrics", {})
+        }, 200
+    else:
+        return {
+            "success": False,
+            "message": result["message"],
+            "details": result.get("details")
+        }, 400
+
+
+def _run_training_job(progress_callback=None, **train_kwargs):
+    """Dijalankan oleh job_service di background thread"""
+    result = retrain_model(progress_callback=progress_callback, **train_kwargs)
+    response, _ = _build_train_response(result)
+    return response
+
+
 @api_bp.route("/model/training-progress/<task_id>", methods=["GET"])
 def training_progress(task_id):
-    """Monitor progress training (simplified untuk saat ini)"""
-    # Untuk implementasi sederhana, langsung return completed
-    # Bisa dikembangkan dengan websocket atau polling yang lebih advanced
-    return jsonify({
-        "status": "completed",
-        "currentStep": 5,
-        "overallProgress": 100,
-        "message": "Training selesai!"
-    })
+    """Monitor progress training background job"""
+    job = get_job(task_id)
+    
+    if not job:
+        return jsonify({
+            "status": "not_found",
+            "message": "Task tidak ditemukan"
+        }), 404
+    
+    response = {
+        "status": job['status'],
+        "currentStep": job['current_step'],
+        "totalSteps": job['total_steps'],
+        "overallProgress": job['progress'],
+        "message": job['message'],
+        "steps": job['events'],
+        "createdAt": job['created_at'],
+        "startedAt": job['started_at'],
+        "finishedAt": job['finished_at']
+    }
+    
+    if job['status'] == 'completed':
+        response["message"] = "Training selesai!"
+        response["result"] = job['result']
+    elif job['status'] == 'failed' and job['result']:
+        response["result"] = job['result']
+    
+    return jsonify(response)
 
 
 @api_bp.route("/model/info", methods=["GET"])
@@ -469,14 +637,10 @@ def model_info():
             mtime = os.path.getmtime(model_path)
             last_trained = datetime.fromtimestamp(mtime).strftime("%d %b %Y %H:%M")
             
-            # Get data count from CSV
-            import pandas as pd
-            energy_path = "data/raw/energy.csv"
-            data_count = 0
-            
-            if os.path.exists(energy_path):
-                df = pd.read_csv(energy_path)
-                data_count = len(df)
+            # Get data count from data store
+            from services.data_store import get_store_info
+            store_info = get_store_info()
+            data_count = store_info["energy_records"] if store_info else 0
             
             # Load metrics if available
             mape = None
@@ -623,29 +787,17 @@ def history_training():
 
 @api_bp.route("/training-history/<int:id>", methods=["GET"])
 def get_training_detail(id):
-    """Get detail training history by ID with visualization plots"""
+    """Get detail training history by ID, plot sebagai URL ke endpoint PNG"""
     try:
-        from services.database_service import get_db_connection
         import json
         
-        connection = get_db_connection()
-        cursor = connection.cursor(dictionary=True)
-        
-        cursor.execute("""
-            SELECT * FROM training_history WHERE id = %s
-        """, (id,))
-        
-        record = cursor.fetchone()
-        
-        cursor.close()
-        connection.close()
+        record = fetch_training_detail(id)
         
         if record:
             # Convert datetime to string
-            if record.get('training_date'):
-                record['training_date'] = record['training_date'].isoformat()
-            if record.get('created_at'):
-                record['created_at'] = record['created_at'].isoformat()
+            for key in ('training_date', 'created_at', 'activated_at'):
+                if record.get(key):
+                    record[key] = record[key].isoformat()
             
             # Parse preprocessing_steps JSON if exists
             if record.get('preprocessing_steps'):
@@ -654,6 +806,9 @@ def get_training_detail(id):
                 except:
                     record['preprocessing_steps'] = None
             
+            # Key plot tetap sama (acf_plot, ...) tapi berisi URL, bukan base64
+            record.update(plot_urls(id))
+            
             return jsonify(record)
         else:
             return jsonify({"error": "Training history not found"}), 404
@@ -662,6 +817,50 @@ def get_training_detail(id):
         return jsonify({"error": str(e)}), 500
 
 
+@api_bp.route("/model/<int:model_id>/plots/<plot_name>.png", methods=["GET"])
+def get_model_plot(model_id, plot_name):
+    """Sajikan plot training sebagai PNG (immutable per model, boleh di-cache lama)"""
+    if plot_name not in PLOT_NAMES:
+        return jsonify({"error": "Plot tidak dikenal"}), 404
+    
+    # Render saat pertama kali diminta, selanjutnya langsung dari disk
+    path = get_plot_file(model_id, plot_name)
+    if not path:
+        return jsonify({"error": "Plot tidak ditemukan"}), 404
+    
+    return send_file(os.path.abspath(path), mimetype='image/png', max_age=PLOT_CACHE_MAX_AGE, conditional=True)
+
+
+@api_bp.route("/model/backtest/<int:model_id>", methods=["GET"])
+def model_backtest(model_id):
+    """Backtest rolling-origin: error forecast 1..horizon tahun dari setiap origin"""
+    horizon = request.args.get("horizon", DEFAULT_HORIZON, type=int)
+    min_train = request.args.get("min_train", MIN_TRAIN_SIZE, type=int)
+    n_origins = request.args.get("origins", None, type=int)
+    refit_every = request.args.get("refit_every", 0, type=int)
+
+    if horizon < 1 or horizon > MAX_HORIZON:
+        return jsonify({"error": f"Horizon harus antara 1 - {MAX_HORIZON}"}), 400
+    if min_train < 5 or (n_origins is not None and n_origins < 1) or refit_every < 0:
+        return jsonify({"error": "Parameter backtest tidak valid"}), 400
+    if get_model_info(model_id) is None:
+        return jsonify({"error": "Model tidak ditemukan"}), 404
+
+    try:
+        result = backtest_model(
+            model_id,
+            horizon=horizon,
+            min_train=min_train,
+            n_origins=n_origins,
+            refit_every=refit_every
+        )
+        return jsonify({"status": "success", **result})
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
 @api_bp.route("/history/data-update", methods=["GET"])
 def history_data_update():
     """Get data update history dari database"""
@@ -702,39 +901,20 @@ def history_prediction():
 def get_latest_prediction():
     """Get latest prediction from database (auto-updated by dashboard)"""
     try:
-        from services.database_service import get_db_connection
         from services.data_mysql_service import get_energy_from_db
         import pandas as pd
         import json
         
-        connection = get_db_connection()
-        if not connection:
-            return jsonify({'predictions': [], 'years': 0, 'scenario': 'moderat'})
-        
-        cursor = connection.cursor(dictionary=True)
-        
-        # Get latest moderat prediction from database
-        cursor.execute("""
-                       SELECT p.*
-                       FROM prediction_history p
-                       JOIN training_history t
-                       ON p.model_id = t.id
-                       WHERE t.model_status = 'active'
-                       ORDER BY p.prediction_date DESC
-                       LIMIT 1;
-
-        """)
+        active_model = get_active_model()
         
-        record = cursor.fetchone()
-        cursor.close()
-        connection.close()
+        # Satu lookup primary key di latest_prediction (tanpa JOIN/sort prediction_history)
+        record = fetch_latest_prediction(active_model['id']) if active_model else None
         
         # If no record, try to generate prediction automatically
         if not record:
             print("No prediction record found, generating default prediction...")
             try:
                 # Get active model's forecast_years
-                active_model = get_active_model()
                 forecast_years = active_model.get('forecast_years', 3) if active_model else 3
                 
                 # Generate prediction
@@ -748,7 +928,8 @@ def get_latest_prediction():
                     scenario='moderat',
                     years=forecast_years,
                     prediction_data=prediction_values,
-                    model_version=model_version
+                    model_version=model_version,
+                    model_id=active_model['id'] if active_model else None
                 )
                 
                 # Get last year
@@ -814,6 +995,7 @@ def get_latest_prediction():
 
 
 @api_bp.route("/data/range", methods=["GET"])
+@cached_response
 def get_data_range():
     try:
         from services.database_service import get_db_connection
@@ -850,6 +1032,7 @@ def get_data_range():
 
 
 @api_bp.route("/history/summary", methods=["GET"])
+@cached_response
 def history_summary():
     """Get summary statistics untuk dashboard riwayat"""
     try:
@@ -932,6 +1115,7 @@ def get_candidate_models_list():
 
 
 @api_bp.route("/model/comparison", methods=["GET"])
+@cached_response
 def get_models_comparison():
     """Get all models (active + candidates) for comparison"""
     try:
@@ -1012,6 +1196,7 @@ def delete_model_endpoint(model_id):
 
 # ============= DASHBOARD API ENDPOINTS ===============
 @api_bp.route("/dashboard/model-info", methods=["GET"])
+@cached_response
 def dashboard_model_info():
     """Get active model info for dashboard"""
     try:
@@ -1049,11 +1234,12 @@ def dashboard_model_info():
         error_data = None
         
         try:
-            model_path = os.path.join('models', 'arimax_model.pkl')
-            if os.path.exists(model_path):
-                with open(model_path, 'rb') as f:
-                    model_info = pickle.load(f)
-                    
+            # Ambil dari model registry (cache per training_history.id),
+            # fallback ke file model aktif jika file per-ID tidak ada
+            model_info = get_model_info(active_model['id']) if active_model.get('id') else None
+            if model_info is None:
+                model_info = get_model_info(ACTIVE_MODEL)
+            if model_info is not None:
                 # Generate test data for comparison chart
                 if isinstance(model_info, dict) and 'y_test' in model_info and 'y_pred' in model_info:
                     y_test = model_info['y_test']
@@ -1301,13 +1487,14 @@ def dashboard_prediction():
             
             # Save only prediction values (not full object)
             prediction_values = [p['value'] for p in predictions]
+            # Hanya ditulis jika (model, skenario, horizon, data) berubah
             save_prediction_history(
                 scenario='moderat',
                 years=forecast_years,
                 prediction_data=prediction_values,
-                model_version=model_version
+                model_version=model_version,
+                model_id=active_model['id'] if active_model else None
             )
-            print(f"✓ Saved {forecast_years} years prediction to database")
         except Exception as save_error:
             print(f"Warning: Failed to save prediction history: {save_error}")
         
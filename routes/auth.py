@@ -2,20 +2,13 @@ from flask import Blueprint, request, jsonify, session, redirect, url_for, rende
 from werkzeug.security import generate_password_hash, check_password_hash
 import mysql.connector
 from functools import wraps
+from services.db_pool import get_connection
 
 auth_bp = Blueprint('auth', __name__)
 
-# Database configuration
-DB_CONFIG = {
-    'host': 'localhost',
-    'database': 'arimax_forecasting',
-    'user': 'root',
-    'password': ''
-}
-
 def get_db_connection():
-    """Get database connection"""
-    return mysql.connector.connect(**DB_CONFIG)
+    """Get database connection (dari pool bersama)"""
+    return get_connection()
 
 def login_required(f):
     """Decorator to require login for routes"""
@@ -0,0 +1,58 @@
+"""
+Jalankan eksperimen pemilihan model (services.experiment_runner) sekaligus
+
+Semua spec di EXPERIMENT_SPECS (atau yang disebut) dijalankan paralel di
+process pool, hasilnya satu tabel gabungan.
+
+Usage:
+    python run_experiments.py                       # semua eksperimen
+    python run_experiments.py comprehensive_model_selection rolling_forecast
+    python run_experiments.py --list
+    python run_experiments.py --workers 4 --output models/experiment_results.parquet
+"""
+
+import argparse
+
+from services.experiment_runner import (
+    EXPERIMENT_SPECS,
+    DEFAULT_RESULTS_PATH,
+    run_experiments,
+    write_results
+)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('experiments', nargs='*', help="Nama eksperimen (default semua)")
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses (default jumlah CPU)")
+    parser.add_argument('--output', default=DEFAULT_RESULTS_PATH, help="File hasil (.csv atau .parquet)")
+    parser.add_argument('--list', action='store_true', help="Tampilkan daftar eksperimen")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, spec in EXPERIMENT_SPECS.items():
+            print(f"{name:<32} {spec.get('description', '')}")
+        return
+
+    names = args.experiments or list(EXPERIMENT_SPECS)
+    print("=" * 80)
+    print(f"EKSPERIMEN PEMILIHAN MODEL: {', '.join(names)}")
+    print("=" * 80)
+
+    results = run_experiments(names, max_workers=args.workers)
+    path = write_results(results, args.output)
+
+    summary = results[results['Origin_Year'].isna()]
+    success = summary[summary['Status'] == 'Success']
+    print(f"\n{'eksperimen':<32} {'task':>5} {'gagal':>6} {'terbaik (MAPE)':>30}")
+    for name in names:
+        rows = summary[summary['Experiment'] == name]
+        ok = success[success['Experiment'] == name]
+        best = ok.sort_values('MAPE').iloc[0] if not ok.empty else None
+        best_label = f"{best['Model']}{best['Order']} {best['Split']} {best['MAPE']:.2f}%" if best is not None else "-"
+        print(f"{name:<32} {len(rows):>5} {len(rows) - len(ok):>6} {best_label:>30}")
+    print(f"\n✓ Saved: {path} ({len(results)} baris)")
+
+
+if __name__ == "__main__":
+    main()
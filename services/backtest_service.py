@@ -0,0 +1,221 @@
+"""
+Backtest rolling-origin untuk model ARIMAX
+
+models/rolling_forecast_validation.py melakukan fit SARIMAX penuh untuk
+setiap tahun origin. Di sini model hanya di-fit sekali pada origin pertama
+(start_params default statsmodels, hanya dari data training, sehingga tidak
+ada informasi tahun uji yang bocor), lalu berjalan maju dengan
+SARIMAXResults.extend(): parameter tetap, hanya Kalman filter yang
+di-update untuk observasi baru (biayanya sebanding jumlah observasi baru,
+bukan panjang data). Opsional, setiap refit_every origin parameter
+di-optimasi ulang beberapa iterasi (warm start dari parameter terakhir),
+atau di-fit penuh dari awal jika warm_start=False.
+
+Dari setiap origin dihitung forecast 1..horizon langkah ke depan (memakai
+GDP aktual, seperti validasi rolling lama) beserta error-nya. Hasil di-cache
+per (model, versi file model, versi data, parameter backtest).
+"""
+import os
+import threading
+import time
+import warnings
+from collections import OrderedDict
+import numpy as np
+
+from services import model_registry
+from services import data_store
+from services.fit_cache import fit_sarimax
+
+DEFAULT_HORIZON = 3
+MAX_HORIZON = 10
+# Minimal tahun training sebelum origin pertama (sama dengan validasi rolling lama)
+MIN_TRAIN_SIZE = 30
+# Iterasi optimizer untuk refit parsial (hanya dipakai jika refit_every > 0)
+DEFAULT_REFIT_ITERATIONS = 10
+
+# Jumlah hasil backtest yang disimpan di cache (LRU)
+BACKTEST_CACHE_SIZE = 32
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _fit(y, exog, order, start_params=None, maxiter=None):
+    """Fit SARIMAX lewat fit_cache (origin & refit yang sama tidak di-fit ulang)"""
+    fit_kwargs = {}
+    # Parameter: koefisien exog + AR + MA + sigma2
+    if start_params is not None and len(start_params) == exog.shape[1] + order[0] + order[2] + 1:
+        fit_kwargs['start_params'] = np.asarray(start_params, dtype=float)
+    if maxiter is not None:
+        fit_kwargs['maxiter'] = maxiter
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return fit_sarimax(y, exog, order, fit_kwargs=fit_kwargs)
+
+
+def _error_summary(actual, predicted):
+    actual = np.asarray(actual, dtype=float)
+    error = actual - np.asarray(predicted, dtype=float)
+    return {
+        'n': int(len(actual)),
+        'mae': round(float(np.mean(np.abs(error))), 4),
+        'rmse': round(float(np.sqrt(np.mean(error ** 2))), 4),
+        'mape': round(float(np.mean(np.abs(error / actual)) * 100), 4)
+    }
+
+
+def rolling_backtest(y, exog, order, years=None, horizon=DEFAULT_HORIZON, min_train=MIN_TRAIN_SIZE,
+                     n_origins=None, refit_every=0, refit_iterations=DEFAULT_REFIT_ITERATIONS,
+                     start_params=None, warm_start=True, maxiter=None):
+    """
+    Backtest rolling-origin: fit sekali, lalu extend state per origin
+
+    Args:
+        y: Deret energi (urut per tahun)
+        exog: Deret GDP (1 kolom, sejajar dengan y)
+        order: tuple (p, d, q)
+        years: Label tahun untuk tiap observasi (default 0..n-1)
+        horizon: Forecast 1..horizon langkah dari tiap origin
+        min_train: Jumlah observasi training minimal di origin pertama
+        n_origins: Batasi ke n origin terakhir (None = semua)
+        refit_every: Re-optimasi parameter tiap k origin (0 = parameter tetap)
+        refit_iterations: Iterasi optimizer untuk re-optimasi (warm start)
+        start_params: Parameter awal untuk fit di origin pertama. Jangan isi
+            dengan parameter yang diestimasi dari data uji (look-ahead)
+        warm_start: Re-optimasi mulai dari parameter terakhir (False = fit penuh
+            dari awal, sama dengan validasi rolling lama jika refit_every=1)
+        maxiter: Iterasi optimizer untuk fit di origin pertama (None = default statsmodels)
+
+    Returns:
+        dict: origins (forecast & error per origin), per_horizon (MAE/RMSE/MAPE
+        per langkah), jumlah fit penuh/parsial & extend, durasi
+    """
+    start = time.perf_counter()
+    y = np.asarray(y, dtype=float)
+    exog = np.asarray(exog, dtype=float).reshape(len(y), -1)
+    years = np.arange(len(y)) if years is None else np.asarray(years)
+    order = tuple(int(x) for x in order)
+
+    first_origin = max(int(min_train), 1)
+    if n_origins:
+        first_origin = max(first_origin, len(y) - int(n_origins))
+    if first_origin >= len(y):
+        raise ValueError(f"Data tidak cukup untuk backtest ({len(y)} tahun, minimal training {min_train} tahun)")
+
+    results = _fit(y[:first_origin], exog[:first_origin], order, start_params=start_params, maxiter=maxiter)
+    n_full_fits = 1
+    n_extends = 0
+    n_refits = 0
+    filtered = first_origin
+
+    origins = []
+    actual_by_step = [[] for _ in range(horizon)]
+    predicted_by_step = [[] for _ in range(horizon)]
+
+    for i, origin in enumerate(range(first_origin, len(y))):
+        if origin > filtered:
+            if refit_every and i % refit_every == 0 and warm_start:
+                results = _fit(y[:origin], exog[:origin], order, maxiter=refit_iterations,
+                               start_params=np.asarray(results.params))
+                n_refits += 1
+            elif refit_every and i % refit_every == 0:
+                results = _fit(y[:origin], exog[:origin], order, maxiter=maxiter)
+                n_full_fits += 1
+            else:
+                # Hanya filter observasi baru, mulai dari state terakhir
+                results = results.extend(y[filtered:origin], exog=exog[filtered:origin])
+                n_extends += 1
+            filtered = origin
+
+        steps = min(horizon, len(y) - origin)
+        forecast = np.asarray(results.forecast(steps=steps, exog=exog[origin:origin + steps]), dtype=float)
+        actual = y[origin:origin + steps]
+        ape = np.abs((actual - forecast) / actual) * 100
+
+        for step in range(steps):
+            actual_by_step[step].append(actual[step])
+            predicted_by_step[step].append(forecast[step])
+
+        origins.append({
+            'origin_year': int(years[origin]),
+            'train_size': int(origin),
+            'forecast_years': [int(year) for year in years[origin:origin + steps]],
+            'actual': np.round(actual, 4).tolist(),
+            'predicted': np.round(forecast, 4).tolist(),
+            'ape': np.round(ape, 4).tolist(),
+            # Hasil extend() tidak punya mle_retvals (tanpa optimizer)
+            'converged': bool((getattr(results, 'mle_retvals', None) or {}).get('converged', True))
+        })
+
+    return {
+        'order': list(order),
+        'horizon': int(horizon),
+        'n_origins': len(origins),
+        'first_origin_year': int(years[first_origin]),
+        'refit_every': int(refit_every),
+        'origins': origins,
+        'per_horizon': [
+            {'step': step + 1, **_error_summary(actual_by_step[step], predicted_by_step[step])}
+            for step in range(horizon) if actual_by_step[step]
+        ],
+        'n_full_fits': n_full_fits,
+        'n_partial_refits': n_refits,
+        'n_extends': n_extends,
+        'duration_ms': round((time.perf_counter() - start) * 1000, 1)
+    }
+
+
+def backtest_model(model_id=model_registry.ACTIVE_MODEL, horizon=DEFAULT_HORIZON, min_train=MIN_TRAIN_SIZE,
+                   n_origins=None, refit_every=0, refit_iterations=DEFAULT_REFIT_ITERATIONS):
+    """
+    Backtest rolling-origin untuk model tersimpan (order dari model, data dari
+    data store). Parameter model tersimpan tidak dipakai sebagai start_params
+    karena diestimasi dari seluruh data, termasuk tahun uji. Hasil di-cache
+    per model & versi data.
+
+    Raises:
+        ValueError: Model / data tidak ditemukan atau tidak cukup
+    """
+    model_path = model_registry.get_model_path(model_id)
+    model_version = os.path.getmtime(model_path) if os.path.exists(model_path) else None
+    store_info = data_store.get_store_info()
+    data_version = store_info['version'] if store_info else None
+    key = (
+        str(model_id), model_version, data_version, int(horizon), int(min_train),
+        int(n_origins or 0), int(refit_every), int(refit_iterations)
+    )
+
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    model_info = model_registry.get_model_info(model_id)
+    if model_info is None:
+        raise ValueError("Model tidak ditemukan")
+    df = data_store.get_aligned_data()
+    if df is None or df.empty:
+        raise ValueError("Data energi & GDP belum tersedia")
+
+    model = model_info['model']
+    result = rolling_backtest(
+        df['energy'].to_numpy(),
+        df[['gdp']].to_numpy(),
+        model.model.order,
+        years=df['year'].to_numpy(),
+        horizon=horizon,
+        min_train=min_train,
+        n_origins=n_origins,
+        refit_every=refit_every,
+        refit_iterations=refit_iterations
+    )
+    result['model_id'] = str(model_id)
+    result['data_version'] = data_version
+
+    with _cache_lock:
+        _cache[key] = result
+        _cache.move_to_end(key)
+        while len(_cache) > BACKTEST_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    return result
@@ -0,0 +1,164 @@
+"""
+ACF & PACF bersama untuk training, plot dan identifikasi order
+
+Sebelumnya ACF/PACF dihitung berulang dan terpisah: plot_acf/plot_pacf di
+generate_preprocessing_plots, ACF residual di generate_residual_plots, dan
+acf/pacf + plot_acf/plot_pacf lagi di script identifikasi manual. Di sini:
+
+- ACF lewat FFT (autokovarians bias, sama dengan acf(fft=False) statsmodels)
+- PACF lewat rekursi Durbin-Levinson dari ACF tersebut (= pacf method='ywm')
+- Confidence band Bartlett (ACF) dan 1/sqrt(n) (PACF) seperti plot_acf /
+  plot_pacf, plus batas white noise z/sqrt(n) untuk identifikasi manual
+
+Hasil di-cache per (isi series, level differencing, nlags, alpha) lalu
+dipakai oleh identify_order (lag signifikan -> p, q) maupun plot_correlation.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from scipy import stats
+
+DEFAULT_NLAGS = 20
+DEFAULT_ALPHA = 0.05
+# Lag yang dilihat untuk identifikasi p & q (lag 1..10, seperti script manual)
+IDENTIFY_MAX_LAG = 10
+
+# Jumlah hasil yang disimpan di cache (LRU)
+CORRELATION_CACHE_SIZE = 64
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def acf_fft(values, nlags):
+    """ACF (autokovarians bias / n) lewat FFT, lag 0..nlags"""
+    x = np.asarray(values, dtype=float)
+    x = x - x.mean()
+    n = len(x)
+    # Zero-padding >= 2n supaya korelasi sirkular = korelasi linear
+    size = 1 << int(np.ceil(np.log2(2 * n - 1)))
+    spectrum = np.fft.rfft(x, n=size)
+    acov = np.fft.irfft(spectrum * np.conj(spectrum), n=size)[:nlags + 1]
+    return acov / acov[0]
+
+
+def pacf_durbin_levinson(acf_values, nlags):
+    """PACF lag 0..nlags dari ACF dengan rekursi Durbin-Levinson"""
+    pacf_values = np.zeros(nlags + 1)
+    pacf_values[0] = 1.0
+    phi = np.zeros(nlags + 1)
+    variance = 1.0
+    for k in range(1, nlags + 1):
+        reflection = (acf_values[k] - np.dot(phi[1:k], acf_values[k - 1:0:-1])) / variance
+        phi[1:k] = phi[1:k] - reflection * phi[k - 1:0:-1]
+        phi[k] = reflection
+        variance *= 1 - reflection ** 2
+        pacf_values[k] = reflection
+    return pacf_values
+
+
+def correlations(values, nlags=DEFAULT_NLAGS, d=0, alpha=DEFAULT_ALPHA):
+    """
+    ACF & PACF (dengan confidence band) untuk series setelah differencing d kali
+
+    Args:
+        values: Deret waktu (array / Series)
+        nlags: Lag maksimum (dibatasi n // 2 - 1 untuk PACF, seperti statsmodels)
+        d: Level differencing sebelum korelasi dihitung
+        alpha: Tingkat signifikansi confidence band
+
+    Returns:
+        dict: nobs, nlags, lags, acf, pacf, acf_confint, pacf_confint (lebar
+        band di sekitar 0, per lag), white_noise_band (z / sqrt(n))
+    """
+    values = np.asarray(values, dtype=float)
+    digest = hashlib.sha1(repr((int(nlags), int(d), float(alpha), values.shape)).encode('utf-8'))
+    digest.update(np.ascontiguousarray(values).tobytes())
+    key = digest.hexdigest()
+
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    series = np.diff(values, n=d) if d else values
+    nobs = len(series)
+    nlags = max(0, min(int(nlags), nobs // 2 - 1))
+    z = stats.norm.ppf(1 - alpha / 2)
+
+    acf_values = acf_fft(series, nlags)
+    pacf_values = pacf_durbin_levinson(acf_values, nlags)
+
+    # Bartlett: var(r_k) = (1 + 2 * sum_{j<k} r_j^2) / n
+    acf_var = np.ones(nlags + 1) / nobs
+    acf_var[0] = 0
+    acf_var[2:] *= 1 + 2 * np.cumsum(acf_values[1:-1] ** 2)
+    pacf_var = np.ones(nlags + 1) / nobs
+    pacf_var[0] = 0
+
+    result = {
+        'nobs': int(nobs),
+        'd': int(d),
+        'nlags': int(nlags),
+        'alpha': float(alpha),
+        'lags': np.arange(nlags + 1),
+        'acf': acf_values,
+        'pacf': pacf_values,
+        'acf_confint': z * np.sqrt(acf_var),
+        'pacf_confint': z * np.sqrt(pacf_var),
+        'white_noise_band': float(z / np.sqrt(nobs))
+    }
+    with _cache_lock:
+        _cache[key] = result
+        _cache.move_to_end(key)
+        while len(_cache) > CORRELATION_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def significant_lags(result, kind='acf', max_lag=IDENTIFY_MAX_LAG):
+    """Lag 1..max_lag dengan |korelasi| > batas white noise"""
+    values = result[kind]
+    band = result['white_noise_band']
+    return [lag for lag in range(1, min(max_lag, result['nlags']) + 1) if abs(values[lag]) > band]
+
+
+def identify_order(result, max_lag=IDENTIFY_MAX_LAG):
+    """
+    Identifikasi p (PACF) dan q (ACF): lag signifikan terakhir, 0 jika tidak ada
+
+    Returns:
+        dict: p, q, p_candidates, q_candidates
+    """
+    p_candidates = significant_lags(result, 'pacf', max_lag)
+    q_candidates = significant_lags(result, 'acf', max_lag)
+    return {
+        'p': max(p_candidates) if p_candidates else 0,
+        'q': max(q_candidates) if q_candidates else 0,
+        'p_candidates': p_candidates,
+        'q_candidates': q_candidates
+    }
+
+
+def plot_correlation(ax, result, kind='acf', title=None):
+    """
+    Gambar ACF / PACF dari hasil correlations() (tampilan seperti plot_acf /
+    plot_pacf statsmodels, tanpa menghitung ulang)
+    """
+    lags = result['lags']
+    values = result[kind]
+    confint = result[f'{kind}_confint']
+    ax.vlines(lags, 0, values)
+    ax.plot(lags, values, marker='o', markersize=5, linestyle='None')
+    ax.axhline(0, color='black', linewidth=0.8)
+    # Band di sekitar 0 (lag 0 tanpa band), seperti statsmodels
+    ax.fill_between(lags[1:], -confint[1:], confint[1:], alpha=0.25, linewidth=0)
+    ax.set_xlim(-1, lags[-1] + 1)
+    ax.set_title(title or ('Autocorrelation' if kind == 'acf' else 'Partial Autocorrelation'))
+    return ax
@@ -5,8 +5,10 @@ Hybrid system: CSV untuk training, MySQL untuk history & display
 import mysql.connector
 from mysql.connector import Error
 from datetime import datetime
+import numpy as np
 import pandas as pd
 from services.database_service import get_db_connection
+from services.response_cache import bump_data_version
 
 def init_data_tables():
     """
@@ -53,27 +55,85 @@ def init_data_tables():
         print(f"✗ Error initializing data tables: {e}")
         return False
 
+# Jumlah baris per statement multi-row INSERT
+UPSERT_BATCH_SIZE = 1000
+
+UPSERT_QUERIES = {
+    'energy_data': """
+        INSERT INTO energy_data (year, fossil_fuels_twh)
+        VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE 
+            fossil_fuels_twh = VALUES(fossil_fuels_twh),
+            updated_at = CURRENT_TIMESTAMP
+    """,
+    'gdp_data': """
+        INSERT INTO gdp_data (year, gdp)
+        VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE 
+            gdp = VALUES(gdp),
+            updated_at = CURRENT_TIMESTAMP
+    """
+}
+
+def dataframe_to_rows(df, year_col, value_col):
+    """
+    Ubah DataFrame menjadi list (year, value) sekaligus lewat NumPy,
+    baris dengan value kosong dibuang
+    """
+    years = pd.to_numeric(df[year_col], errors='coerce').to_numpy(dtype=float)
+    values = pd.to_numeric(df[value_col], errors='coerce').to_numpy(dtype=float)
+    mask = ~(np.isnan(years) | np.isnan(values))
+    return list(zip(years[mask].astype(int).tolist(), values[mask].tolist()))
+
+def bulk_upsert(connection, table, rows, clear_existing=True, query=None, batch_size=UPSERT_BATCH_SIZE):
+    """
+    Upsert banyak baris dalam satu transaksi: DELETE (opsional) dan semua
+    INSERT di-commit bersamaan, jadi pembaca tidak pernah melihat tabel kosong.
+    Setiap batch dikirim sebagai satu multi-row INSERT (executemany).
+    
+    Args:
+        connection: Koneksi MySQL
+        table: Nama tabel ('energy_data' atau 'gdp_data')
+        rows: List tuple (year, value)
+        clear_existing: Hapus semua data lama sebelum insert
+        query: Query INSERT (default: UPSERT_QUERIES[table])
+        batch_size: Jumlah baris per statement
+    
+    Returns:
+        Jumlah baris yang disimpan
+    """
+    query = query or UPSERT_QUERIES[table]
+    cursor = connection.cursor()
+    try:
+        if connection.in_transaction:
+            connection.commit()
+        connection.start_transaction()
+        
+        if clear_existing:
+            cursor.execute(f"DELETE FROM {table}")
+        
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(query, rows[start:start + batch_size])
+        
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+    
+    return len(rows)
+
 def save_energy_to_db(df, clear_existing=True):
     """
     Save energy dataframe to MySQL
-    Uses INSERT ... ON DUPLICATE KEY UPDATE for upsert
+    Uses INSERT ... ON DUPLICATE KEY UPDATE for upsert (bulk, satu transaksi)
     
     Args:
         df: DataFrame containing energy data
         clear_existing: If True, delete all existing records before inserting (default: True)
     """
     try:
-        connection = get_db_connection()
-        if not connection:
-            return 0
-        
-        cursor = connection.cursor()
-        
-        # Clear existing data if requested
-        if clear_existing:
-            cursor.execute("DELETE FROM energy_data")
-            print("🗑️  Cleared existing energy data")
-        
         # Identify year and value columns
         year_col = "Year" if "Year" in df.columns else "year"
         
@@ -88,26 +148,18 @@ def save_energy_to_db(df, clear_existing=True):
             print(f"⚠ No energy value column found in: {df.columns.tolist()}")
             return 0
         
-        records_saved = 0
-        
-        for _, row in df.iterrows():
-            year = int(row[year_col])
-            value = float(row[value_col]) if pd.notna(row[value_col]) else None
-            
-            if value is not None:
-                query = """
-                    INSERT INTO energy_data (year, fossil_fuels_twh)
-                    VALUES (%s, %s)
-                    ON DUPLICATE KEY UPDATE 
-                        fossil_fuels_twh = VALUES(fossil_fuels_twh),
-                        updated_at = CURRENT_TIMESTAMP
-                """
-                cursor.execute(query, (year, value))
-                records_saved += 1
+        rows = dataframe_to_rows(df, year_col, value_col)
         
-        connection.commit()
-        cursor.close()
+        connection = get_db_connection()
+        if not connection:
+            return 0
+        
+        records_saved = bulk_upsert(connection, 'energy_data', rows, clear_existing)
         connection.close()
+        bump_data_version()
+        
+        if clear_existing:
+            print("🗑️  Replaced existing energy data")
         
         return records_saved
         
@@ -117,48 +169,29 @@ def save_energy_to_db(df, clear_existing=True):
 
 def save_gdp_to_db(df, clear_existing=True):
     """
-    Save GDP dataframe to MySQL
+    Save GDP dataframe to MySQL (bulk upsert, satu transaksi)
     
     Args:
         df: DataFrame containing GDP data
         clear_existing: If True, delete all existing records before inserting (default: True)
     """
     try:
-        connection = get_db_connection()
-        if not connection:
-            return 0
-        
-        cursor = connection.cursor()
-        
-        # Clear existing data if requested
-        if clear_existing:
-            cursor.execute("DELETE FROM gdp_data")
-            print("🗑️  Cleared existing GDP data")
-        
         # Identify columns
         year_col = "year" if "year" in df.columns else "Year"
         gdp_col = "gdp" if "gdp" in df.columns else "GDP"
         
-        records_saved = 0
-        
-        for _, row in df.iterrows():
-            year = int(row[year_col])
-            gdp = float(row[gdp_col]) if pd.notna(row[gdp_col]) else None
-            
-            if gdp is not None:
-                query = """
-                    INSERT INTO gdp_data (year, gdp)
-                    VALUES (%s, %s)
-                    ON DUPLICATE KEY UPDATE 
-                        gdp = VALUES(gdp),
-                        updated_at = CURRENT_TIMESTAMP
-                """
-                cursor.execute(query, (year, gdp))
-                records_saved += 1
+        rows = dataframe_to_rows(df, year_col, gdp_col)
         
-        connection.commit()
-        cursor.close()
+        connection = get_db_connection()
+        if not connection:
+            return 0
+        
+        records_saved = bulk_upsert(connection, 'gdp_data', rows, clear_existing)
         connection.close()
+        bump_data_version()
+        
+        if clear_existing:
+            print("🗑️  Replaced existing GDP data")
         
         return records_saved
         
@@ -0,0 +1,258 @@
+"""
+Dataset lokal energi + GDP dalam format kolumnar (numpy .npy, memory-mapped)
+
+data/raw/energy.csv & gdp.csv tetap ditulis (untuk training ulang manual &
+unduhan), tetapi setiap kali fetch/upload selesai keduanya dinormalisasi
+sekali menjadi data/store/dataset.npy: satu structured array per tahun
+dengan kolom kanonik year, energy, gdp (+ penanda tahun ada di sumber
+mana), outer join per tahun. Metadata (versi, jumlah record, waktu update)
+disimpan di dataset.json.
+
+Semua pembaca (training, validator, statistik, preview) memakai
+get_dataset() / get_aligned_data() yang di-cache per versi, jadi parsing
+CSV dan tebak-tebakan nama kolom hanya terjadi di refresh_store().
+Jika CSV mentah berubah di luar aplikasi (mtime beda), store dibangun ulang
+otomatis saat diakses.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+RAW_ENERGY_PATH = os.path.join("data", "raw", "energy.csv")
+RAW_GDP_PATH = os.path.join("data", "raw", "gdp.csv")
+
+STORE_DIR = os.path.join("data", "store")
+STORE_DATA_FILE = "dataset.npy"
+STORE_META_FILE = "dataset.json"
+
+STORE_DTYPE = np.dtype([
+    ('year', 'i8'),
+    ('energy', 'f8'),
+    ('gdp', 'f8'),
+    ('has_energy', '?'),
+    ('has_gdp', '?')
+])
+
+ENERGY_YEAR_COLUMNS = ["Year", "year"]
+ENERGY_VALUE_COLUMNS = ["fossil_fuels__twh", "fossil_fuels", "value", "Energy", "energy"]
+GDP_YEAR_COLUMNS = ["year", "Year"]
+GDP_VALUE_COLUMNS = ["gdp", "GDP"]
+
+_cache = {'version': None, 'meta': None, 'meta_mtime': None, 'frame': None}
+_lock = threading.Lock()
+
+
+def _store_paths():
+    return os.path.join(STORE_DIR, STORE_DATA_FILE), os.path.join(STORE_DIR, STORE_META_FILE)
+
+
+def _raw_mtimes():
+    return {
+        'energy': os.path.getmtime(RAW_ENERGY_PATH) if os.path.exists(RAW_ENERGY_PATH) else None,
+        'gdp': os.path.getmtime(RAW_GDP_PATH) if os.path.exists(RAW_GDP_PATH) else None
+    }
+
+
+def _pick_column(df, candidates, label, source):
+    col = next((c for c in candidates if c in df.columns), None)
+    if col is None:
+        raise ValueError(f"Kolom {label} {source} tidak ditemukan. Kolom tersedia: {list(df.columns)}")
+    return col
+
+
+def normalize_source(df, year_candidates, value_candidates, source, value_label):
+    """
+    DataFrame mentah -> (year, value) unik per tahun, urut
+
+    Returns:
+        (DataFrame kolom year & value, jumlah record mentah)
+    """
+    year_col = _pick_column(df, year_candidates, "tahun", source)
+    value_col = _pick_column(df, value_candidates, value_label, source)
+    clean = df[[year_col, value_col]].copy()
+    clean.columns = ["year", "value"]
+    clean = clean.dropna(subset=["year"])
+    clean["year"] = clean["year"].astype('int64')
+    clean["value"] = pd.to_numeric(clean["value"], errors='coerce').astype('float64')
+    clean = clean.drop_duplicates(subset=["year"]).sort_values("year")
+    return clean, len(df)
+
+
+def build_dataset(energy_df=None, gdp_df=None):
+    """
+    Gabungkan (outer join per tahun) data energi & GDP menjadi structured array
+
+    Returns:
+        (array STORE_DTYPE, dict jumlah record mentah per sumber)
+    """
+    parts = {}
+    counts = {'energy_records': 0, 'gdp_records': 0}
+    if energy_df is not None:
+        parts['energy'], counts['energy_records'] = normalize_source(
+            energy_df, ENERGY_YEAR_COLUMNS, ENERGY_VALUE_COLUMNS, "energi", "nilai energi"
+        )
+    if gdp_df is not None:
+        parts['gdp'], counts['gdp_records'] = normalize_source(
+            gdp_df, GDP_YEAR_COLUMNS, GDP_VALUE_COLUMNS, "GDP", "GDP"
+        )
+
+    years = np.unique(np.concatenate([part["year"].to_numpy() for part in parts.values()] or [np.array([], dtype='i8')]))
+    data = np.zeros(len(years), dtype=STORE_DTYPE)
+    data['year'] = years
+    for name, part in (('energy', parts.get('energy')), ('gdp', parts.get('gdp'))):
+        data[name] = np.nan
+        if part is None:
+            continue
+        idx = np.searchsorted(years, part["year"].to_numpy())
+        data[name][idx] = part["value"].to_numpy()
+        data[f'has_{name}'][idx] = True
+    return data, counts
+
+
+def write_store(data, counts):
+    """Tulis array + metadata (atomic: data dulu, metadata/versi terakhir)"""
+    data_path, meta_path = _store_paths()
+    os.makedirs(STORE_DIR, exist_ok=True)
+
+    tmp_path = f"{data_path}.tmp.npy"
+    np.save(tmp_path, data, allow_pickle=False)
+    os.replace(tmp_path, data_path)
+
+    energy_years = data['year'][data['has_energy']]
+    gdp_years = data['year'][data['has_gdp']]
+    meta = {
+        'version': hashlib.sha1(data.tobytes()).hexdigest()[:16],
+        'updated_at': time.time(),
+        'raw_mtimes': _raw_mtimes(),
+        'energy_records': int(counts.get('energy_records', 0)),
+        'gdp_records': int(counts.get('gdp_records', 0)),
+        'energy_years': int(len(energy_years)),
+        'gdp_years': int(len(gdp_years)),
+        'matched_years': int(np.sum(data['has_energy'] & data['has_gdp']))
+    }
+    tmp_meta = f"{meta_path}.tmp"
+    with open(tmp_meta, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_meta, meta_path)
+    return meta
+
+
+def refresh_store():
+    """
+    Bangun ulang store dari data/raw/*.csv (dipanggil setelah fetch/upload)
+
+    Returns:
+        metadata store, atau None jika belum ada CSV
+    """
+    energy_df = pd.read_csv(RAW_ENERGY_PATH) if os.path.exists(RAW_ENERGY_PATH) else None
+    gdp_df = pd.read_csv(RAW_GDP_PATH) if os.path.exists(RAW_GDP_PATH) else None
+    if energy_df is None and gdp_df is None:
+        return None
+    data, counts = build_dataset(energy_df, gdp_df)
+    meta = write_store(data, counts)
+    print(f"✓ Data store updated (version {meta['version']}, {len(data)} years)")
+    return meta
+
+
+def update_store(energy_df=None, gdp_df=None):
+    """
+    Perbarui store dari DataFrame yang baru ditulis ke data/raw (fetch/upload),
+    tanpa membaca ulang CSV. Sumber yang tidak diberikan diambil dari store lama.
+
+    Returns:
+        metadata store baru
+    """
+    previous = get_store_info() if energy_df is None or gdp_df is None else None
+    counts = {}
+    if energy_df is None:
+        energy_df = get_energy_series()
+        counts['energy_records'] = previous['energy_records'] if previous else 0
+    if gdp_df is None:
+        gdp_df = get_gdp_series()
+        counts['gdp_records'] = previous['gdp_records'] if previous else 0
+
+    data, new_counts = build_dataset(energy_df, gdp_df)
+    new_counts.update(counts)
+    meta = write_store(data, new_counts)
+    print(f"✓ Data store updated (version {meta['version']}, {len(data)} years)")
+    return meta
+
+
+def _load_meta():
+    _, meta_path = _store_paths()
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _current():
+    """(meta, frame) versi terbaru; bangun ulang jika CSV mentah berubah"""
+    _, meta_path = _store_paths()
+    meta_mtime = os.path.getmtime(meta_path) if os.path.exists(meta_path) else None
+    with _lock:
+        meta = _cache['meta'] if meta_mtime is not None and _cache['meta_mtime'] == meta_mtime else None
+    if meta is None:
+        meta = _load_meta()
+    if meta is None or meta.get('raw_mtimes') != _raw_mtimes():
+        meta = refresh_store()
+        if meta is None:
+            return None, None
+        meta_mtime = os.path.getmtime(meta_path)
+
+    with _lock:
+        _cache['meta_mtime'] = meta_mtime
+        if _cache['version'] != meta['version']:
+            data_path, _ = _store_paths()
+            data = np.load(data_path, mmap_mode='r', allow_pickle=False)
+            _cache['frame'] = pd.DataFrame({name: np.asarray(data[name]) for name in STORE_DTYPE.names})
+            _cache['version'] = meta['version']
+            _cache['meta'] = meta
+        return _cache['meta'], _cache['frame']
+
+
+def get_store_info():
+    """Metadata store (version, updated_at, jumlah record & tahun), None jika kosong"""
+    meta, _ = _current()
+    return dict(meta) if meta else None
+
+
+def get_dataset():
+    """
+    Dataset lengkap (outer join): year, energy, gdp, has_energy, has_gdp.
+    None jika belum ada data. Salinan, aman diubah pemanggil.
+    """
+    _, frame = _current()
+    return frame.copy() if frame is not None else None
+
+
+def get_energy_series():
+    """year & energy untuk tahun yang ada di data energi"""
+    frame = get_dataset()
+    if frame is None or not frame['has_energy'].any():
+        return None
+    return frame.loc[frame['has_energy'], ['year', 'energy']].reset_index(drop=True)
+
+
+def get_gdp_series():
+    """year & gdp untuk tahun yang ada di data GDP"""
+    frame = get_dataset()
+    if frame is None or not frame['has_gdp'].any():
+        return None
+    return frame.loc[frame['has_gdp'], ['year', 'gdp']].reset_index(drop=True)
+
+
+def get_aligned_data():
+    """year, energy, gdp untuk tahun yang ada di kedua sumber (inner join)"""
+    frame = get_dataset()
+    if frame is None:
+        return None
+    aligned = frame['has_energy'] & frame['has_gdp']
+    return frame.loc[aligned, ['year', 'energy', 'gdp']].reset_index(drop=True)
@@ -1,5 +1,5 @@
-import pandas as pd
 import os
+from services import data_store
 
 
 def validate_data_compatibility():
@@ -11,51 +11,32 @@ def validate_data_compatibility():
     """
     try:
         # Check if files exist
-        energy_path = "data/raw/energy.csv"
-        gdp_path = "data/raw/gdp.csv"
-        
-        if not os.path.exists(energy_path):
+        if not os.path.exists(data_store.RAW_ENERGY_PATH):
             return {
                 "valid": False,
                 "message": "File energy.csv tidak ditemukan",
                 "suggestion": "Lakukan fetch data atau upload file terlebih dahulu"
             }
         
-        if not os.path.exists(gdp_path):
+        if not os.path.exists(data_store.RAW_GDP_PATH):
             return {
                 "valid": False,
                 "message": "File gdp.csv tidak ditemukan",
                 "suggestion": "Lakukan fetch data atau upload file terlebih dahulu"
             }
         
-        # Load data
-        energy_df = pd.read_csv(energy_path)
-        gdp_df = pd.read_csv(gdp_path)
-        
-        # Identify year columns
-        energy_year_col = None
-        for col in ["Year", "year"]:
-            if col in energy_df.columns:
-                energy_year_col = col
-                break
-        
-        gdp_year_col = None
-        for col in ["year", "Year"]:
-            if col in gdp_df.columns:
-                gdp_year_col = col
-                break
-        
-        if not energy_year_col or not gdp_year_col:
+        # Dataset ter-normalisasi (kolom year/energy/gdp) dari data store
+        try:
+            dataset = data_store.get_dataset()
+        except ValueError as column_error:
             return {
                 "valid": False,
-                "message": "Kolom tahun tidak ditemukan",
-                "energy_columns": list(energy_df.columns),
-                "gdp_columns": list(gdp_df.columns)
+                "message": str(column_error)
             }
         
         # Get years
-        energy_years = set(energy_df[energy_year_col].dropna().unique())
-        gdp_years = set(gdp_df[gdp_year_col].dropna().unique())
+        energy_years = set(int(y) for y in dataset.loc[dataset["has_energy"], "year"])
+        gdp_years = set(int(y) for y in dataset.loc[dataset["has_gdp"], "year"])
         
         # Find common years
         common_years = sorted(energy_years.intersection(gdp_years))
@@ -117,27 +98,25 @@ def get_data_alignment_report():
     Generate detailed report tentang alignment data
     """
     try:
-        energy_df = pd.read_csv("data/raw/energy.csv")
-        gdp_df = pd.read_csv("data/raw/gdp.csv")
-        
-        # Identify year columns
-        energy_year_col = "Year" if "Year" in energy_df.columns else "year"
-        gdp_year_col = "year" if "year" in gdp_df.columns else "Year"
+        dataset = data_store.get_dataset()
+        if dataset is None:
+            raise FileNotFoundError("File data tidak ditemukan")
+        info = data_store.get_store_info()
         
-        energy_years = sorted(energy_df[energy_year_col].dropna().unique())
-        gdp_years = sorted(gdp_df[gdp_year_col].dropna().unique())
+        energy_years = [int(y) for y in dataset.loc[dataset["has_energy"], "year"]]
+        gdp_years = [int(y) for y in dataset.loc[dataset["has_gdp"], "year"]]
         
         common_years = sorted(set(energy_years).intersection(set(gdp_years)))
         
         return {
             "energy": {
-                "total_records": len(energy_df),
+                "total_records": info["energy_records"],
                 "total_years": len(energy_years),
                 "year_range": f"{min(energy_years)}-{max(energy_years)}" if energy_years else "N/A",
                 "years": energy_years
             },
             "gdp": {
-                "total_records": len(gdp_df),
+                "total_records": info["gdp_records"],
                 "total_years": len(gdp_years),
                 "year_range": f"{min(gdp_years)}-{max(gdp_years)}" if gdp_years else "N/A",
                 "years": gdp_years
@@ -1,26 +1,68 @@
 import mysql.connector
 from mysql.connector import Error
 from datetime import datetime
+import hashlib
 import json
 import os
+import threading
+from services.db_pool import DB_CONFIG, get_connection
+from services.response_cache import bump_data_version
+from services.plot_store import PLOT_DIR, PLOT_NAMES, save_plots, save_plot, save_plot_data, decode_plot, delete_plots, prerender_plots_async
 
-# Database configuration
-DB_CONFIG = {
-    'host': 'localhost',
-    'database': 'arimax_forecasting',
-    'user': 'root',
-    'password': ''  # Default XAMPP password kosong
+# dedup_key prediksi terakhir per model yang sudah tersimpan (hemat query
+# saat dashboard di-refresh berulang kali)
+_latest_prediction_keys = {}
+_latest_prediction_lock = threading.Lock()
+
+# Kolom staging model di training_history (ditambahkan ke tabel lama)
+TRAINING_STAGING_COLUMNS = {
+    'model_status': "VARCHAR(20) DEFAULT 'candidate'",
+    'activated_at': "DATETIME NULL",
+    'activated_by': "VARCHAR(50) NULL",
+    'forecast_years': "INT DEFAULT 3",
+    'preprocessing_steps': "LONGTEXT NULL",
+    'training_duration': "DECIMAL(10, 3) NULL"
+}
+
+# Index untuk query staging, riwayat & ringkasan: {tabel: [(nama, kolom)]}
+HISTORY_INDEXES = {
+    'training_history': [
+        ('idx_training_status_activated', 'model_status, activated_at'),
+        ('idx_training_status_date', 'model_status, training_date'),
+        ('idx_training_date', 'training_date')
+    ],
+    'data_update_history': [
+        ('idx_update_date', 'update_date')
+    ],
+    'prediction_history': [
+        ('idx_prediction_date', 'prediction_date')
+    ]
 }
 
+# Tabel yang jumlah barisnya dicatat di history_counters
+COUNTED_TABLES = ('training_history', 'data_update_history', 'prediction_history')
+
+# Kolom skalar training_history untuk query list/detail
+# (tanpa kolom plot base64 lama dan preprocessing_steps yang besar)
+TRAINING_SUMMARY_COLUMNS = """
+    id, training_date, model_version, p, d, q,
+    mape, rmse, mae, r2,
+    train_size, test_size, train_percentage, test_percentage,
+    total_data, year_range,
+    energy_min, energy_max, energy_mean,
+    gdp_min, gdp_max, gdp_mean,
+    status, notes, created_at,
+    model_status, activated_at, activated_by,
+    forecast_years, training_duration
+"""
+
 def get_db_connection():
     """
-    Create database connection
+    Pinjam connection dari pool (connection.close() mengembalikannya ke pool)
     Returns connection object or None if failed
     """
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
-        if connection.is_connected():
-            return connection
+        return get_connection()
     except Error as e:
         print(f"Error connecting to MySQL: {e}")
         return None
@@ -91,22 +133,80 @@ def init_database():
                 years INT NOT NULL,
                 prediction_data JSON,
                 model_version VARCHAR(50),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                model_id INT NULL,
+                dedup_key CHAR(40) NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE KEY uq_prediction_dedup (dedup_key),
+                INDEX idx_prediction_model_date (model_id, prediction_date)
             )
         """)
         
+        connection.commit()
+        migrate_prediction_history(cursor)
+        
+        migrate_history_indexes(cursor)
+        
+        # Counter ringkasan riwayat, di-update di transaksi yang sama dengan INSERT/DELETE
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS history_counters (
+                name VARCHAR(50) PRIMARY KEY,
+                value BIGINT NOT NULL DEFAULT 0
+            )
+        """)
+        for table in COUNTED_TABLES:
+            cursor.execute(
+                f"INSERT IGNORE INTO history_counters (name, value) SELECT %s, COUNT(*) FROM {table}",
+                (table,)
+            )
+        
+        # Prediksi terakhir per model (dibaca /api/prediction/latest lewat primary key)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS latest_prediction (
+                model_id INT PRIMARY KEY,
+                prediction_id INT NULL,
+                scenario VARCHAR(50) NOT NULL,
+                years INT NOT NULL,
+                prediction_data JSON,
+                model_version VARCHAR(50),
+                dedup_key CHAR(40),
+                prediction_date DATETIME NOT NULL,
+                CONSTRAINT fk_latest_prediction_model FOREIGN KEY (model_id)
+                    REFERENCES training_history(id) ON DELETE CASCADE
+            )
+        """)
+        
+        # Isi awal dari prediksi terbaru per model yang sudah ada
+        cursor.execute("""
+            INSERT IGNORE INTO latest_prediction (
+                model_id, prediction_id, scenario, years,
+                prediction_data, model_version, dedup_key, prediction_date
+            )
+            SELECT p.model_id, p.id, p.scenario, p.years,
+                   p.prediction_data, p.model_version, p.dedup_key, p.prediction_date
+            FROM prediction_history p
+            JOIN (
+                SELECT model_id, MAX(id) AS id
+                FROM prediction_history
+                WHERE model_id IS NOT NULL
+                GROUP BY model_id
+            ) last_prediction ON last_prediction.id = p.id
+            JOIN training_history t ON t.id = p.model_id
+        """)
+        
         connection.commit()
         cursor.close()
         connection.close()
         
         print("Database tables initialized successfully!")
+        
+        migrate_plots_to_files()
         return True
         
     except Error as e:
         print(f"Error initializing database: {e}")
         return False
 
-def save_training_history(metrics, year_range, energy_stats, gdp_stats, forecast_years=3, viz_plots=None, preprocessing_steps=None, training_duration=None):
+def save_training_history(metrics, year_range, energy_stats, gdp_stats, forecast_years=3, viz_plots=None, preprocessing_steps=None, training_duration=None, plot_data=None):
     """
     Save training result to database as CANDIDATE
     
@@ -116,9 +216,10 @@ def save_training_history(metrics, year_range, energy_stats, gdp_stats, forecast
         energy_stats: Dictionary with energy statistics
         gdp_stats: Dictionary with GDP statistics
         forecast_years: Number of years to forecast (default: 3)
-        viz_plots: Dictionary with visualization plots as base64 strings
+        viz_plots: Dictionary with visualization plots as base64 strings (disimpan sebagai file PNG)
         preprocessing_steps: List of preprocessing step dictionaries
         training_duration: Training duration in seconds (optional)
+        plot_data: Array sumber plot (di-render lazy saat pertama kali diminta)
         
     Returns:
         model_id: ID of the saved model (for file naming)
@@ -135,119 +236,69 @@ def save_training_history(metrics, year_range, energy_stats, gdp_stats, forecast
         if preprocessing_steps:
             preprocessing_steps_json = json.dumps(preprocessing_steps, ensure_ascii=False)
         
-        # Build query dynamically based on whether viz_plots is provided
-        if viz_plots:
-            query = """
-                INSERT INTO training_history (
-                    training_date, p, d, q, mape, rmse, mae, r2,
-                    train_size, test_size, train_percentage, test_percentage,
-                    total_data, year_range,
-                    energy_min, energy_max, energy_mean,
-                    gdp_min, gdp_max, gdp_mean, status, model_status, forecast_years,
-                    acf_plot, pacf_plot, preprocessing_plot, train_test_plot,
-                    residual_plot, residual_acf_plot, qq_plot,
-                    preprocessing_steps, training_duration
-                ) VALUES (
-                    %s, %s, %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s,
-                    %s, %s,
-                    %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s,
-                    %s, %s, %s,
-                    %s, %s
-                )
-            """
-            
-            values = (
-                datetime.now(),
-                metrics.get('p', 0),
-                metrics.get('d', 0),
-                metrics.get('q', 0),
-                metrics.get('mape', 0),
-                metrics.get('rmse', 0),
-                metrics.get('mae', 0),
-                metrics.get('r2', 0),
-                metrics.get('train_size', 0),
-                metrics.get('test_size', 0),
-                metrics.get('train_percentage', 0),
-                metrics.get('test_percentage', 0),
-                metrics.get('total_data', 0),
-                year_range,
-                energy_stats.get('min', 0),
-                energy_stats.get('max', 0),
-                energy_stats.get('mean', 0),
-                gdp_stats.get('min', 0),
-                gdp_stats.get('max', 0),
-                gdp_stats.get('mean', 0),
-                'success',
-                'candidate',
-                forecast_years,
-                viz_plots.get('acf_plot'),
-                viz_plots.get('pacf_plot'),
-                viz_plots.get('preprocessing_plot'),
-                viz_plots.get('train_test_plot'),
-                viz_plots.get('residual_plot'),
-                viz_plots.get('residual_acf_plot'),
-                viz_plots.get('qq_plot'),
-                preprocessing_steps_json,
-                training_duration
-            )
-        else:
-            query = """
-                INSERT INTO training_history (
-                    training_date, p, d, q, mape, rmse, mae, r2,
-                    train_size, test_size, train_percentage, test_percentage,
-                    total_data, year_range,
-                    energy_min, energy_max, energy_mean,
-                    gdp_min, gdp_max, gdp_mean, status, model_status, forecast_years,
-                    preprocessing_steps, training_duration
-                ) VALUES (
-                    %s, %s, %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s,
-                    %s, %s,
-                    %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s
-                )
-            """
-            
-            values = (
-                datetime.now(),
-                metrics.get('p', 0),
-                metrics.get('d', 0),
-                metrics.get('q', 0),
-                metrics.get('mape', 0),
-                metrics.get('rmse', 0),
-                metrics.get('mae', 0),
-                metrics.get('r2', 0),
-                metrics.get('train_size', 0),
-                metrics.get('test_size', 0),
-                metrics.get('train_percentage', 0),
-                metrics.get('test_percentage', 0),
-                metrics.get('total_data', 0),
-                year_range,
-                energy_stats.get('min', 0),
-                energy_stats.get('max', 0),
-                energy_stats.get('mean', 0),
-                gdp_stats.get('min', 0),
-                gdp_stats.get('max', 0),
-                gdp_stats.get('mean', 0),
-                'success',
-                'candidate',
-                forecast_years,
-                preprocessing_steps_json,
-                training_duration
+        query = """
+            INSERT INTO training_history (
+                training_date, p, d, q, mape, rmse, mae, r2,
+                train_size, test_size, train_percentage, test_percentage,
+                total_data, year_range,
+                energy_min, energy_max, energy_mean,
+                gdp_min, gdp_max, gdp_mean, status, model_status, forecast_years,
+                preprocessing_steps, training_duration
+            ) VALUES (
+                %s, %s, %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s,
+                %s, %s,
+                %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s
             )
+        """
+        
+        values = (
+            datetime.now(),
+            metrics.get('p', 0),
+            metrics.get('d', 0),
+            metrics.get('q', 0),
+            metrics.get('mape', 0),
+            metrics.get('rmse', 0),
+            metrics.get('mae', 0),
+            metrics.get('r2', 0),
+            metrics.get('train_size', 0),
+            metrics.get('test_size', 0),
+            metrics.get('train_percentage', 0),
+            metrics.get('test_percentage', 0),
+            metrics.get('total_data', 0),
+            year_range,
+            energy_stats.get('min', 0),
+            energy_stats.get('max', 0),
+            energy_stats.get('mean', 0),
+            gdp_stats.get('min', 0),
+            gdp_stats.get('max', 0),
+            gdp_stats.get('mean', 0),
+            'success',
+            'candidate',
+            forecast_years,
+            preprocessing_steps_json,
+            training_duration
+        )
         
         cursor.execute(query, values)
         model_id = cursor.lastrowid  # Get the ID of inserted row
+        _increment_counter(cursor, 'training_history')
         connection.commit()
         
         cursor.close()
         connection.close()
         
         print(f"✓ Training history saved as CANDIDATE (ID: {model_id})")
+        bump_data_version()
+        
+        # Plot disimpan sebagai file PNG per model, bukan kolom base64
+        if viz_plots:
+            saved_plots = save_plots(model_id, viz_plots)
+            print(f"✓ {len(saved_plots)} plot saved to {PLOT_DIR}/{model_id}/")
+        if plot_data:
+            save_plot_data(model_id, plot_data)
         
         # Save a copy of the model file with unique ID for future activation
         try:
@@ -267,6 +318,161 @@ def save_training_history(metrics, year_range, energy_stats, gdp_stats, forecast
         print(f"Error saving training history: {e}")
         return None
 
+def get_training_detail(model_id):
+    """
+    Get one training history record (kolom skalar + preprocessing_steps)
+    
+    Returns:
+        Dict record, atau None jika tidak ditemukan
+    """
+    try:
+        connection = get_db_connection()
+        if not connection:
+            return None
+        
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(f"""
+            SELECT {TRAINING_SUMMARY_COLUMNS}, preprocessing_steps
+            FROM training_history WHERE id = %s
+        """, (model_id,))
+        record = cursor.fetchone()
+        
+        cursor.close()
+        connection.close()
+        
+        return record
+        
+    except Error as e:
+        print(f"Error getting training detail: {e}")
+        return None
+
+def migrate_plots_to_files():
+    """
+    Pindahkan plot base64 lama dari kolom training_history ke file PNG,
+    lalu kosongkan kolomnya. Aman dijalankan berulang kali; tidak melakukan
+    apa-apa jika tabel tidak punya kolom plot (database baru).
+    
+    Returns:
+        Jumlah record yang dipindahkan
+    """
+    connection = None
+    cursor = None
+    try:
+        connection = get_db_connection()
+        if not connection:
+            return 0
+        
+        check_cursor = connection.cursor()
+        plot_columns = [name for name in PLOT_NAMES if _column_exists(check_cursor, 'training_history', name)]
+        check_cursor.close()
+        if not plot_columns:
+            return 0
+        
+        cursor = connection.cursor(dictionary=True)
+        has_plot = " OR ".join(f"{name} IS NOT NULL" for name in plot_columns)
+        cursor.execute(f"SELECT id FROM training_history WHERE {has_plot}")
+        model_ids = [row['id'] for row in cursor.fetchall()]
+        
+        # Satu record per query supaya blob tidak dimuat sekaligus
+        for model_id in model_ids:
+            cursor.execute(f"SELECT {', '.join(plot_columns)} FROM training_history WHERE id = %s", (model_id,))
+            row = cursor.fetchone()
+            for plot_name in plot_columns:
+                if row.get(plot_name):
+                    save_plot(model_id, plot_name, decode_plot(row[plot_name]))
+            cursor.execute(
+                f"UPDATE training_history SET {', '.join(f'{name} = NULL' for name in plot_columns)} WHERE id = %s",
+                (model_id,)
+            )
+            connection.commit()
+        
+        if model_ids:
+            print(f"✓ Moved plots of {len(model_ids)} training records to {PLOT_DIR}/")
+        return len(model_ids)
+        
+    except Error as e:
+        print(f"Error migrating training plots: {e}")
+        return 0
+    finally:
+        if cursor is not None:
+            cursor.close()
+        if connection is not None:
+            connection.close()
+
+def _column_exists(cursor, table, column):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    """, (table, column))
+    return cursor.fetchone()[0] > 0
+
+def _index_exists(cursor, table, index_name):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+    """, (table, index_name))
+    return cursor.fetchone()[0] > 0
+
+def _constraint_exists(cursor, table, constraint_name):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.TABLE_CONSTRAINTS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND CONSTRAINT_NAME = %s
+    """, (table, constraint_name))
+    return cursor.fetchone()[0] > 0
+
+def migrate_prediction_history(cursor):
+    """
+    Tambahkan kolom model_id/dedup_key, index dan foreign key ke tabel
+    prediction_history lama. Aman dijalankan berulang kali.
+    """
+    if not _column_exists(cursor, 'prediction_history', 'model_id'):
+        cursor.execute("ALTER TABLE prediction_history ADD COLUMN model_id INT NULL")
+    if not _column_exists(cursor, 'prediction_history', 'dedup_key'):
+        cursor.execute("ALTER TABLE prediction_history ADD COLUMN dedup_key CHAR(40) NULL")
+    if not _index_exists(cursor, 'prediction_history', 'uq_prediction_dedup'):
+        cursor.execute("ALTER TABLE prediction_history ADD UNIQUE KEY uq_prediction_dedup (dedup_key)")
+    if not _index_exists(cursor, 'prediction_history', 'idx_prediction_model_date'):
+        cursor.execute("ALTER TABLE prediction_history ADD INDEX idx_prediction_model_date (model_id, prediction_date)")
+    
+    if not _constraint_exists(cursor, 'prediction_history', 'fk_prediction_model'):
+        # model_id yang tidak lagi ada di training_history tidak bisa diberi FK
+        cursor.execute("""
+            UPDATE prediction_history p
+            LEFT JOIN training_history t ON t.id = p.model_id
+            SET p.model_id = NULL
+            WHERE p.model_id IS NOT NULL AND t.id IS NULL
+        """)
+        try:
+            cursor.execute("""
+                ALTER TABLE prediction_history
+                ADD CONSTRAINT fk_prediction_model FOREIGN KEY (model_id)
+                    REFERENCES training_history(id) ON DELETE SET NULL
+            """)
+        except Error as e:
+            print(f"⚠ Warning: Could not add prediction_history foreign key: {e}")
+
+def migrate_history_indexes(cursor):
+    """
+    Tambahkan kolom staging yang belum ada dan index komposit untuk query
+    model aktif/kandidat serta filter tanggal. Aman dijalankan berulang kali.
+    """
+    for column, definition in TRAINING_STAGING_COLUMNS.items():
+        if not _column_exists(cursor, 'training_history', column):
+            cursor.execute(f"ALTER TABLE training_history ADD COLUMN {column} {definition}")
+    
+    for table, indexes in HISTORY_INDEXES.items():
+        for index_name, columns in indexes:
+            if not _index_exists(cursor, table, index_name):
+                cursor.execute(f"ALTER TABLE {table} ADD INDEX {index_name} ({columns})")
+                print(f"✓ Index {index_name} added to {table}")
+
+def _increment_counter(cursor, table, delta=1):
+    """Update counter jumlah baris tabel (panggil sebelum commit transaksi INSERT/DELETE)"""
+    cursor.execute("""
+        INSERT INTO history_counters (name, value) VALUES (%s, GREATEST(%s, 0))
+        ON DUPLICATE KEY UPDATE value = GREATEST(value + %s, 0)
+    """, (table, delta, delta))
+
 def get_training_history(limit=50):
     """
     Get training history from database
@@ -284,8 +490,8 @@ def get_training_history(limit=50):
         
         cursor = connection.cursor(dictionary=True)
         
-        query = """
-            SELECT * FROM training_history
+        query = f"""
+            SELECT {TRAINING_SUMMARY_COLUMNS} FROM training_history
             ORDER BY training_date DESC
             LIMIT %s
         """
@@ -351,6 +557,7 @@ def save_data_update_history(update_type, source, records_added=0, records_updat
         )
         
         cursor.execute(query, values)
+        _increment_counter(cursor, 'data_update_history')
         connection.commit()
         
         cursor.close()
@@ -398,44 +605,140 @@ def get_data_update_history(limit=50):
         print(f"Error getting data update history: {e}")
         return []
 
-def save_prediction_history(scenario, years, prediction_data, model_version='ARIMAX v1.0'):
+def prediction_dedup_key(model_id, scenario, years):
     """
-    Save prediction history
+    Kunci deduplikasi prediksi: (model, skenario, horizon, versi data).
+    Versi data = versi data store + versi file model (mtime & ukuran), jadi
+    tetap valid setelah restart dan berubah setiap data/model berubah.
     """
+    from services import data_store
+    from services import model_registry
+    
+    store_info = data_store.get_store_info()
+    data_version = store_info['version'] if store_info else None
+    # File model per ID jika ada, selain itu file model aktif
+    model_path = model_registry.get_model_path(model_id)
+    if not os.path.exists(model_path):
+        model_path = model_registry.ACTIVE_MODEL_PATH
     try:
+        stat = os.stat(model_path)
+        model_version = f"{stat.st_mtime_ns}:{stat.st_size}"
+    except OSError:
+        model_version = None
+    raw = f"{model_id}|{scenario}|{int(years)}|{data_version}|{model_version}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def save_prediction_history(scenario, years, prediction_data, model_version='ARIMAX v1.0', model_id=None):
+    """
+    Save prediction history (deduplicated)
+    
+    Row baru hanya ditulis jika kunci (model_id, scenario, years, versi data)
+    berubah; latest_prediction model ikut di-update. Refresh dashboard dengan
+    prediksi yang sama tidak menulis apa pun ke database.
+    
+    Args:
+        model_id: training_history.id; default model aktif
+    
+    Returns:
+        True jika tersimpan atau sudah ada, False jika gagal
+    """
+    try:
+        if model_id is None:
+            active_model = get_active_model()
+            model_id = active_model['id'] if active_model else None
+        
+        dedup_key = prediction_dedup_key(model_id, scenario, years)
+        latest_key = model_id if model_id is not None else 'local'
+        with _latest_prediction_lock:
+            if _latest_prediction_keys.get(latest_key) == dedup_key:
+                return True
+        
         connection = get_db_connection()
         if not connection:
             return False
         
         cursor = connection.cursor()
+        prediction_date = datetime.now()
+        prediction_json = json.dumps(prediction_data)
         
-        query = """
-            INSERT INTO prediction_history (
+        # dedup_key UNIQUE: prediksi yang sama tidak ditulis dua kali
+        cursor.execute("""
+            INSERT IGNORE INTO prediction_history (
                 prediction_date, scenario, years, 
-                prediction_data, model_version
-            ) VALUES (%s, %s, %s, %s, %s)
-        """
-        
-        values = (
-            datetime.now(),
-            scenario,
-            years,
-            json.dumps(prediction_data),
-            model_version
-        )
+                prediction_data, model_version, model_id, dedup_key
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """, (prediction_date, scenario, years, prediction_json, model_version, model_id, dedup_key))
+        if cursor.rowcount > 0:
+            prediction_id = cursor.lastrowid
+            _increment_counter(cursor, 'prediction_history')
+        else:
+            # Sudah pernah disimpan: pakai id row yang ada supaya
+            # latest_prediction menunjuk row dengan data yang sama
+            cursor.execute("SELECT id FROM prediction_history WHERE dedup_key = %s", (dedup_key,))
+            row = cursor.fetchone()
+            prediction_id = row[0] if row else None
+        
+        if model_id is not None:
+            cursor.execute("""
+                INSERT INTO latest_prediction (
+                    model_id, prediction_id, scenario, years,
+                    prediction_data, model_version, dedup_key, prediction_date
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    prediction_id = VALUES(prediction_id),
+                    scenario = VALUES(scenario),
+                    years = VALUES(years),
+                    prediction_data = VALUES(prediction_data),
+                    model_version = VALUES(model_version),
+                    dedup_key = VALUES(dedup_key),
+                    prediction_date = VALUES(prediction_date)
+            """, (model_id, prediction_id, scenario, years, prediction_json, model_version, dedup_key, prediction_date))
         
-        cursor.execute(query, values)
         connection.commit()
         
         cursor.close()
         connection.close()
         
+        with _latest_prediction_lock:
+            _latest_prediction_keys[latest_key] = dedup_key
+        
         return True
         
     except Error as e:
         print(f"Error saving prediction history: {e}")
         return False
 
+def get_latest_prediction(model_id=None):
+    """
+    Prediksi terakhir model (default: model aktif) dari latest_prediction
+    
+    Returns:
+        dict (scenario, years, prediction_data, ...) atau None
+    """
+    try:
+        if model_id is None:
+            active_model = get_active_model()
+            if not active_model:
+                return None
+            model_id = active_model['id']
+        
+        connection = get_db_connection()
+        if not connection:
+            return None
+        
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute("SELECT * FROM latest_prediction WHERE model_id = %s", (model_id,))
+        result = cursor.fetchone()
+        
+        cursor.close()
+        connection.close()
+        
+        return result
+        
+    except Error as e:
+        print(f"Error getting latest prediction: {e}")
+        return None
+
 def get_prediction_history(limit=50):
     """
     Get prediction history from database
@@ -474,6 +777,43 @@ def get_prediction_history(limit=50):
         print(f"Error getting prediction history: {e}")
         return []
 
+def get_state_fingerprint():
+    """
+    Ringkasan state database yang memengaruhi respons dashboard: model aktif,
+    counter riwayat, dan jumlah/ID/updated_at terakhir data energi & GDP.
+    Dipakai response_cache untuk ETag yang konsisten antar proses & restart.
+    
+    Returns:
+        list nilai (string), atau None jika database tidak bisa diakses
+    """
+    connection = None
+    try:
+        connection = get_db_connection()
+        if not connection:
+            return None
+        
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT
+                (SELECT CONCAT(id, '@', COALESCE(activated_at, '')) FROM training_history
+                 WHERE model_status = 'active' ORDER BY activated_at DESC LIMIT 1),
+                (SELECT GROUP_CONCAT(CONCAT(name, '=', value) ORDER BY name) FROM history_counters),
+                (SELECT CONCAT(COUNT(*), ':', COALESCE(MAX(id), 0), ':', COALESCE(MAX(updated_at), ''))
+                 FROM energy_data),
+                (SELECT CONCAT(COUNT(*), ':', COALESCE(MAX(id), 0), ':', COALESCE(MAX(updated_at), ''))
+                 FROM gdp_data)
+        """)
+        row = cursor.fetchone()
+        cursor.close()
+        return [str(value) for value in row]
+        
+    except Error as e:
+        print(f"Error reading state fingerprint: {e}")
+        return None
+    finally:
+        if connection is not None:
+            connection.close()
+
 def get_history_summary():
     """
     Get summary statistics for history page
@@ -490,27 +830,29 @@ def get_history_summary():
         
         cursor = connection.cursor()
         
-        # Total training
-        cursor.execute("SELECT COUNT(*) FROM training_history")
-        total_training = cursor.fetchone()[0]
-        
-        # Total data updates
-        cursor.execute("SELECT COUNT(*) FROM data_update_history")
-        total_data_update = cursor.fetchone()[0]
-        
-        # Total predictions
-        cursor.execute("SELECT COUNT(*) FROM prediction_history")
-        total_prediction = cursor.fetchone()[0]
-        
-        # Today's activities
+        # Total per tabel dari counter (O(1), bukan COUNT(*) full scan)
+        cursor.execute("SELECT name, value FROM history_counters")
+        totals = dict(cursor.fetchall())
+        for table in COUNTED_TABLES:
+            if table not in totals:
+                cursor.execute(f"SELECT COUNT(*) FROM {table}")
+                totals[table] = cursor.fetchone()[0]
+        total_training = int(totals['training_history'])
+        total_data_update = int(totals['data_update_history'])
+        total_prediction = int(totals['prediction_history'])
+        
+        # Today's activities (range predicate supaya index tanggal terpakai)
         cursor.execute("""
             SELECT 
-                (SELECT COUNT(*) FROM training_history WHERE DATE(training_date) = CURDATE()) +
-                (SELECT COUNT(*) FROM data_update_history WHERE DATE(update_date) = CURDATE()) +
-                (SELECT COUNT(*) FROM prediction_history WHERE DATE(prediction_date) = CURDATE())
+                (SELECT COUNT(*) FROM training_history
+                 WHERE training_date >= CURDATE() AND training_date < CURDATE() + INTERVAL 1 DAY) +
+                (SELECT COUNT(*) FROM data_update_history
+                 WHERE update_date >= CURDATE() AND update_date < CURDATE() + INTERVAL 1 DAY) +
+                (SELECT COUNT(*) FROM prediction_history
+                 WHERE prediction_date >= CURDATE() AND prediction_date < CURDATE() + INTERVAL 1 DAY)
             AS today_count
         """)
-        today_activities = cursor.fetchone()[0]
+        today_activities = int(cursor.fetchone()[0] or 0)
         
         cursor.close()
         connection.close()
@@ -545,8 +887,13 @@ def clear_all_history():
         cursor.execute("DELETE FROM training_history")
         cursor.execute("DELETE FROM data_update_history")
         cursor.execute("DELETE FROM prediction_history")
+        cursor.execute("DELETE FROM latest_prediction")
+        cursor.execute("UPDATE history_counters SET value = 0")
         
         connection.commit()
+        bump_data_version()
+        with _latest_prediction_lock:
+            _latest_prediction_keys.clear()
         
         cursor.close()
         connection.close()
@@ -581,8 +928,8 @@ def get_active_model():
         
         cursor = connection.cursor(dictionary=True)
         
-        query = """
-            SELECT * FROM training_history 
+        query = f"""
+            SELECT {TRAINING_SUMMARY_COLUMNS} FROM training_history 
             WHERE model_status = 'active'
             ORDER BY activated_at DESC
             LIMIT 1
@@ -612,8 +959,8 @@ def get_candidate_models(limit=10):
         
         cursor = connection.cursor(dictionary=True)
         
-        query = """
-            SELECT * FROM training_history 
+        query = f"""
+            SELECT {TRAINING_SUMMARY_COLUMNS} FROM training_history 
             WHERE model_status = 'candidate'
             ORDER BY training_date DESC
             LIMIT %s
@@ -682,6 +1029,20 @@ def activate_model(model_id, activated_by='admin'):
             print(f"⚠ Warning: Model file not found: {model_file_path}")
             print("   Predictions will use the existing model file.")
         
+        # Invalidate cache model aktif secara eksplisit, lalu precompute
+        # forecast table untuk model aktif yang baru
+        try:
+            from services.predict_service import invalidate_cache, build_forecast_table
+            invalidate_cache()
+            build_forecast_table()
+        except Exception as table_error:
+            print(f"⚠ Warning: Could not build forecast table: {table_error}")
+        
+        bump_data_version()
+        
+        # Render plot model aktif di background supaya halaman riwayat langsung siap
+        prerender_plots_async(model_id)
+        
         return True
         
     except Error as e:
@@ -707,10 +1068,18 @@ def delete_candidate_model(model_id):
         """, (model_id,))
         
         affected = cursor.rowcount
+        if affected > 0:
+            _increment_counter(cursor, 'training_history', -affected)
         connection.commit()
         cursor.close()
         connection.close()
         
+        if affected > 0:
+            from services.model_registry import invalidate
+            invalidate(model_id)
+            delete_plots(model_id)
+            bump_data_version()
+        
         return affected > 0
         
     except Error as e:
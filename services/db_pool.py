@@ -0,0 +1,212 @@
+"""
+Connection pool MySQL yang dipakai bersama oleh semua service
+
+Sebelumnya setiap fungsi membuka koneksi baru (TCP + handshake + auth) lalu
+menutupnya lagi. Pool ini menyimpan koneksi yang sudah terbuka dan
+meminjamkannya kembali:
+
+- get_connection(): pinjam koneksi; connection.close() mengembalikannya ke pool
+- db_connection(): context manager (rollback jika error, selalu dikembalikan)
+- Health check saat checkout: koneksi yang putus dibuang dan diganti baru
+- Koneksi yang lupa di-close (misal karena exception) otomatis kembali ke
+  pool saat objeknya dibuang, sehingga pool tidak bocor
+"""
+import threading
+import time
+from contextlib import contextmanager
+import mysql.connector
+from mysql.connector import Error
+
+# Database configuration
+DB_CONFIG = {
+    'host': 'localhost',
+    'database': 'arimax_forecasting',
+    'user': 'root',
+    'password': ''  # Default XAMPP password kosong
+}
+
+# Jumlah koneksi idle yang disimpan di pool
+DB_POOL_SIZE = 5
+# Koneksi tambahan yang boleh dibuka saat semua koneksi pool sedang dipakai
+DB_POOL_MAX_OVERFLOW = 10
+# Lama menunggu koneksi bebas (detik) jika pool + overflow penuh
+DB_POOL_TIMEOUT = 10
+
+_lock = threading.Condition()
+_idle = []          # koneksi mysql.connector yang siap dipinjam
+_in_use = 0         # jumlah koneksi yang sedang dipinjam
+_stats = {'created': 0, 'reused': 0, 'discarded': 0}
+
+
+class PooledConnection:
+    """Pembungkus koneksi pinjaman; close() mengembalikan ke pool, bukan menutup socket"""
+
+    def __init__(self, cnx):
+        self._cnx = cnx
+
+    def __getattr__(self, name):
+        if self._cnx is None:
+            raise Error("Connection sudah dikembalikan ke pool")
+        return getattr(self._cnx, name)
+
+    def close(self):
+        cnx, self._cnx = self._cnx, None
+        if cnx is not None:
+            _release(cnx)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def configure_pool(pool_size=None, max_overflow=None, **db_config):
+    """
+    Ubah ukuran pool dan/atau konfigurasi database (misal untuk benchmark).
+    Koneksi idle lama ditutup agar konfigurasi baru langsung berlaku.
+    """
+    global DB_POOL_SIZE, DB_POOL_MAX_OVERFLOW
+    if pool_size is not None:
+        DB_POOL_SIZE = int(pool_size)
+    if max_overflow is not None:
+        DB_POOL_MAX_OVERFLOW = int(max_overflow)
+    if db_config:
+        DB_CONFIG.update(db_config)
+    close_all()
+
+
+def _healthy(cnx):
+    try:
+        cnx.ping(reconnect=False)
+        return True
+    except Exception:
+        return False
+
+
+def _discard(cnx):
+    _stats['discarded'] += 1
+    try:
+        cnx.close()
+    except Exception:
+        pass
+
+
+def _release(cnx):
+    global _in_use
+    # Jangan bawa transaksi yang belum di-commit ke peminjam berikutnya
+    try:
+        if cnx.in_transaction:
+            cnx.rollback()
+        reusable = cnx.is_connected()
+    except Exception:
+        reusable = False
+
+    with _lock:
+        _in_use -= 1
+        if reusable and len(_idle) < DB_POOL_SIZE:
+            _idle.append(cnx)
+            cnx = None
+        _lock.notify()
+
+    if cnx is not None:
+        _discard(cnx)
+
+
+def get_connection():
+    """
+    Pinjam koneksi dari pool.
+
+    Returns:
+        PooledConnection (pakai seperti koneksi mysql.connector biasa)
+
+    Raises:
+        mysql.connector.Error jika tidak bisa terhubung atau pool penuh
+    """
+    global _in_use
+    deadline = time.monotonic() + DB_POOL_TIMEOUT
+
+    while True:
+        with _lock:
+            while not _idle and _in_use >= DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise Error("Connection pool penuh (timeout menunggu koneksi bebas)")
+                _lock.wait(remaining)
+            cnx = _idle.pop() if _idle else None
+            _in_use += 1
+
+        if cnx is None:
+            break
+        # Health check saat checkout
+        if _healthy(cnx):
+            _stats['reused'] += 1
+            return PooledConnection(cnx)
+        with _lock:
+            _in_use -= 1
+        _discard(cnx)
+
+    try:
+        cnx = mysql.connector.connect(**DB_CONFIG)
+    except Exception:
+        with _lock:
+            _in_use -= 1
+            _lock.notify()
+        raise
+    _stats['created'] += 1
+    return PooledConnection(cnx)
+
+
+@contextmanager
+def db_connection():
+    """
+    Context manager untuk koneksi dari pool:
+
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            ...
+            connection.commit()
+
+    Transaksi yang belum di-commit di-rollback jika terjadi exception.
+    """
+    connection = get_connection()
+    try:
+        yield connection
+    except Exception:
+        try:
+            connection.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        connection.close()
+
+
+def close_all():
+    """Tutup semua koneksi idle di pool"""
+    with _lock:
+        idle = list(_idle)
+        _idle.clear()
+    for cnx in idle:
+        try:
+            cnx.close()
+        except Exception:
+            pass
+
+
+def get_pool_stats():
+    """Statistik pool: koneksi baru (handshake) vs koneksi yang dipakai ulang"""
+    with _lock:
+        return {
+            'pool_size': DB_POOL_SIZE,
+            'max_overflow': DB_POOL_MAX_OVERFLOW,
+            'idle': len(_idle),
+            'in_use': _in_use,
+            **_stats
+        }
@@ -0,0 +1,153 @@
+"""
+Ingest CSV OWID fossil-fuel-primary-energy secara streaming
+
+File OWID berisi semua negara & tahun, padahal yang dipakai hanya satu
+entity (Indonesia). Sebelumnya seluruh file dibaca dengan pd.read_csv lalu
+difilter di memori. Di sini CSV dibaca streaming per chunk (pd.read_csv
+chunksize di atas stream response), hanya baris entity & rentang tahun yang
+diminta yang disimpan, hanya kolom yang dibutuhkan, dengan dtype eksplisit.
+Memori sebanding dengan satu chunk + baris output, bukan ukuran file.
+
+File OWID terurut per entity, jadi pembacaan berhenti begitu blok entity
+yang dicari sudah lewat (stop_after_block=True).
+"""
+import csv
+import io
+import numpy as np
+import pandas as pd
+
+ENERGY_URL = "https://ourworldindata.org/grapher/fossil-fuel-primary-energy.csv?v=1&csvType=full&useColumnShortNames=true"
+ENERGY_ENTITY = "Indonesia"
+
+ENTITY_COLUMNS = ['Entity', 'entity', 'Country', 'country', 'location', 'Location', 'entityname']
+CODE_COLUMNS = ['Code', 'code']
+YEAR_COLUMNS = ['Year', 'year', 'Date', 'date', 'Time', 'time']
+ENERGY_VALUE_COLUMNS = ['fossil_fuels__twh', 'fossil_fuels', 'value', 'Energy']
+
+REQUEST_TIMEOUT = 60
+
+# Baris per chunk pd.read_csv (memori puncak ~ satu chunk + baris hasil)
+ENERGY_CHUNK_SIZE = 50000
+
+
+def _find_column(header, candidates):
+    return next((col for col in candidates if col in header), None)
+
+
+def _read_header(stream):
+    header = next(csv.reader([stream.readline()]), None)
+    if not header:
+        raise ValueError("File CSV energi kosong")
+    return [col.strip().lstrip('\ufeff') for col in header]
+
+
+def filter_energy_csv(stream, entity=ENERGY_ENTITY, start_year=None, end_year=None, stop_after_block=True,
+                      chunk_size=ENERGY_CHUNK_SIZE):
+    """
+    Filter CSV energi (file-like teks) ke satu entity & rentang tahun
+
+    Args:
+        stream: File-like teks, posisi di awal (header)
+        entity: Nama entity (exact match case-insensitive; fallback substring)
+        start_year, end_year: Rentang tahun inklusif (None = tanpa batas)
+        stop_after_block: Berhenti setelah blok entity lewat (file terurut per entity)
+        chunk_size: Jumlah baris per chunk pd.read_csv
+
+    Returns:
+        DataFrame kolom Entity, code, Year (int64) + kolom nilai (float64)
+
+    Raises:
+        ValueError: Kolom entity/tahun tidak ada atau entity tidak ditemukan
+    """
+    header = _read_header(stream)
+
+    entity_col = _find_column(header, ENTITY_COLUMNS)
+    if entity_col is None:
+        raise ValueError(f"Kolom Entity/Country tidak ditemukan. Kolom tersedia: {', '.join(header[:10])}")
+    year_col = _find_column(header, YEAR_COLUMNS)
+    if year_col is None:
+        raise ValueError(f"Kolom Year tidak ditemukan. Kolom tersedia: {', '.join(header[:10])}")
+    code_col = _find_column(header, CODE_COLUMNS)
+
+    # Hanya kolom nilai energi yang dikenal; jika tidak ada, semua kolom lain
+    value_cols = [col for col in ENERGY_VALUE_COLUMNS if col in header]
+    if not value_cols:
+        value_cols = [col for col in header if col not in (entity_col, year_col, code_col)]
+
+    # Entity & code sebagai category: normalisasi nama cukup per kategori unik
+    dtypes = {entity_col: 'category', year_col: 'float64', **{col: 'float64' for col in value_cols}}
+    if code_col:
+        dtypes[code_col] = 'category'
+
+    chunks = pd.read_csv(
+        stream,
+        header=None,
+        names=header,
+        usecols=list(dtypes),
+        dtype=dtypes,
+        chunksize=chunk_size,
+        on_bad_lines='skip'
+    )
+
+    target = entity.strip().lower()
+    exact_parts, partial_parts = [], []
+    in_block = False
+    seen_entities = set()
+
+    for chunk in chunks:
+        entities = chunk[entity_col].cat
+        names = entities.categories.astype(str).str.strip().str.lower()
+        codes = entities.codes.to_numpy()
+        exact = np.isin(codes, np.flatnonzero(names == target))
+        if exact.any():
+            in_block = True
+            exact_parts.append(chunk[exact])
+        elif not in_block:
+            partial = np.isin(codes, np.flatnonzero(names.str.contains(target, regex=False)))
+            if partial.any():
+                partial_parts.append(chunk[partial])
+            if len(seen_entities) < 50:
+                seen_entities.update(entities.categories[:50])
+        # Baris terakhir chunk sudah entity lain: blok entity sudah lewat
+        if in_block and stop_after_block and not exact[-1]:
+            break
+
+    parts = exact_parts if in_block else partial_parts
+    if not parts:
+        raise ValueError(
+            f"Tidak ada data {entity} di kolom '{entity_col}'. "
+            f"Contoh nilai yang tersedia: {', '.join(sorted(map(str, seen_entities))[:20])}"
+        )
+
+    df = pd.concat(parts, ignore_index=True).dropna(subset=[year_col])
+    df = df.astype({col: 'object' for col in (entity_col, code_col) if col})
+    if start_year is not None:
+        df = df[df[year_col] >= start_year]
+    if end_year is not None:
+        df = df[df[year_col] <= end_year]
+
+    df = df.rename(columns={entity_col: 'Entity', year_col: 'Year', **({code_col: 'code'} if code_col else {})})
+    if not code_col:
+        df['code'] = ''
+    df['Year'] = df['Year'].astype('int64')
+    return df[['Entity', 'code', 'Year'] + value_cols].reset_index(drop=True)
+
+
+def read_energy_csv(source=ENERGY_URL, entity=ENERGY_ENTITY, start_year=None, end_year=None, stop_after_block=True):
+    """
+    Baca CSV energi OWID secara streaming dari URL atau path file lokal
+
+    Lihat filter_energy_csv untuk argumen & hasil.
+    """
+    if str(source).startswith(('http://', 'https://')):
+        from services.http_cache import get_session
+        with get_session().get(source, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            # Jangan tutup stream saat EOF (dibungkus io.BufferedReader)
+            response.raw.auto_close = False
+            stream = io.TextIOWrapper(io.BufferedReader(response.raw), encoding=response.encoding or 'utf-8')
+            return filter_energy_csv(stream, entity, start_year, end_year, stop_after_block)
+
+    with open(source, newline='', encoding='utf-8') as f:
+        return filter_energy_csv(f, entity, start_year, end_year, stop_after_block)
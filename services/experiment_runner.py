@@ -0,0 +1,387 @@
+"""
+Runner eksperimen pemilihan model (pengganti loop di script models/*.py)
+
+Script metodologi skripsi masing-masing memuat ulang CSV, menebak nama
+kolom, membuat split, mem-fit kandidat satu per satu lalu menulis CSV
+sendiri. Di sini eksperimen ditulis sebagai spec deklaratif (dict):
+
+    {
+        'orders': [(1, 1, 1), (3, 2, 1)],     # kandidat (p,d,q)
+        'splits': [0.7, 0.8],                 # rasio train
+        'models': ['ARIMA', 'ARIMAX'],        # tanpa / dengan GDP
+        'evaluation': ['fixed', 'rolling'],   # split tetap / rolling-origin
+        'data_sizes': [None],                 # n observasi pertama (None = semua)
+        'fit_kwargs': {...},                  # opsi SARIMAX.fit
+    }
+
+Produk kartesius (data_size x model x evaluation x order x split) dijalankan
+di process pool (data dari data store, fit lewat services.fit_cache),
+dengan progress per task, dan hasilnya satu tabel gabungan (kolom
+Experiment, Model, Evaluation, Order, Split, MAPE, ...) yang bisa ditulis
+ke CSV atau Parquet.
+
+Evaluasi 'rolling' memakai backtest_service.rolling_backtest: origin
+pertama = rasio split (atau rolling_start_year), forecast 1..horizon langkah.
+"""
+import itertools
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from statsmodels.stats.diagnostic import acorr_ljungbox
+
+from services import data_store
+from services.fit_cache import fit_sarimax
+
+DEFAULT_RESULTS_PATH = os.path.join("models", "experiment_results.csv")
+
+SPEC_DEFAULTS = {
+    'orders': [(1, 1, 1)],
+    'splits': [0.8],
+    'models': ['ARIMAX'],
+    'evaluation': ['fixed'],
+    'data_sizes': [None],
+    'fit_kwargs': None,
+    'min_train': 10,
+    'min_test': 1,
+    # Khusus evaluasi rolling
+    'rolling_start_year': None,
+    'horizon': 1,
+    'refit_every': 0,
+    'refit_iterations': 10,
+    'warm_start': True,
+    'per_origin': False,
+    # Lag uji Ljung-Box residual (0 = tidak diuji)
+    'ljungbox_lags': 10
+}
+
+RESULT_COLUMNS = [
+    'Experiment', 'Model', 'Evaluation', 'Order', 'p', 'd', 'q', 'Data_Size', 'Split', 'Split_Ratio',
+    'Train_Size', 'Test_Size', 'Train_Years', 'Test_Years', 'Origin_Year', 'Actual', 'Predicted',
+    'MAPE', 'MAE', 'RMSE', 'R2', 'AIC', 'BIC', 'GDP_Coef', 'GDP_pvalue', 'Converged', 'No_Autocorr',
+    'Cached', 'Fit_Seconds', 'Status'
+]
+
+# Eksperimen dari script models/*.py (nama -> spec)
+EXPERIMENT_SPECS = {
+    'train_test_splits': {
+        'description': "ARIMAX(1,1,1) pada berbagai rasio train/test (test_train_test_splits.py)",
+        'orders': [(1, 1, 1)],
+        'splits': [0.60, 0.65, 0.70, 0.75, 0.80, 0.85, 0.90],
+        'min_train': 30,
+        'min_test': 5
+    },
+    'comprehensive_model_selection': {
+        'description': "Kandidat ACF/PACF (d=2) + baseline literatur x 4 split (comprehensive_model_selection.py)",
+        'orders': sorted(
+            [(p, 2, q) for p in (1, 2, 3) for q in (1, 4, 5, 6) if p + q <= 7]
+            + [(1, 1, 1), (0, 1, 0), (1, 1, 0), (0, 1, 1)]
+        ),
+        'splits': [0.70, 0.75, 0.80, 0.85],
+        'fit_kwargs': {'maxiter': 200, 'method': 'lbfgs'}
+    },
+    'acf_pacf_candidates': {
+        'description': "Kandidat valid ACF/PACF, split 70:30 (validate_acf_pacf_candidates.py)",
+        'orders': [(1, 1, 1), (1, 2, 1), (3, 1, 1), (3, 2, 1), (1, 2, 5), (3, 2, 5), (3, 2, 6), (2, 2, 5)],
+        'splits': [0.70],
+        'fit_kwargs': {'maxiter': 200, 'method': 'lbfgs'}
+    },
+    'gdp_exogenous': {
+        'description': "Koefisien GDP kandidat terbaik di berbagai split (analyze_gdp_exogenous.py)",
+        'orders': [(3, 2, 1), (1, 1, 1), (3, 1, 1)],
+        'splits': [0.70, 0.75, 0.80, 0.85],
+        'min_test': 5,
+        'fit_kwargs': {'maxiter': 200, 'method': 'lbfgs'}
+    },
+    'arimax_orders': {
+        'description': "Order ARIMAX kecil (p,q <= 3, d <= 2), split 80:20 (compare_arimax_models.py)",
+        'orders': [(1, 1, 1), (2, 1, 1), (1, 1, 2), (2, 2, 1), (1, 2, 2),
+                   (2, 1, 2), (3, 1, 1), (1, 1, 3), (2, 2, 2), (3, 2, 1)],
+        'splits': [0.80]
+    },
+    'rolling_forecast': {
+        'description': "Rolling forecast 1 tahun, origin 2022-2024 (rolling_forecast_validation.py)",
+        'orders': [(3, 2, 6), (1, 1, 1), (3, 2, 1)],
+        'evaluation': ['rolling'],
+        'rolling_start_year': 2022,
+        'refit_every': 1,
+        'refit_iterations': 200,
+        'warm_start': False,
+        'fit_kwargs': {'maxiter': 200},
+        'per_origin': True
+    },
+    'model_stability': {
+        'description': "ARIMAX(1,1,1) split 80:20 pada ukuran data 30, 35, ... (test_model_stability.py)",
+        'orders': [(1, 1, 1)],
+        'data_sizes': list(range(30, 61, 5)),
+        'min_test': 3
+    }
+}
+
+
+def load_experiment_data():
+    """Data energi & GDP (year, energy, gdp) yang tahunnya cocok, dari data store"""
+    df = data_store.get_aligned_data()
+    if df is None or df.empty:
+        raise ValueError("Data energi & GDP belum tersedia. Lakukan fetch/upload data terlebih dahulu.")
+    return df.dropna().reset_index(drop=True)
+
+
+def split_label(ratio):
+    return f"{int(round(ratio * 100))}:{int(round((1 - ratio) * 100))}"
+
+
+def expand_spec(name, spec, n_obs):
+    """
+    Produk kartesius spec -> list task
+
+    Returns:
+        (tasks, skipped): kombinasi yang train/test-nya terlalu kecil dilewati
+    """
+    spec = {**SPEC_DEFAULTS, **spec}
+    tasks, skipped = [], []
+    for data_size, model, evaluation, order, ratio in itertools.product(
+        spec['data_sizes'], spec['models'], spec['evaluation'], spec['orders'], spec['splits']
+    ):
+        size = min(int(data_size or n_obs), n_obs)
+        train_size = int(size * ratio)
+        task = {
+            'experiment': name,
+            'model': model.upper(),
+            'evaluation': evaluation,
+            'order': tuple(int(x) for x in order),
+            'data_size': size,
+            'split': float(ratio),
+            'train_size': train_size,
+            'spec': spec
+        }
+        if train_size < spec['min_train'] or size - train_size < spec['min_test']:
+            skipped.append(task)
+        else:
+            tasks.append(task)
+    return tasks, skipped
+
+
+def _base_row(task):
+    order = task['order']
+    return {
+        'Experiment': task['experiment'],
+        'Model': task['model'],
+        'Evaluation': task['evaluation'],
+        'Order': str(order),
+        'p': order[0],
+        'd': order[1],
+        'q': order[2],
+        'Data_Size': task['data_size'],
+        'Split': split_label(task['split']),
+        'Split_Ratio': task['split'],
+        'Train_Size': task['train_size']
+    }
+
+
+def _fixed_rows(task, y, exog, years):
+    spec = task['spec']
+    n = task['train_size']
+    y_train, y_test = y[:n], y[n:]
+    exog_train = exog[:n] if exog is not None else None
+    exog_test = exog[n:] if exog is not None else None
+
+    start = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        result = fit_sarimax(y_train, exog_train, task['order'], fit_kwargs=spec['fit_kwargs'])
+        predictions = np.asarray(result.forecast(steps=len(y_test), exog=exog_test), dtype=float)
+
+    error = y_test - predictions
+    row = {
+        **_base_row(task),
+        'Test_Size': len(y_test),
+        'Train_Years': f"{int(years[0])}-{int(years[n - 1])}",
+        'Test_Years': f"{int(years[n])}-{int(years[-1])}",
+        'MAPE': float(np.mean(np.abs(error / y_test)) * 100),
+        'MAE': float(np.mean(np.abs(error))),
+        'RMSE': float(np.sqrt(np.mean(error ** 2))),
+        'R2': float(1 - np.sum(error ** 2) / np.sum((y_test - np.mean(y_test)) ** 2)),
+        'AIC': float(result.aic),
+        'BIC': float(result.bic),
+        'Converged': bool(result.mle_retvals.get('converged', True)) if result.mle_retvals else True,
+        'Cached': result.fit_cache_hit,
+        'Fit_Seconds': round(time.perf_counter() - start, 4),
+        'Status': 'Success'
+    }
+    if exog is not None:
+        # Parameter exog pertama = koefisien GDP (beta)
+        row['GDP_Coef'] = float(np.asarray(result.params)[0])
+        row['GDP_pvalue'] = float(np.asarray(result.pvalues)[0])
+    if spec['ljungbox_lags']:
+        lb_test = acorr_ljungbox(result.resid, lags=spec['ljungbox_lags'], return_df=True)
+        row['No_Autocorr'] = bool((lb_test['lb_pvalue'] > 0.05).all())
+    return [row]
+
+
+def _rolling_rows(task, y, exog, years):
+    from services.backtest_service import rolling_backtest
+
+    spec = task['spec']
+    first_origin = task['train_size']
+    if spec['rolling_start_year'] is not None:
+        first_origin = int(np.searchsorted(years, spec['rolling_start_year']))
+    if exog is None:
+        raise ValueError("Evaluasi rolling membutuhkan variabel eksogen (model ARIMAX)")
+
+    backtest = rolling_backtest(
+        y, exog, task['order'], years=years, horizon=spec['horizon'], min_train=first_origin,
+        refit_every=spec['refit_every'], refit_iterations=spec['refit_iterations'], warm_start=spec['warm_start'],
+        maxiter=(spec['fit_kwargs'] or {}).get('maxiter')
+    )
+    base = {**_base_row(task), 'Train_Size': first_origin}
+    if spec['rolling_start_year'] is not None:
+        base.update({'Split': f"origin {backtest['first_origin_year']}", 'Split_Ratio': None})
+    step_one = backtest['per_horizon'][0]
+    rows = [{
+        **base,
+        'Test_Size': backtest['n_origins'],
+        'Train_Years': f"{int(years[0])}-{int(years[first_origin - 1])}",
+        'Test_Years': f"{backtest['first_origin_year']}-{int(years[-1])}",
+        'MAPE': step_one['mape'],
+        'MAE': step_one['mae'],
+        'RMSE': step_one['rmse'],
+        'Fit_Seconds': round(backtest['duration_ms'] / 1000, 4),
+        'Status': 'Success'
+    }]
+    if spec['per_origin']:
+        for origin in backtest['origins']:
+            rows.append({
+                **base,
+                'Train_Size': origin['train_size'],
+                'Test_Size': 1,
+                'Train_Years': f"{int(years[0])}-{int(years[origin['train_size'] - 1])}",
+                'Origin_Year': origin['origin_year'],
+                'Actual': origin['actual'][0],
+                'Predicted': origin['predicted'][0],
+                'MAPE': origin['ape'][0],
+                'Converged': origin['converged'],
+                'Status': 'Success'
+            })
+    return rows
+
+
+def run_task(task, y, exog, years):
+    """
+    Jalankan satu task (level-modul supaya bisa dikirim ke worker process)
+
+    Returns:
+        list row hasil (rolling dengan per_origin: satu row ringkasan + row per origin)
+    """
+    size = task['data_size']
+    y, years = np.asarray(y, dtype=float)[:size], np.asarray(years)[:size]
+    exog = np.asarray(exog, dtype=float).reshape(len(exog), -1)[:size] if task['model'] == 'ARIMAX' else None
+    try:
+        if task['evaluation'] == 'rolling':
+            return _rolling_rows(task, y, exog, years)
+        return _fixed_rows(task, y, exog, years)
+    except Exception as e:
+        return [{**_base_row(task), 'Status': f"Failed: {str(e)[:100]}"}]
+
+
+def run_experiments(names=None, specs=None, df=None, max_workers=None, progress=True):
+    """
+    Jalankan satu atau beberapa eksperimen sebagai satu batch paralel
+
+    Args:
+        names: Nama spec di EXPERIMENT_SPECS (default semua)
+        specs: dict nama -> spec tambahan/pengganti
+        df: Data (year, energy, gdp); default load_experiment_data()
+        max_workers: Jumlah proses (default jumlah CPU; 1 = serial)
+        progress: Cetak progress per task
+
+    Returns:
+        DataFrame hasil gabungan (kolom RESULT_COLUMNS)
+    """
+    all_specs = {**EXPERIMENT_SPECS, **(specs or {})}
+    names = list(names or (list(specs) if specs else list(EXPERIMENT_SPECS)))
+    unknown = [name for name in names if name not in all_specs]
+    if unknown:
+        raise ValueError(f"Eksperimen tidak dikenal: {', '.join(unknown)}. Tersedia: {', '.join(all_specs)}")
+
+    df = load_experiment_data() if df is None else df
+    y, exog, years = df['energy'].to_numpy(), df[['gdp']].to_numpy(), df['year'].to_numpy()
+
+    tasks = []
+    for name in names:
+        spec_tasks, skipped = expand_spec(name, all_specs[name], len(df))
+        tasks.extend(spec_tasks)
+        for task in skipped:
+            print(f"  Skip {name} {task['model']}{task['order']} split {split_label(task['split'])} "
+                  f"(n={task['data_size']}): train/test terlalu kecil")
+
+    start = time.perf_counter()
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(tasks) or 1))
+    rows = []
+    done_tasks = []
+
+    def _record(task, task_rows):
+        rows.extend(task_rows)
+        if progress:
+            summary = task_rows[0]
+            status = f"MAPE {summary['MAPE']:.2f}%" if summary['Status'] == 'Success' else summary['Status']
+            print(f"  [{len(done_tasks)}/{len(tasks)}] {task['experiment']}: {task['model']}{task['order']} "
+                  f"split {split_label(task['split'])} n={task['data_size']} ({task['evaluation']}) -> {status}")
+
+    if workers == 1:
+        for task in tasks:
+            done_tasks.append(task)
+            _record(task, run_task(task, y, exog, years))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_task, task, y, exog, years): task for task in tasks}
+            for future in as_completed(futures):
+                task = futures[future]
+                done_tasks.append(task)
+                try:
+                    task_rows = future.result()
+                except Exception as e:
+                    task_rows = [{**_base_row(task), 'Status': f"Failed: {str(e)[:100]}"}]
+                _record(task, task_rows)
+
+    if progress:
+        print(f"✓ {len(tasks)} task selesai dalam {time.perf_counter() - start:.1f} s ({workers} proses)")
+
+    results = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    # Urutan stabil (hasil paralel datang tidak berurutan)
+    order_key = {name: index for index, name in enumerate(names)}
+    results['_experiment_order'] = results['Experiment'].map(order_key)
+    results['_is_detail'] = results['Origin_Year'].notna()
+    results = results.sort_values(
+        ['_experiment_order', 'Model', 'Evaluation', 'Data_Size', 'p', 'd', 'q', 'Split_Ratio', '_is_detail', 'Origin_Year'],
+        kind='stable'
+    ).drop(columns=['_experiment_order', '_is_detail'])
+    return results.reset_index(drop=True)
+
+
+def run_experiment(name, spec=None, **kwargs):
+    """Satu eksperimen (dari EXPERIMENT_SPECS, atau spec yang diberikan)"""
+    specs = {name: spec} if spec is not None else None
+    return run_experiments([name], specs=specs, **kwargs)
+
+
+def write_results(results, path=DEFAULT_RESULTS_PATH):
+    """
+    Tulis tabel hasil ke CSV, atau Parquet jika path berakhiran .parquet
+    (fallback ke CSV jika pyarrow/fastparquet tidak terpasang)
+
+    Returns:
+        path file yang ditulis
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if path.endswith('.parquet'):
+        try:
+            results.to_parquet(path, index=False)
+            return path
+        except ImportError:
+            path = path[:-len('.parquet')] + '.csv'
+            print(f"⚠ Warning: Engine Parquet tidak tersedia, menulis CSV: {path}")
+    results.to_csv(path, index=False)
+    return path
@@ -0,0 +1,285 @@
+"""
+Cache hasil fit SARIMAX di disk (SQLite), content-addressed
+
+Script metodologi (models/*.py, verify_order_selection.py), pencarian order
+dan retrain_model berulang kali mem-fit (p,d,q) yang sama pada data energi/
+GDP dan split yang sama. Di sini hasil fit disimpan dengan key hash dari:
+
+- isi array y & exog training (panjangnya = indeks split)
+- order, opsi SARIMAX (enforce_*, trend, ...) dan opsi fit (method, maxiter,
+  start_params, ...)
+- versi statsmodels & FIT_CACHE_VERSION
+
+Yang disimpan: parameter, log-likelihood, AIC/BIC, status konvergensi, dan
+forecast data test (per hash exog test & jumlah langkah). Cache hit
+merekonstruksi SARIMAXResults lewat model.smooth(params) tanpa optimizer,
+jadi menjalankan ulang suite metodologi hanya mem-fit kombinasi yang berubah.
+
+Nonaktifkan dengan environment variable FIT_CACHE=0.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from datetime import datetime
+import numpy as np
+import statsmodels
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+FIT_CACHE_PATH = os.path.join("database", "fit_cache.db")
+FIT_CACHE_ENABLED = os.environ.get("FIT_CACHE", "1") != "0"
+
+# Naikkan jika cara fit / format record berubah (key lama otomatis tidak terpakai)
+FIT_CACHE_VERSION = 1
+
+DEFAULT_MODEL_KWARGS = {'enforce_stationarity': False, 'enforce_invertibility': False}
+
+# Opsi fit yang tidak memengaruhi hasil
+IGNORED_FIT_KWARGS = ('disp', 'callback')
+
+_init_lock = threading.Lock()
+_initialized_path = None
+_stats = {'hits': 0, 'misses': 0, 'forecast_hits': 0, 'forecast_misses': 0}
+
+
+def configure_cache(path=None, enabled=None):
+    """Ubah lokasi database cache dan/atau aktifkan/nonaktifkan cache"""
+    global FIT_CACHE_PATH, FIT_CACHE_ENABLED, _initialized_path
+    if path is not None:
+        FIT_CACHE_PATH = path
+        _initialized_path = None
+    if enabled is not None:
+        FIT_CACHE_ENABLED = bool(enabled)
+
+
+def get_cache_stats():
+    return dict(_stats)
+
+
+def _connect():
+    global _initialized_path
+    os.makedirs(os.path.dirname(FIT_CACHE_PATH) or ".", exist_ok=True)
+    connection = sqlite3.connect(FIT_CACHE_PATH, timeout=30)
+    connection.row_factory = sqlite3.Row
+    if _initialized_path != FIT_CACHE_PATH:
+        with _init_lock:
+            if _initialized_path != FIT_CACHE_PATH:
+                # WAL: worker process pencarian order bisa menulis bersamaan
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("""
+                    CREATE TABLE IF NOT EXISTS fits (
+                        key TEXT PRIMARY KEY,
+                        p INTEGER NOT NULL,
+                        d INTEGER NOT NULL,
+                        q INTEGER NOT NULL,
+                        nobs INTEGER NOT NULL,
+                        params TEXT NOT NULL,
+                        param_names TEXT NOT NULL,
+                        llf REAL,
+                        aic REAL,
+                        bic REAL,
+                        converged INTEGER,
+                        fit_seconds REAL,
+                        created_at TEXT NOT NULL
+                    )
+                """)
+                connection.execute("""
+                    CREATE TABLE IF NOT EXISTS forecasts (
+                        fit_key TEXT NOT NULL,
+                        exog_key TEXT NOT NULL,
+                        steps INTEGER NOT NULL,
+                        forecast TEXT NOT NULL,
+                        PRIMARY KEY (fit_key, exog_key, steps)
+                    )
+                """)
+                connection.commit()
+                _initialized_path = FIT_CACHE_PATH
+    return connection
+
+
+def _array_digest(values):
+    """Hash isi array (dtype float, plus shape); None untuk exog kosong"""
+    if values is None:
+        return None
+    array = np.ascontiguousarray(np.asarray(values, dtype=float))
+    digest = hashlib.sha1(str(array.shape).encode('utf-8'))
+    digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def _jsonable(value):
+    if isinstance(value, (str, bool, int, float)) or value is None:
+        return value
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)) and not any(isinstance(v, (int, float, np.number)) for v in value):
+        return [_jsonable(v) for v in value]
+    try:
+        return np.asarray(value, dtype=float).tolist()
+    except (TypeError, ValueError):
+        return repr(value)
+
+
+def fit_key(y, exog, order, fit_kwargs=None, model_kwargs=None):
+    """
+    Key cache untuk satu fit: hash data training + order + split + opsi
+
+    Args:
+        y, exog: Data training (exog boleh None untuk ARIMA murni)
+        order: tuple (p, d, q)
+        fit_kwargs: Opsi SARIMAX.fit (disp & callback diabaikan)
+        model_kwargs: Opsi konstruktor SARIMAX selain endog/exog/order
+    """
+    payload = {
+        'version': FIT_CACHE_VERSION,
+        'statsmodels': statsmodels.__version__,
+        'y': _array_digest(y),
+        'exog': _array_digest(exog),
+        'split': int(len(y)),
+        'order': [int(x) for x in order],
+        'model': _jsonable({**DEFAULT_MODEL_KWARGS, **(model_kwargs or {})}),
+        'fit': _jsonable({k: v for k, v in (fit_kwargs or {}).items() if k not in IGNORED_FIT_KWARGS})
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def get_fit(key):
+    """Record fit tersimpan (params, llf, aic, bic, converged, ...) atau None"""
+    if not FIT_CACHE_ENABLED:
+        return None
+    try:
+        connection = _connect()
+        row = connection.execute("SELECT * FROM fits WHERE key = ?", (key,)).fetchone()
+        connection.close()
+    except sqlite3.Error as e:
+        print(f"⚠ Warning: Fit cache tidak bisa dibaca: {e}")
+        return None
+    if row is None:
+        _stats['misses'] += 1
+        return None
+    _stats['hits'] += 1
+    record = dict(row)
+    record['params'] = json.loads(record['params'])
+    record['param_names'] = json.loads(record['param_names'])
+    record['converged'] = bool(record['converged'])
+    return record
+
+
+def put_fit(key, order, result, fit_seconds=None):
+    """Simpan hasil fit (SARIMAXResults) ke cache"""
+    if not FIT_CACHE_ENABLED:
+        return
+    retvals = getattr(result, 'mle_retvals', None) or {}
+    try:
+        connection = _connect()
+        connection.execute("""
+            INSERT OR REPLACE INTO fits
+                (key, p, d, q, nobs, params, param_names, llf, aic, bic, converged, fit_seconds, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            key, int(order[0]), int(order[1]), int(order[2]), int(result.nobs),
+            json.dumps([float(v) for v in np.asarray(result.params)]),
+            json.dumps([str(name) for name in result.model.param_names]),
+            float(result.llf), float(result.aic), float(result.bic),
+            int(bool(retvals.get('converged', True))), fit_seconds, datetime.now().isoformat()
+        ))
+        connection.commit()
+        connection.close()
+    except sqlite3.Error as e:
+        print(f"⚠ Warning: Fit cache tidak bisa ditulis: {e}")
+
+
+def get_forecast(key, exog, steps):
+    """Forecast data test tersimpan untuk fit `key` (array) atau None"""
+    if not FIT_CACHE_ENABLED:
+        return None
+    try:
+        connection = _connect()
+        row = connection.execute(
+            "SELECT forecast FROM forecasts WHERE fit_key = ? AND exog_key = ? AND steps = ?",
+            (key, _array_digest(exog) or '', int(steps))
+        ).fetchone()
+        connection.close()
+    except sqlite3.Error:
+        return None
+    if row is None:
+        _stats['forecast_misses'] += 1
+        return None
+    _stats['forecast_hits'] += 1
+    return np.asarray(json.loads(row['forecast']), dtype=float)
+
+
+def put_forecast(key, exog, steps, forecast):
+    if not FIT_CACHE_ENABLED:
+        return
+    try:
+        connection = _connect()
+        connection.execute(
+            "INSERT OR REPLACE INTO forecasts (fit_key, exog_key, steps, forecast) VALUES (?, ?, ?, ?)",
+            (key, _array_digest(exog) or '', int(steps), json.dumps([float(v) for v in np.asarray(forecast)]))
+        )
+        connection.commit()
+        connection.close()
+    except sqlite3.Error as e:
+        print(f"⚠ Warning: Fit cache tidak bisa ditulis: {e}")
+
+
+def fit_sarimax(y, exog, order, fit_kwargs=None, callback=None, **model_kwargs):
+    """
+    Pengganti SARIMAX(y, exog=exog, order=order, ...).fit(**fit_kwargs) yang
+    memakai cache. Default enforce_stationarity/invertibility=False seperti
+    di seluruh repo.
+
+    Returns:
+        SARIMAXResults; atribut fit_cache_key & fit_cache_hit ditambahkan
+    """
+    fit_kwargs = dict(fit_kwargs or {})
+    model = SARIMAX(y, exog=exog, order=tuple(order), **{**DEFAULT_MODEL_KWARGS, **model_kwargs})
+    key = fit_key(y, exog, order, fit_kwargs, model_kwargs)
+
+    record = get_fit(key)
+    if record is not None and len(record['params']) == len(model.start_params):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            result = model.smooth(np.asarray(record['params']))
+        result.mle_retvals = {'converged': record['converged'], 'fit_cache': True}
+        result.mle_settings = {'optimizer': fit_kwargs.get('method', 'lbfgs')}
+        result.fit_cache_key = key
+        result.fit_cache_hit = True
+        return result
+
+    fit_kwargs.setdefault('disp', False)
+    start = time.perf_counter()
+    result = model.fit(callback=callback, **fit_kwargs)
+    put_fit(key, order, result, round(time.perf_counter() - start, 4))
+    result.fit_cache_key = key
+    result.fit_cache_hit = False
+    return result
+
+
+def cached_forecast(result, steps, exog=None):
+    """
+    result.forecast(steps, exog) dengan cache per (fit, exog test, steps).
+    Untuk result dari fit_sarimax; result lain langsung di-forecast.
+    """
+    key = getattr(result, 'fit_cache_key', None)
+    if key is not None:
+        values = get_forecast(key, exog, steps)
+        if values is not None:
+            return values
+    forecast = np.asarray(result.forecast(steps=steps, exog=exog), dtype=float)
+    if key is not None:
+        put_forecast(key, exog, steps, forecast)
+    return forecast
+
+
+def clear_cache():
+    if os.path.exists(FIT_CACHE_PATH):
+        connection = _connect()
+        connection.execute("DELETE FROM fits")
+        connection.execute("DELETE FROM forecasts")
+        connection.commit()
+        connection.close()
@@ -0,0 +1,226 @@
+"""
+Cache HTTP di disk untuk sumber data eksternal (OWID, World Bank)
+
+Sebelumnya setiap fetch mengunduh ulang seluruh CSV OWID dan JSON World
+Bank walaupun tidak ada perubahan. Di sini payload mentah disimpan di
+data/cache/http/ bersama ETag / Last-Modified-nya:
+
+- Default (TTL 0, jalur fetch/update data): selalu request kondisional
+  (If-None-Match / If-Modified-Since); 304 Not Modified -> payload di disk
+  dipakai lagi (not_modified=True)
+- TTL > 0 (hanya jika data basi bisa diterima, misal preview
+  PREVIEW_CACHE_TTL): payload yang masih dalam TTL dipakai tanpa request
+- 200: payload baru di-stream ke disk (atomic rename)
+- Request gagal: retry dengan backoff eksponensial (opsional, dibatasi
+  deadline); jika tetap gagal tetapi ada payload lama, payload lama dipakai
+  (status 'stale')
+
+Semua request memakai satu requests.Session (connection pool keep-alive).
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+import requests
+from requests.adapters import HTTPAdapter
+
+HTTP_CACHE_DIR = os.path.join("data", "cache", "http")
+
+# Umur payload (detik) sebelum direvalidasi ke server; 0 = selalu revalidasi
+HTTP_CACHE_TTL = 0
+# TTL untuk preview data API (boleh sedikit basi, tanpa request tiap buka halaman)
+PREVIEW_CACHE_TTL = 6 * 3600
+
+HTTP_TIMEOUT = 60
+# Jeda retry pertama (detik), berlipat dua tiap retry
+HTTP_RETRY_BACKOFF = 1.0
+HTTP_POOL_SIZE = 4
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+CachedResponse = namedtuple('CachedResponse', ['url', 'path', 'version', 'not_modified', 'from_cache', 'status'])
+
+_session = None
+_session_lock = threading.Lock()
+_url_locks = {}
+_stats = {'fresh': 0, 'revalidated': 0, 'downloaded': 0, 'stale': 0}
+
+
+def configure_cache(ttl=None, cache_dir=None):
+    """Ubah TTL dan/atau direktori cache (misal dari config atau benchmark)"""
+    global HTTP_CACHE_TTL, HTTP_CACHE_DIR
+    if ttl is not None:
+        HTTP_CACHE_TTL = float(ttl)
+    if cache_dir is not None:
+        HTTP_CACHE_DIR = cache_dir
+
+
+def get_session():
+    """requests.Session bersama (keep-alive) dengan User-Agent default"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update(REQUEST_HEADERS)
+            _session = session
+        return _session
+
+
+def get_cache_stats():
+    return dict(_stats)
+
+
+def _cache_paths(url):
+    key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    return os.path.join(HTTP_CACHE_DIR, f"{key}.body"), os.path.join(HTTP_CACHE_DIR, f"{key}.json")
+
+
+def _load_meta(meta_path, body_path):
+    if not os.path.exists(meta_path) or not os.path.exists(body_path):
+        return None
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_meta(meta_path, meta):
+    tmp_path = f"{meta_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+def _url_lock(url):
+    with _session_lock:
+        return _url_locks.setdefault(url, threading.Lock())
+
+
+def _download(url, meta, body_path, meta_path, headers, timeout, deadline, cancel_event):
+    """Satu request (kondisional jika ada meta), payload 200 ditulis ke disk"""
+    request_headers = dict(headers or {})
+    if meta:
+        if meta.get('etag'):
+            request_headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            request_headers['If-Modified-Since'] = meta['last_modified']
+
+    if deadline is not None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise requests.Timeout(f"Deadline fetch {url} terlampaui")
+        timeout = min(timeout, remaining)
+
+    with get_session().get(url, headers=request_headers, stream=True, timeout=timeout) as response:
+        if response.status_code == 304 and meta:
+            meta['fetched_at'] = time.time()
+            _save_meta(meta_path, meta)
+            _stats['revalidated'] += 1
+            return CachedResponse(url, body_path, meta['version'], True, True, 'revalidated')
+
+        response.raise_for_status()
+
+        digest = hashlib.sha1()
+        tmp_path = f"{body_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise requests.Timeout(f"Fetch {url} dibatalkan")
+                if deadline is not None and time.monotonic() > deadline:
+                    raise requests.Timeout(f"Deadline fetch {url} terlampaui")
+                digest.update(chunk)
+                f.write(chunk)
+        os.replace(tmp_path, body_path)
+
+    new_meta = {
+        'url': url,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'version': digest.hexdigest(),
+        'fetched_at': time.time()
+    }
+    _save_meta(meta_path, new_meta)
+    _stats['downloaded'] += 1
+    # Server tanpa ETag bisa mengirim 200 dengan isi yang sama
+    not_modified = bool(meta) and meta.get('version') == new_meta['version']
+    return CachedResponse(url, body_path, new_meta['version'], not_modified, False, 'downloaded')
+
+
+def fetch(url, ttl=None, timeout=HTTP_TIMEOUT, headers=None, retries=0, backoff=HTTP_RETRY_BACKOFF,
+          deadline=None, cancel_event=None):
+    """
+    Ambil URL lewat cache disk
+
+    Args:
+        url: URL sumber data
+        ttl: Umur maksimum payload tanpa revalidasi (detik), default HTTP_CACHE_TTL
+        timeout: Timeout per request (detik)
+        headers: Header tambahan
+        retries: Jumlah retry jika request gagal (backoff eksponensial)
+        backoff: Jeda retry pertama (detik), berlipat dua tiap retry
+        deadline: Batas waktu absolut (time.monotonic()) untuk semua percobaan
+        cancel_event: threading.Event; jika di-set, download dihentikan
+
+    Returns:
+        CachedResponse: path payload di disk, version (ETag/hash payload),
+        not_modified (True hanya jika server menjawab 304 atau payload 200
+        identik dengan payload sebelumnya), from_cache, status ('fresh' /
+        'revalidated' / 'downloaded' / 'stale' = request gagal, payload lama)
+    """
+    ttl = HTTP_CACHE_TTL if ttl is None else ttl
+    body_path, meta_path = _cache_paths(url)
+    os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+
+    with _url_lock(url):
+        meta = _load_meta(meta_path, body_path)
+        if meta and time.time() - meta['fetched_at'] < ttl:
+            _stats['fresh'] += 1
+            # Tidak ada request: belum diketahui apakah sumber berubah
+            return CachedResponse(url, body_path, meta['version'], False, True, 'fresh')
+
+        attempt = 0
+        while True:
+            try:
+                return _download(url, meta, body_path, meta_path, headers, timeout, deadline, cancel_event)
+            except requests.RequestException as e:
+                delay = backoff * 2 ** attempt
+                cancelled = cancel_event is not None and cancel_event.is_set()
+                out_of_time = deadline is not None and time.monotonic() + delay >= deadline
+                # Error 4xx tidak akan berubah dengan retry
+                client_error = (isinstance(e, requests.HTTPError) and e.response is not None
+                                and e.response.status_code < 500)
+                if attempt < retries and not (cancelled or out_of_time or client_error):
+                    attempt += 1
+                    print(f"⚠ Warning: Fetch {url} gagal ({e}), retry {attempt}/{retries} dalam {delay:.1f} s")
+                    if cancel_event is not None:
+                        cancel_event.wait(delay)
+                    else:
+                        time.sleep(delay)
+                    continue
+                if meta:
+                    print(f"⚠ Warning: Fetch {url} gagal ({e}), memakai data cache lama")
+                    _stats['stale'] += 1
+                    # Request gagal: status 'stale' supaya pemanggil bisa melaporkannya
+                    return CachedResponse(url, body_path, meta['version'], False, True, 'stale')
+                raise
+
+
+def fetch_json(url, ttl=None, timeout=HTTP_TIMEOUT):
+    """fetch() lalu parse payload JSON. Returns (data, CachedResponse)"""
+    cached = fetch(url, ttl=ttl, timeout=timeout)
+    with open(cached.path, encoding='utf-8') as f:
+        return json.load(f), cached
+
+
+def clear_cache():
+    if os.path.isdir(HTTP_CACHE_DIR):
+        for name in os.listdir(HTTP_CACHE_DIR):
+            os.remove(os.path.join(HTTP_CACHE_DIR, name))
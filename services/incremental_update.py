@@ -0,0 +1,296 @@
+"""
+Update model ARIMAX secara inkremental saat data tahun baru masuk
+
+Alih-alih retrain penuh (pencarian order + fit ulang), model aktif cukup
+diperluas dengan observasi baru lewat SARIMAXResults.append(refit=False):
+parameter tetap, hanya state Kalman filter yang di-update. Opsional,
+parameter di-optimasi ulang beberapa iterasi (warm start) pada seluruh
+histori dari data store; model aktif dari artifact ringkas hanya menyimpan
+ekor data sehingga tidak bisa di-fit ulang dari results.data.
+
+Drift diukur dari error one-step-ahead pada tahun-tahun baru. Jika MAPE
+one-step melebihi threshold, model dianggap tidak lagi cocok dan dilakukan
+retrain penuh (retrain_model) termasuk pencarian order.
+"""
+import os
+import time
+import warnings
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+from services import model_registry
+from services import data_store
+from services.model_artifact import save_model_artifact
+
+# Batas MAPE one-step-ahead (%) di data baru sebelum fallback ke retrain penuh
+DRIFT_THRESHOLD = 10.0
+
+# Jumlah iterasi optimizer untuk re-optimasi parameter (0 = tanpa re-optimasi)
+DEFAULT_REFINE_ITERATIONS = 10
+
+
+def load_aligned_data():
+    """Data energi & GDP yang tahunnya cocok (sama seperti retrain_model), dari data store"""
+    return data_store.get_aligned_data()
+
+
+def _active_model_info():
+    """model_info model aktif (berdasarkan ID di database, fallback ke file aktif)"""
+    from services.database_service import get_active_model
+
+    active_model = get_active_model()
+    if active_model:
+        model_info = model_registry.get_model_info(active_model['id'])
+        if model_info:
+            return model_info, active_model
+    return model_registry.get_model_info(model_registry.ACTIVE_MODEL), active_model
+
+
+def append_observations(results, energy, gdp):
+    """
+    Perluas results dengan observasi baru tanpa fit ulang
+
+    Returns:
+        (results baru, prediksi one-step-ahead untuk tiap observasi baru)
+    """
+    start = int(results.data.row_labels[-1]) + 1
+    index = pd.RangeIndex(start, start + len(energy))
+    endog = pd.Series(np.asarray(energy, dtype=float), index=index, name=results.data.orig_endog.name)
+    exog = pd.DataFrame({results.data.orig_exog.columns[0]: np.asarray(gdp, dtype=float)}, index=index)
+
+    # Sama dengan results.append(refit=False), tetapi inisialisasi state ikut
+    # disalin: model dari artifact ringkas diinisialisasi dengan state yang
+    # diketahui, sedangkan append() akan memakai inisialisasi default
+    model = results.model.clone(
+        pd.concat([results.data.orig_endog, endog]),
+        exog=pd.concat([results.data.orig_exog, exog])
+    )
+    model.ssm.initialization = results.model.ssm.initialization
+    new_results = model.filter(results.params)
+    # fittedvalues = prediksi one-step-ahead dari Kalman filter
+    one_step = np.asarray(new_results.fittedvalues, dtype=float)[-len(index):]
+    return new_results, one_step
+
+
+def refine_parameters(results, order, maxiter, history):
+    """
+    Re-optimasi parameter mulai dari parameter model sekarang (warm start)
+
+    Args:
+        results: Model aktif (parameter awal)
+        order: (p, d, q)
+        maxiter: Jumlah iterasi optimizer
+        history: DataFrame (energy, gdp) seluruh histori dari data store:
+            window training model + tahun baru
+    """
+    history = history.reset_index(drop=True)
+    model = SARIMAX(
+        history["energy"].astype(float),
+        exog=history[["gdp"]].astype(float),
+        order=order,
+        enforce_stationarity=False,
+        enforce_invertibility=False
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return model.fit(start_params=np.asarray(results.params), maxiter=maxiter, disp=False)
+
+
+def incremental_update(drift_threshold=DRIFT_THRESHOLD, refine_iterations=DEFAULT_REFINE_ITERATIONS,
+                       forecast_years=3):
+    """
+    Update model aktif dengan tahun data baru dan simpan sebagai CANDIDATE
+
+    Args:
+        drift_threshold: MAPE one-step-ahead (%) maksimum; di atasnya retrain penuh
+        refine_iterations: Iterasi re-optimasi parameter (0 = append saja)
+        forecast_years: Jumlah tahun forecast untuk dashboard (seperti retrain_model)
+
+    Returns:
+        dict: status, mode ('incremental' / 'full_retrain' / 'up_to_date'), drift, dll.
+    """
+    from services.train_service import retrain_model
+    from services.predict_service import build_forecast_table
+    from services.database_service import save_training_history
+
+    start_time = time.time()
+
+    if not os.path.exists("data/raw/energy.csv") or not os.path.exists("data/raw/gdp.csv"):
+        return {
+            "status": "error",
+            "message": "File data tidak ditemukan. Lakukan fetch/upload data terlebih dahulu."
+        }
+
+    model_info, active_model = _active_model_info()
+    if not model_info or model_info.get('test_years') is None:
+        print("No incremental base model available, running full retrain...")
+        result = retrain_model(forecast_years=forecast_years)
+        result["mode"] = "full_retrain"
+        return result
+
+    results = model_info['model']
+    order = tuple(int(x) for x in results.model.order)
+    last_year = int(np.asarray(model_info['test_years'])[-1])
+
+    df = load_aligned_data()
+    new_rows = df[df["year"] > last_year]
+
+    # Observasi baru harus berurutan tahunnya: berhenti di baris pertama yang
+    # energinya kosong/nol/tak hingga atau GDP-nya tidak valid
+    valid = (
+        np.isfinite(new_rows["energy"].to_numpy(dtype=float))
+        & (new_rows["energy"].to_numpy(dtype=float) != 0)
+        & np.isfinite(new_rows["gdp"].to_numpy(dtype=float))
+    )
+    invalid_rows = new_rows[~valid]
+    if not invalid_rows.empty:
+        first_invalid = int(np.argmin(valid))
+        print(f"⚠ Warning: Data baru tidak valid untuk tahun "
+              f"{', '.join(str(int(year)) for year in invalid_rows['year'])}, "
+              f"hanya {first_invalid} tahun pertama yang dipakai untuk update inkremental")
+        new_rows = new_rows.iloc[:first_invalid]
+
+    if new_rows.empty and not invalid_rows.empty:
+        print("No valid new observations for drift check, running full retrain...")
+        result = retrain_model(forecast_years=forecast_years)
+        result["mode"] = "full_retrain"
+        result["drift"] = None
+        return result
+
+    if new_rows.empty:
+        return {
+            "status": "success",
+            "mode": "up_to_date",
+            "message": f"Tidak ada data baru setelah {last_year}, model tidak diubah.",
+            "year_range": f"{int(df['year'].min())}-{int(df['year'].max())}"
+        }
+
+    new_results, one_step = append_observations(results, new_rows["energy"], new_rows["gdp"])
+
+    actual = new_rows["energy"].to_numpy(dtype=float)
+    drift = float(np.mean(np.abs((actual - one_step) / actual)) * 100)
+    print(f"One-step-ahead MAPE on {len(new_rows)} new year(s): {drift:.2f}% (threshold {drift_threshold}%)")
+
+    # Drift NaN/inf (misal prediksi gagal) tidak boleh lolos sebagai "tidak drift"
+    if not np.isfinite(drift) or drift > drift_threshold:
+        print("Drift above threshold (or not computable), running full retrain with order search...")
+        result = retrain_model(forecast_years=forecast_years)
+        result["mode"] = "full_retrain"
+        result["drift"] = drift if np.isfinite(drift) else None
+        return result
+
+    final_result = new_results
+    params_changed = False
+    if refine_iterations:
+        history = df[df["year"] <= int(new_rows["year"].iloc[-1])]
+        final_result = refine_parameters(results, order, refine_iterations, history)
+        param_delta = float(np.max(np.abs(np.asarray(final_result.params) - np.asarray(results.params))))
+        params_changed = param_delta > 0
+        if params_changed:
+            print(f"✓ Parameters re-estimated on {len(history)} observations (max change {param_delta:.4g})")
+        else:
+            print(f"⚠ Warning: Re-optimasi {refine_iterations} iterasi tidak mengubah parameter "
+                  f"({len(history)} observasi)")
+
+    # Data evaluasi dashboard: data test lama + prediksi one-step tahun baru
+    test_years = np.concatenate([np.asarray(model_info['test_years']), new_rows["year"].to_numpy()])
+    y_test = np.concatenate([np.asarray(model_info['y_test'], dtype=float), actual])
+    y_pred = np.concatenate([np.asarray(model_info['y_pred'], dtype=float), one_step])
+
+    base_metrics = model_info.get('metrics') or {}
+    save_model_artifact(
+        model_registry.ACTIVE_MODEL_PATH,
+        final_result,
+        y_test=y_test,
+        y_pred=y_pred,
+        test_years=test_years,
+        metrics=base_metrics,
+        order_search=model_info.get('order_search')
+    )
+
+    try:
+        build_forecast_table()
+    except Exception as table_error:
+        print(f"Warning: Failed to build forecast table: {table_error}")
+
+    active_model = active_model or {}
+    metrics = {
+        "mae": float(base_metrics.get('mae', active_model.get('mae') or 0)),
+        "rmse": float(base_metrics.get('rmse', active_model.get('rmse') or 0)),
+        "mape": float(base_metrics.get('mape', active_model.get('mape') or 0)),
+        "r2": float(base_metrics.get('r2', active_model.get('r2') or 0)),
+        "order": str(order),
+        "p": order[0],
+        "d": order[1],
+        "q": order[2],
+        "train_size": active_model.get('train_size') or 0,
+        "test_size": active_model.get('test_size') or 0,
+        "train_percentage": active_model.get('train_percentage') or 0,
+        "test_percentage": active_model.get('test_percentage') or 0,
+        "total_data": len(df)
+    }
+
+    year_range = f"{int(df['year'].min())}-{int(df['year'].max())}"
+    energy_stats = {
+        "min": float(df["energy"].min()),
+        "max": float(df["energy"].max()),
+        "mean": float(df["energy"].mean())
+    }
+    gdp_stats = {
+        "min": float(df["gdp"].min()),
+        "max": float(df["gdp"].max()),
+        "mean": float(df["gdp"].mean())
+    }
+
+    new_years = [int(year) for year in new_rows["year"]]
+    training_duration = time.time() - start_time
+    steps = [{
+        "step": 1,
+        "title": "Update Inkremental",
+        "description": "Model aktif diperluas dengan data tahun baru tanpa pencarian order ulang",
+        "details": [
+            f"📅 Tahun baru: {', '.join(str(year) for year in new_years)}",
+            f"🎯 Order tetap: ({order[0]}, {order[1]}, {order[2]})",
+            f"📊 MAPE one-step-ahead data baru: {drift:.2f}% (threshold {drift_threshold}%)",
+            (f"⚙️ Re-optimasi parameter: {refine_iterations} iterasi pada {len(df[df['year'] <= new_years[-1]])} observasi"
+             + ("" if params_changed else " (parameter tidak berubah)")) if refine_iterations
+            else "⚙️ Parameter tetap (append tanpa refit)"
+        ],
+        "status": "success",
+        "duration": round(training_duration, 3)
+    }]
+
+    model_id = None
+    try:
+        model_id = save_training_history(
+            metrics,
+            year_range,
+            energy_stats,
+            gdp_stats,
+            forecast_years,
+            preprocessing_steps=steps,
+            training_duration=training_duration
+        )
+    except Exception as db_error:
+        print(f"Warning: Failed to save to database: {db_error}")
+
+    message = f"Model diperbarui secara inkremental dengan {len(new_years)} tahun data baru ({new_years[0]}-{new_years[-1]}). "
+    if model_id:
+        message += f"Model disimpan sebagai CANDIDATE (ID: {model_id})."
+    else:
+        message += "Model tersimpan sebagai file lokal."
+
+    return {
+        "status": "success",
+        "mode": "incremental",
+        "message": message,
+        "rows_used": len(df),
+        "year_range": year_range,
+        "new_years": new_years,
+        "drift": drift,
+        "params_changed": params_changed,
+        "metrics": metrics,
+        "model_id": model_id,
+        "duration": round(training_duration, 3)
+    }
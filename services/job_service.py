@@ -0,0 +1,301 @@
+"""
+Background job runner untuk proses berat (training model)
+
+Job dijalankan di thread pool sehingga request HTTP langsung kembali dengan
+task id, sedangkan status dan progress disimpan di tabel SQLite lokal
+(database/jobs.db) supaya bisa dibaca oleh endpoint progress.
+
+Setiap job mencatat pemiliknya (pid & host) dan heartbeat yang di-update
+berkala oleh proses pemilik. Job queued/running hanya ditandai gagal jika
+proses pemiliknya sudah mati atau heartbeat-nya basi, sehingga worker lain
+(atau reloader) tidak membunuh job yang masih berjalan.
+"""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+JOBS_DB_PATH = "database/jobs.db"
+
+# Training memakai file model bersama (models/arimax_model.pkl),
+# jadi job dijalankan satu per satu
+MAX_CONCURRENT_JOBS = 1
+
+# Interval update heartbeat (detik) dan umur heartbeat sebelum job dianggap yatim
+JOB_HEARTBEAT_INTERVAL = 10
+JOB_STALE_AFTER = 60
+
+_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_JOBS, thread_name_prefix="job")
+_init_lock = threading.Lock()
+_initialized = False
+
+# Job queued/running milik proses ini (di-heartbeat oleh _heartbeat_loop)
+_owned_jobs = set()
+_owned_lock = threading.Lock()
+_heartbeat_thread = None
+
+OWNER_HOST = socket.gethostname()
+
+
+def _connect():
+    connection = sqlite3.connect(JOBS_DB_PATH, timeout=10)
+    connection.row_factory = sqlite3.Row
+    return connection
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError, ValueError, TypeError):
+        # Proses ada tapi milik user lain / pid tidak valid di OS ini
+        return True
+    return True
+
+
+def reap_orphaned_jobs(connection=None):
+    """
+    Tandai gagal job queued/running yang pemiliknya sudah tidak ada: proses
+    pemilik (host yang sama) sudah mati, atau heartbeat lebih lama dari
+    JOB_STALE_AFTER detik.
+
+    Returns:
+        int: jumlah job yang ditandai gagal
+    """
+    own_connection = connection is None
+    if own_connection:
+        connection = _connect()
+    try:
+        stale_before = (datetime.now() - timedelta(seconds=JOB_STALE_AFTER)).isoformat()
+        rows = connection.execute("""
+            SELECT id, owner_pid, owner_host, COALESCE(heartbeat_at, started_at, created_at) AS last_seen
+            FROM jobs
+            WHERE status IN ('queued', 'running')
+        """).fetchall()
+
+        orphaned = []
+        for row in rows:
+            with _owned_lock:
+                if row['id'] in _owned_jobs:
+                    continue
+            owner_dead = (
+                row['owner_host'] == OWNER_HOST and row['owner_pid'] is not None
+                and not _pid_alive(row['owner_pid'])
+            )
+            if owner_dead or row['last_seen'] < stale_before:
+                orphaned.append(row['id'])
+
+        for job_id in orphaned:
+            connection.execute("""
+                UPDATE jobs
+                SET status = 'failed', message = 'Job terputus (proses pemilik berhenti)', finished_at = ?
+                WHERE id = ? AND status IN ('queued', 'running')
+            """, (datetime.now().isoformat(), job_id))
+        connection.commit()
+        return len(orphaned)
+    finally:
+        if own_connection:
+            connection.close()
+
+
+def _heartbeat_loop():
+    while True:
+        time.sleep(JOB_HEARTBEAT_INTERVAL)
+        with _owned_lock:
+            job_ids = list(_owned_jobs)
+        if not job_ids:
+            continue
+        try:
+            connection = _connect()
+            connection.execute(
+                f"UPDATE jobs SET heartbeat_at = ? WHERE id IN ({', '.join('?' * len(job_ids))})",
+                (datetime.now().isoformat(), *job_ids)
+            )
+            connection.commit()
+            connection.close()
+        except sqlite3.Error as e:
+            print(f"⚠ Warning: Job heartbeat gagal: {e}")
+
+
+def _ensure_heartbeat():
+    global _heartbeat_thread
+    with _owned_lock:
+        if _heartbeat_thread is None or not _heartbeat_thread.is_alive():
+            _heartbeat_thread = threading.Thread(target=_heartbeat_loop, name="job-heartbeat", daemon=True)
+            _heartbeat_thread.start()
+
+
+def init_jobs_table():
+    """Buat tabel jobs jika belum ada, dan tandai job yatim (pemiliknya sudah berhenti)"""
+    global _initialized
+    with _init_lock:
+        if _initialized:
+            return
+        os.makedirs(os.path.dirname(JOBS_DB_PATH), exist_ok=True)
+        connection = _connect()
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                job_type TEXT NOT NULL,
+                status TEXT NOT NULL,
+                progress REAL DEFAULT 0,
+                current_step INTEGER DEFAULT 0,
+                total_steps INTEGER DEFAULT 0,
+                message TEXT,
+                events TEXT DEFAULT '[]',
+                result TEXT,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT,
+                owner_pid INTEGER,
+                owner_host TEXT,
+                heartbeat_at TEXT
+            )
+        """)
+        # Tabel dari versi lama belum punya kolom pemilik / heartbeat
+        columns = {row['name'] for row in connection.execute("PRAGMA table_info(jobs)")}
+        for column, column_type in (('owner_pid', 'INTEGER'), ('owner_host', 'TEXT'), ('heartbeat_at', 'TEXT')):
+            if column not in columns:
+                connection.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+        connection.commit()
+        reap_orphaned_jobs(connection)
+        connection.close()
+        _initialized = True
+
+
+def _update_job(job_id, **fields):
+    if not fields:
+        return
+    columns = ", ".join(f"{key} = ?" for key in fields)
+    connection = _connect()
+    connection.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+    connection.commit()
+    connection.close()
+
+
+def _append_event(job_id, event, total_steps):
+    """Tambah satu event progress dan update persentase"""
+    connection = _connect()
+    row = connection.execute("SELECT events FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    events = json.loads(row['events']) if row and row['events'] else []
+    events.append(event)
+
+    current_step = int(event.get('step', len(events)))
+    progress = round(min(current_step / total_steps, 1.0) * 100, 1) if total_steps else 0
+
+    connection.execute("""
+        UPDATE jobs
+        SET events = ?, current_step = ?, progress = ?, message = ?, heartbeat_at = ?
+        WHERE id = ?
+    """, (json.dumps(events, ensure_ascii=False, default=str), current_step, progress, event.get('title'),
+          datetime.now().isoformat(), job_id))
+    connection.commit()
+    connection.close()
+
+
+def _job_failure_message(result):
+    """Pesan error jika func melaporkan gagal lewat nilai kembalian (bukan exception)"""
+    if isinstance(result, dict) and (result.get('success') is False or result.get('status') == 'error'):
+        return result.get('message') or 'Job gagal'
+    return None
+
+
+def _run_job(job_id, func, total_steps, kwargs):
+    now = datetime.now().isoformat()
+    _update_job(job_id, status='running', started_at=now, heartbeat_at=now, message='Job sedang berjalan')
+
+    def progress_callback(event):
+        try:
+            _append_event(job_id, event, total_steps)
+        except Exception as e:
+            print(f"Warning: Failed to record job progress: {e}")
+
+    try:
+        result = func(progress_callback=progress_callback, **kwargs)
+        failure = _job_failure_message(result)
+        if failure is not None:
+            _update_job(
+                job_id,
+                status='failed',
+                message=failure,
+                result=json.dumps(result, ensure_ascii=False, default=str),
+                finished_at=datetime.now().isoformat()
+            )
+        else:
+            _update_job(
+                job_id,
+                status='completed',
+                progress=100,
+                current_step=total_steps,
+                message='Job selesai',
+                result=json.dumps(result, ensure_ascii=False, default=str),
+                finished_at=datetime.now().isoformat()
+            )
+    except Exception as e:
+        traceback.print_exc()
+        _update_job(
+            job_id,
+            status='failed',
+            message=f"Error: {str(e)}",
+            finished_at=datetime.now().isoformat()
+        )
+    finally:
+        with _owned_lock:
+            _owned_jobs.discard(job_id)
+
+
+def submit_job(job_type, func, total_steps=0, **kwargs):
+    """
+    Jalankan func(progress_callback=..., **kwargs) di background
+
+    Args:
+        job_type: Nama jenis job (misal 'training')
+        func: Fungsi yang dijalankan; menerima progress_callback(event_dict)
+        total_steps: Jumlah step untuk menghitung persentase progress
+
+    Returns:
+        job_id (str)
+    """
+    init_jobs_table()
+
+    job_id = uuid.uuid4().hex
+    now = datetime.now().isoformat()
+    connection = _connect()
+    connection.execute("""
+        INSERT INTO jobs (id, job_type, status, total_steps, message, created_at, owner_pid, owner_host, heartbeat_at)
+        VALUES (?, ?, 'queued', ?, ?, ?, ?, ?, ?)
+    """, (job_id, job_type, total_steps, 'Menunggu antrian', now, os.getpid(), OWNER_HOST, now))
+    connection.commit()
+    connection.close()
+
+    with _owned_lock:
+        _owned_jobs.add(job_id)
+    _ensure_heartbeat()
+    _executor.submit(_run_job, job_id, func, total_steps, kwargs)
+    return job_id
+
+
+def get_job(job_id):
+    """Ambil status job, None jika tidak ditemukan"""
+    init_jobs_table()
+
+    connection = _connect()
+    # Job yang pemiliknya mati setelah init tetap terdeteksi saat dipoll
+    reap_orphaned_jobs(connection)
+    row = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    connection.close()
+
+    if not row:
+        return None
+
+    job = dict(row)
+    job['events'] = json.loads(job['events']) if job['events'] else []
+    job['result'] = json.loads(job['result']) if job['result'] else None
+    return job
@@ -0,0 +1,190 @@
+"""
+Format artifact model ARIMAX yang ringkas
+
+Alih-alih mem-pickle seluruh SARIMAXResults (model, data, dan semua matriks
+output filter), artifact hanya menyimpan:
+- parameter hasil fit, order, dan opsi model
+- state vector + kovariansnya pada awal "ekor" data
+- d observasi terakhir (minimal 1) dan exog pada ekor tersebut
+- array data test (y_test, y_pred, test_years) sebagai NumPy array
+
+Loader membangun ulang SARIMAXResults yang bisa forecast dengan cara
+memfilter ekor data dari state yang diketahui. Hasil forecast dan
+conf_int identik dengan model aslinya.
+
+Hasil rebuild hanya untuk forecast (ForecastOnlyResults): aic, bic dan llf
+diambil dari fit penuh yang disimpan di artifact (jumlah observasi fit penuh
+di full_nobs dan model_info['fit_stats']; results.nobs tetap panjang ekor
+karena dipakai statsmodels sebagai titik awal forecast). fittedvalues, resid
+dan llf_obs (yang hanya mencakup ekor data) raise ForecastOnlyError.
+results.data juga hanya berisi ekor data, jadi fit ulang (misal re-optimasi
+di incremental_update) memakai histori dari data store.
+"""
+import pickle
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.statespace.sarimax import SARIMAX, SARIMAXResults, SARIMAXResultsWrapper
+
+ARTIFACT_FORMAT = "arimax-slim-v1"
+
+
+def build_model_artifact(results, y_test=None, y_pred=None, test_years=None, metrics=None, order_search=None):
+    """
+    Buat artifact ringkas dari SARIMAXResults
+
+    Args:
+        results: SARIMAXResults hasil fit (model final)
+        y_test, y_pred, test_years: Data evaluasi untuk dashboard (opsional)
+        metrics: Dictionary metrics evaluasi (opsional)
+        order_search: Tabel peringkat kandidat order dari order_search (opsional)
+
+    Returns:
+        dict: Artifact siap di-pickle (hanya berisi NumPy array dan tipe dasar)
+    """
+    model = results.model
+    endog = np.asarray(results.data.orig_endog, dtype=float).ravel()
+    exog = np.asarray(results.data.orig_exog, dtype=float)
+
+    nobs = len(endog)
+    tail = min(max(model.k_diff, 1), nobs)
+    start = nobs - tail
+
+    # predicted_state[:, start] = state prediksi untuk observasi ke-start
+    # (berdasarkan data sebelum start); filter ulang dari titik ini
+    # menghasilkan state akhir yang sama persis
+    row_labels = results.data.row_labels
+    index_start = int(row_labels[start]) if isinstance(row_labels, pd.RangeIndex) else start
+
+    return {
+        'format': ARTIFACT_FORMAT,
+        'order': tuple(int(x) for x in model.order),
+        'trend': model.trend,
+        'enforce_stationarity': bool(model.enforce_stationarity),
+        'enforce_invertibility': bool(model.enforce_invertibility),
+        'param_names': list(results.param_names),
+        'params': np.asarray(results.params, dtype=float),
+        'state': np.asarray(results.predicted_state[:, start], dtype=float),
+        'state_cov': np.asarray(results.predicted_state_cov[:, :, start], dtype=float),
+        'index_start': index_start,
+        'endog_name': getattr(results.data.orig_endog, 'name', None) or 'energy',
+        'endog_tail': endog[start:],
+        'exog_names': [str(col) for col in getattr(results.data.orig_exog, 'columns', ['gdp'])],
+        'exog_tail': exog[start:],
+        'nobs': int(nobs),
+        'aic': float(results.aic),
+        'bic': float(results.bic),
+        'llf': float(results.llf),
+        'y_test': None if y_test is None else np.asarray(y_test, dtype=float),
+        'y_pred': None if y_pred is None else np.asarray(y_pred, dtype=float),
+        'test_years': None if test_years is None else np.asarray(test_years),
+        'metrics': metrics,
+        'order_search': order_search
+    }
+
+
+def save_model_artifact(path, results, y_test=None, y_pred=None, test_years=None, metrics=None, order_search=None):
+    """Simpan artifact ringkas ke file (pickle berisi dict NumPy array)"""
+    artifact = build_model_artifact(results, y_test, y_pred, test_years, metrics, order_search)
+    with open(path, 'wb') as f:
+        pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return artifact
+
+
+def is_model_artifact(obj):
+    return isinstance(obj, dict) and obj.get('format') == ARTIFACT_FORMAT
+
+
+class ForecastOnlyError(ValueError):
+    """Atribut butuh seluruh data training, sedangkan model dari artifact hanya menyimpan ekornya"""
+
+
+class ForecastOnlyResults(SARIMAXResults):
+    """
+    SARIMAXResults hasil rebuild_results: forecast/get_forecast identik dengan
+    model asli, statistik fit (aic, bic, llf, full_nobs) dari fit penuh
+    """
+    forecast_only = True
+    full_fit = None
+
+    def _full_fit_value(self, name):
+        return self.full_fit[name]
+
+    @property
+    def full_nobs(self):
+        return self._full_fit_value('nobs')
+
+    @property
+    def llf(self):
+        return self._full_fit_value('llf')
+
+    @property
+    def aic(self):
+        return self._full_fit_value('aic')
+
+    @property
+    def bic(self):
+        return self._full_fit_value('bic')
+
+    def _forecast_only(self, name):
+        raise ForecastOnlyError(
+            f"{name} tidak tersedia: model dari artifact ringkas hanya untuk forecast "
+            "(data training tidak disimpan)"
+        )
+
+    @property
+    def fittedvalues(self):
+        self._forecast_only('fittedvalues')
+
+    @property
+    def resid(self):
+        self._forecast_only('resid')
+
+    @property
+    def llf_obs(self):
+        self._forecast_only('llf_obs')
+
+
+def rebuild_results(artifact):
+    """
+    Bangun ulang model dari artifact ringkas sebagai ForecastOnlyResults
+    (forecast/get_forecast; aic, bic, llf, full_nobs dari fit penuh)
+    """
+    tail = len(artifact['endog_tail'])
+    index = pd.RangeIndex(artifact['index_start'], artifact['index_start'] + tail)
+
+    endog = pd.Series(artifact['endog_tail'], index=index, name=artifact['endog_name'])
+    exog = pd.DataFrame(artifact['exog_tail'], index=index, columns=artifact['exog_names'])
+
+    model = SARIMAX(
+        endog,
+        exog=exog,
+        order=artifact['order'],
+        trend=artifact['trend'],
+        enforce_stationarity=artifact['enforce_stationarity'],
+        enforce_invertibility=artifact['enforce_invertibility']
+    )
+    model.ssm.initialize_known(artifact['state'], artifact['state_cov'])
+
+    params = pd.Series(artifact['params'], index=artifact['param_names'])
+    results = model.filter(params, results_class=ForecastOnlyResults, results_wrapper_class=SARIMAXResultsWrapper)
+    results._results.full_fit = fit_stats(artifact)
+    return results
+
+
+def fit_stats(artifact):
+    """Statistik fit penuh (aic, bic, llf, nobs) yang disimpan di artifact"""
+    return {name: artifact[name] for name in ('aic', 'bic', 'llf', 'nobs')}
+
+
+def artifact_to_model_info(artifact):
+    """Ubah artifact menjadi dict model_info (format yang dipakai dashboard/prediksi)"""
+    model_info = {
+        'model': rebuild_results(artifact),
+        'order': artifact['order'],
+        'metrics': artifact.get('metrics'),
+        'fit_stats': fit_stats(artifact)
+    }
+    for key in ('y_test', 'y_pred', 'test_years', 'order_search'):
+        if artifact.get(key) is not None:
+            model_info[key] = artifact[key]
+    return model_info
@@ -0,0 +1,152 @@
+"""
+Registry model ARIMAX untuk seluruh proses
+
+Model di-load secara lazy berdasarkan training_history.id
+(models/arimax_model_{id}.pkl) atau ACTIVE_MODEL untuk file model aktif
+(models/arimax_model.pkl). Load dilindungi lock per model sehingga request
+paralel tidak unpickle file yang sama dua kali, dan cache memakai LRU
+dengan batas ukuran (byte) agar beberapa kandidat bisa tetap tersimpan.
+
+Cache tidak mengecek mtime file per request; pemanggil yang mengubah file
+model (activate_model, retrain_model) wajib memanggil invalidate().
+"""
+import os
+import pickle
+import threading
+from collections import OrderedDict
+import joblib
+from services.model_artifact import is_model_artifact, artifact_to_model_info
+
+MODEL_DIR = "models"
+ACTIVE_MODEL = "active"
+ACTIVE_MODEL_PATH = os.path.join(MODEL_DIR, "arimax_model.pkl")
+
+# Batas total ukuran model di cache (perkiraan dari ukuran file pickle)
+MODEL_CACHE_BYTE_BUDGET = 256 * 1024 * 1024
+
+# key -> {'model_info': dict, 'nbytes': int}
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+# key -> Lock, supaya satu file hanya di-unpickle sekali walau diminta paralel
+_load_locks = {}
+
+# key -> counter invalidasi, agar hasil load yang basi tidak masuk cache
+_generations = {}
+
+
+def get_model_path(model_id=ACTIVE_MODEL):
+    """Path file model untuk ID tertentu (atau file model aktif)"""
+    if model_id is None or model_id == ACTIVE_MODEL:
+        return ACTIVE_MODEL_PATH
+    return os.path.join(MODEL_DIR, f"arimax_model_{int(model_id)}.pkl")
+
+
+def _normalize_key(model_id):
+    if model_id is None or model_id == ACTIVE_MODEL:
+        return ACTIVE_MODEL
+    return int(model_id)
+
+
+def read_model_file(path):
+    """
+    Load file model, selalu kembalikan dict dengan key 'model'.
+    Mendukung artifact ringkas (model_artifact) maupun pickle SARIMAXResults lama.
+    """
+    try:
+        with open(path, 'rb') as f:
+            model_info = pickle.load(f)
+    except Exception:
+        model_info = joblib.load(path)
+
+    if is_model_artifact(model_info):
+        return artifact_to_model_info(model_info)
+    if isinstance(model_info, dict) and 'model' in model_info:
+        return model_info
+    return {'model': model_info}
+
+
+def _evict_over_budget():
+    """Buang entry paling lama dipakai sampai total ukuran <= budget (lock sudah dipegang)"""
+    total = sum(entry['nbytes'] for entry in _cache.values())
+    while total > MODEL_CACHE_BYTE_BUDGET and len(_cache) > 1:
+        key, entry = _cache.popitem(last=False)
+        total -= entry['nbytes']
+        print(f"✓ Model registry: evicted model {key} ({entry['nbytes']} bytes)")
+
+
+def get_model_info(model_id=ACTIVE_MODEL):
+    """
+    Ambil model_info (dict berisi 'model' dan data test jika ada) dari cache,
+    load dari disk jika belum ada.
+
+    Args:
+        model_id: training_history.id, atau ACTIVE_MODEL untuk model aktif
+
+    Returns:
+        dict model_info, atau None jika file model tidak ditemukan
+    """
+    key = _normalize_key(model_id)
+
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache.move_to_end(key)
+            return entry['model_info']
+        load_lock = _load_locks.setdefault(key, threading.Lock())
+
+    with load_lock:
+        # Cek lagi: mungkin sudah di-load thread lain selagi menunggu lock
+        with _cache_lock:
+            entry = _cache.get(key)
+            if entry is not None:
+                _cache.move_to_end(key)
+                return entry['model_info']
+            generation = _generations.get(key, 0)
+
+        path = get_model_path(key)
+        if not os.path.exists(path):
+            return None
+
+        model_info = read_model_file(path)
+        nbytes = os.path.getsize(path)
+
+        with _cache_lock:
+            # Jangan simpan jika file di-invalidate selama proses load
+            if _generations.get(key, 0) == generation:
+                _cache[key] = {'model_info': model_info, 'nbytes': nbytes}
+                _cache.move_to_end(key)
+                _evict_over_budget()
+
+        print(f"✓ Model registry: loaded model {key} from {path}")
+        return model_info
+
+
+def get_model(model_id=ACTIVE_MODEL):
+    """Ambil objek SARIMAXResults untuk model_id"""
+    model_info = get_model_info(model_id)
+    return model_info['model'] if model_info else None
+
+
+def invalidate(model_id=None):
+    """
+    Hapus model dari cache.
+
+    Args:
+        model_id: ID model yang di-invalidate; None untuk mengosongkan semua
+    """
+    with _cache_lock:
+        keys = list(_cache.keys()) if model_id is None else [_normalize_key(model_id)]
+        for key in keys:
+            _cache.pop(key, None)
+            _generations[key] = _generations.get(key, 0) + 1
+
+
+def get_cache_stats():
+    """Info isi cache (untuk debugging / monitoring)"""
+    with _cache_lock:
+        return {
+            'models': [str(key) for key in _cache.keys()],
+            'total_bytes': sum(entry['nbytes'] for entry in _cache.values()),
+            'byte_budget': MODEL_CACHE_BYTE_BUDGET
+        }
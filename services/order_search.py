@@ -0,0 +1,207 @@
+"""
+Pencarian order (p,d,q) ARIMAX secara paralel
+
+Setiap kandidat order di-fit sebagai SARIMAX di proses terpisah
+(ProcessPoolExecutor), sehingga grid kandidat selesai dalam waktu yang
+mendekati fit kandidat paling lambat, bukan jumlah semua fit.
+
+- Timeout per fit: optimizer dihentikan lewat callback jika fit melewati
+  batas waktu, kandidat tersebut dicatat sebagai 'timeout'.
+- Cache fit: hasil fit disimpan di services.fit_cache, kandidat yang
+  data/order/opsinya sama dengan run sebelumnya tidak di-fit ulang.
+- Pembatalan dini (opsional, default nonaktif): kandidat diurutkan dari yang
+  paling sederhana; jika `patience` hasil berturut-turut tidak memperbaiki
+  skor terbaik, kandidat yang belum mulai dijalankan dibatalkan. Ini
+  heuristik: kandidat yang dibatalkan bisa saja lebih baik, sehingga order
+  terpilih bisa berbeda dari pencarian grid penuh.
+"""
+import os
+import time
+import warnings
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from services.fit_cache import fit_sarimax, cached_forecast
+
+DEFAULT_FIT_TIMEOUT = 30  # detik per kandidat
+# Nilai patience yang disarankan jika pembatalan dini diaktifkan
+DEFAULT_PATIENCE = 20
+
+
+class FitTimeout(Exception):
+    pass
+
+
+def build_order_grid(d, max_p=5, max_q=10, start_p=0, start_q=0):
+    """Grid kandidat (p,d,q) untuk d tertentu, urut dari yang paling sederhana"""
+    candidates = [
+        (p, d, q)
+        for p in range(start_p, max_p + 1)
+        for q in range(start_q, max_q + 1)
+    ]
+    return sorted(candidates, key=lambda order: (order[0] + order[2], order))
+
+
+def fit_candidate(order, y_train, exog_train, y_test, exog_test, fit_timeout=DEFAULT_FIT_TIMEOUT, fit_kwargs=None):
+    """
+    Fit satu kandidat order dan evaluasi di data test.
+    Fungsi level-modul supaya bisa dikirim ke worker process.
+
+    Returns:
+        dict: order, status, AIC/BIC, metrics test, dan durasi fit
+    """
+    start = time.perf_counter()
+    deadline = time.monotonic() + fit_timeout if fit_timeout else None
+
+    def _check_deadline(*args):
+        if deadline is not None and time.monotonic() > deadline:
+            raise FitTimeout()
+
+    row = {
+        'order': tuple(order),
+        'p': order[0],
+        'd': order[1],
+        'q': order[2]
+    }
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            # Fit yang sama (data, order, opsi) diambil dari cache disk
+            result = fit_sarimax(y_train, exog_train, order, fit_kwargs=fit_kwargs, callback=_check_deadline)
+            row['cached'] = result.fit_cache_hit
+
+            row['aic'] = float(result.aic)
+            # Dipakai sebagai start_params saat fit ulang order terpilih
+            row['params'] = [float(value) for value in np.asarray(result.params)]
+            row['bic'] = float(result.bic)
+            row['converged'] = bool(result.mle_retvals.get('converged', True)) if result.mle_retvals else True
+
+            if y_test is not None and len(y_test) > 0:
+                y_true = np.asarray(y_test, dtype=float)
+                predictions = cached_forecast(result, len(y_true), exog_test)
+                row['mae'] = float(np.mean(np.abs(y_true - predictions)))
+                row['rmse'] = float(np.sqrt(np.mean((y_true - predictions) ** 2)))
+                row['mape'] = float(np.mean(np.abs((y_true - predictions) / y_true)) * 100)
+
+        row['status'] = 'success' if np.isfinite(row['aic']) else 'failed'
+    except FitTimeout:
+        row['status'] = 'timeout'
+    except Exception as e:
+        row['status'] = 'failed'
+        row['error'] = str(e)[:200]
+
+    row['fit_seconds'] = round(time.perf_counter() - start, 4)
+    return row
+
+
+def _score(row, criterion):
+    value = row.get(criterion)
+    if row.get('status') != 'success' or value is None or not np.isfinite(value):
+        return None
+    return value
+
+
+def rank_results(rows, criterion='aic'):
+    """Urutkan hasil: kandidat sukses berdasarkan criterion (kecil = baik), sisanya di akhir"""
+    ranked = sorted(
+        rows,
+        key=lambda row: (_score(row, criterion) is None, _score(row, criterion) or 0.0, row['p'] + row['q'])
+    )
+    for rank, row in enumerate(ranked, start=1):
+        row['rank'] = rank if _score(row, criterion) is not None else None
+    return ranked
+
+
+def search_orders(y_train, exog_train, candidates, y_test=None, exog_test=None,
+                  criterion='aic', max_workers=None, fit_timeout=DEFAULT_FIT_TIMEOUT,
+                  patience=None, fit_kwargs=None, progress_callback=None):
+    """
+    Fit semua kandidat order secara paralel dan kembalikan tabel peringkat.
+
+    Args:
+        y_train, exog_train: Data training
+        candidates: List order (p,d,q), sebaiknya urut dari paling sederhana
+        y_test, exog_test: Data test untuk MAPE/MAE/RMSE (opsional)
+        criterion: 'aic', 'bic', atau 'mape' (kecil = lebih baik)
+        max_workers: Jumlah proses (default: jumlah CPU)
+        fit_timeout: Batas waktu per fit dalam detik (None = tanpa batas)
+        patience: Batalkan kandidat yang belum jalan setelah sekian hasil
+            berturut-turut tidak memperbaiki skor terbaik (None = nonaktif,
+            semua kandidat di-fit). Heuristik: bisa mengubah order terpilih
+        fit_kwargs: Argumen tambahan untuk SARIMAX.fit
+        progress_callback: Fungsi (selesai, total, row) untuk laporan progress
+
+    Returns:
+        dict: {'best_order', 'criterion', 'results' (list terurut), 'cancelled', 'elapsed_seconds'}
+    """
+    if criterion == 'mape' and (y_test is None or len(y_test) == 0):
+        raise ValueError("criterion 'mape' membutuhkan data test")
+
+    start = time.perf_counter()
+    candidates = [tuple(order) for order in candidates]
+    workers = max_workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(candidates)))
+
+    rows = []
+    cancelled = []
+    best = None
+    since_improvement = 0
+
+    def _record(row):
+        nonlocal best, since_improvement
+        rows.append(row)
+        score = _score(row, criterion)
+        if score is not None and (best is None or score < best):
+            best = score
+            since_improvement = 0
+        else:
+            since_improvement += 1
+        if progress_callback:
+            progress_callback(len(rows), len(candidates), row)
+
+    def _should_stop():
+        return patience is not None and best is not None and since_improvement >= patience
+
+    if workers == 1:
+        for index, order in enumerate(candidates):
+            if _should_stop():
+                cancelled = candidates[index:]
+                break
+            _record(fit_candidate(order, y_train, exog_train, y_test, exog_test, fit_timeout, fit_kwargs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(fit_candidate, order, y_train, exog_train, y_test, exog_test, fit_timeout, fit_kwargs): order
+                for order in candidates
+            }
+            pending = set(futures)
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.cancelled():
+                        continue
+                    try:
+                        _record(future.result())
+                    except Exception as e:
+                        order = futures[future]
+                        _record({'order': order, 'p': order[0], 'd': order[1], 'q': order[2],
+                                 'status': 'failed', 'error': str(e)[:200]})
+
+                if _should_stop():
+                    for future in list(pending):
+                        # cancel() hanya berhasil untuk kandidat yang belum mulai
+                        if future.cancel():
+                            cancelled.append(futures[future])
+                            pending.discard(future)
+
+    ranked = rank_results(rows, criterion)
+    best_row = next((row for row in ranked if row.get('rank') == 1), None)
+
+    return {
+        'best_order': best_row['order'] if best_row else None,
+        'criterion': criterion,
+        'results': ranked,
+        'cancelled': sorted(cancelled),
+        'elapsed_seconds': round(time.perf_counter() - start, 4)
+    }
@@ -0,0 +1,193 @@
+"""
+Penyimpanan plot visualisasi training sebagai file PNG
+
+Plot tidak lagi disimpan sebagai base64 di tabel training_history, tetapi
+sebagai file biner models/plots/{model_id}/{nama_plot}.png dan disajikan
+lewat endpoint /api/model/<id>/plots/<nama_plot>.png (bisa di-cache browser
+karena plot satu model tidak pernah berubah).
+
+Training hanya menyimpan array sumber plot (plot_data.npz: data energi,
+indeks split, residual). PNG di-render saat pertama kali diminta lalu
+disimpan di disk, jadi matplotlib tidak lagi ada di jalur training.
+"""
+import base64
+import os
+import shutil
+import threading
+import numpy as np
+
+PLOT_DIR = os.path.join("models", "plots")
+
+# Cache-Control max-age untuk endpoint plot (detik); browser tetap bisa
+# revalidasi lewat ETag/Last-Modified setelahnya
+PLOT_CACHE_MAX_AGE = 24 * 3600
+
+PLOT_NAMES = (
+    'acf_plot',
+    'pacf_plot',
+    'preprocessing_plot',
+    'train_test_plot',
+    'residual_plot',
+    'residual_acf_plot',
+    'qq_plot'
+)
+
+PREPROCESSING_PLOTS = ('acf_plot', 'pacf_plot', 'preprocessing_plot', 'train_test_plot')
+RESIDUAL_PLOTS = ('residual_plot', 'residual_acf_plot', 'qq_plot')
+
+PLOT_DATA_FILE = "plot_data.npz"
+
+# pyplot tidak thread-safe, render satu per satu
+_render_lock = threading.Lock()
+
+
+def get_plot_path(model_id, plot_name):
+    if plot_name not in PLOT_NAMES:
+        raise ValueError(f"Plot tidak dikenal: {plot_name}")
+    return os.path.join(PLOT_DIR, str(int(model_id)), f"{plot_name}.png")
+
+
+def decode_plot(data):
+    """Ubah data URI / string base64 (output plot_to_base64) menjadi bytes PNG"""
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    if data.startswith('data:'):
+        data = data.split(',', 1)[1]
+    return base64.b64decode(data)
+
+
+def save_plot(model_id, plot_name, png_bytes):
+    """Tulis satu plot PNG (atomic: tulis ke file sementara lalu rename)"""
+    path = get_plot_path(model_id, plot_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(png_bytes)
+    os.replace(tmp_path, path)
+    return path
+
+
+def save_plots(model_id, viz_plots):
+    """
+    Simpan semua plot dari dict {nama_plot: base64} ke file PNG
+
+    Returns:
+        List nama plot yang tersimpan
+    """
+    saved = []
+    for plot_name in PLOT_NAMES:
+        data = (viz_plots or {}).get(plot_name)
+        if not data:
+            continue
+        try:
+            save_plot(model_id, plot_name, decode_plot(data))
+            saved.append(plot_name)
+        except Exception as e:
+            print(f"⚠ Warning: Could not save {plot_name} for model {model_id}: {e}")
+    return saved
+
+
+def get_plot_data_path(model_id):
+    return os.path.join(PLOT_DIR, str(int(model_id)), PLOT_DATA_FILE)
+
+
+def save_plot_data(model_id, plot_data):
+    """Simpan array sumber plot (hasil training) untuk render lazy"""
+    path = get_plot_data_path(model_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez_compressed(path, **{key: np.asarray(value) for key, value in plot_data.items()})
+    return path
+
+
+def load_plot_data(model_id):
+    path = get_plot_data_path(model_id)
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        return {key: data[key] for key in data.files}
+
+
+def _renderable_plots(plot_data):
+    if plot_data is None:
+        return ()
+    names = ()
+    if 'y_values' in plot_data:
+        names += PREPROCESSING_PLOTS
+    if 'residual_values' in plot_data:
+        names += RESIDUAL_PLOTS
+    return names
+
+
+def render_plots(plot_data, plot_names):
+    """
+    Render plot dari array sumber, per grup (preprocessing / residual)
+
+    Returns:
+        dict {nama_plot: base64 data URI}
+    """
+    import pandas as pd
+    from services.train_service import generate_preprocessing_plots, generate_residual_plots
+
+    plots = {}
+    if any(name in PREPROCESSING_PLOTS for name in plot_names):
+        y = pd.Series(plot_data['y_values'], index=plot_data['y_index'])
+        train_size = int(plot_data['train_size'])
+        plots.update(generate_preprocessing_plots(y, y.iloc[:train_size], y.iloc[train_size:], train_size))
+    if any(name in RESIDUAL_PLOTS for name in plot_names):
+        residuals = pd.Series(plot_data['residual_values'], index=plot_data['residual_index'])
+        plots.update(generate_residual_plots(residuals))
+    return plots
+
+
+def ensure_plots(model_id, plot_names=PLOT_NAMES):
+    """Render dan simpan plot yang belum ada di disk (jika array sumbernya tersedia)"""
+    missing = [name for name in plot_names if not os.path.exists(get_plot_path(model_id, name))]
+    if not missing:
+        return []
+
+    with _render_lock:
+        # Cek lagi: mungkin sudah di-render request lain selagi menunggu lock
+        missing = [name for name in missing if not os.path.exists(get_plot_path(model_id, name))]
+        plot_data = load_plot_data(model_id)
+        missing = [name for name in missing if name in _renderable_plots(plot_data)]
+        if not missing:
+            return []
+        plots = render_plots(plot_data, missing)
+        return save_plots(model_id, {name: plots.get(name) for name in missing})
+
+
+def get_plot_file(model_id, plot_name):
+    """Path PNG plot, di-render dulu jika belum ada. None jika tidak tersedia"""
+    path = get_plot_path(model_id, plot_name)
+    if not os.path.exists(path):
+        # Satu grup di-render sekaligus (halaman detail memuat semuanya)
+        group = PREPROCESSING_PLOTS if plot_name in PREPROCESSING_PLOTS else RESIDUAL_PLOTS
+        ensure_plots(model_id, group)
+    return path if os.path.exists(path) else None
+
+
+def prerender_plots_async(model_id):
+    """Render semua plot model di background thread (misal untuk model aktif)"""
+    def _run():
+        try:
+            ensure_plots(model_id)
+        except Exception as e:
+            print(f"⚠ Warning: Could not pre-render plots for model {model_id}: {e}")
+
+    thread = threading.Thread(target=_run, name=f"plots-{model_id}", daemon=True)
+    thread.start()
+    return thread
+
+
+def plot_urls(model_id):
+    """Dict {nama_plot: url} untuk plot yang ada di disk atau bisa di-render"""
+    renderable = _renderable_plots(load_plot_data(model_id))
+    return {
+        plot_name: f"/api/model/{int(model_id)}/plots/{plot_name}.png"
+        for plot_name in PLOT_NAMES
+        if plot_name in renderable or os.path.exists(get_plot_path(model_id, plot_name))
+    }
+
+
+def delete_plots(model_id):
+    shutil.rmtree(os.path.join(PLOT_DIR, str(int(model_id))), ignore_errors=True)
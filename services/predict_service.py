@@ -1,60 +1,45 @@
-from pyexpat import model
-import joblib
+import numpy as np
 import pandas as pd
 import os
-import pickle
+import json
+from services import model_registry
 
-MODEL_PATH = "models/arimax_model.pkl"
+MODEL_PATH = model_registry.ACTIVE_MODEL_PATH
+FORECAST_TABLE_PATH = "models/forecast_table.json"
 
-# Cache untuk menghindari reload berulang dalam satu request
-_model_cache = {
-    'model': None,
-    'mtime': None
-}
-
-def predict_energy_service(scenario, years, baseline=None):
+SCENARIOS = ["optimis", "moderat", "pesimistis"]
+MAX_FORECAST_YEARS = 10
 
-    current_mtime = os.path.getmtime(MODEL_PATH) if os.path.exists(MODEL_PATH) else None
-    
-    if _model_cache['model'] is None or _model_cache['mtime'] != current_mtime:
-        try:
-            with open(MODEL_PATH, 'rb') as f:
-                model_info = pickle.load(f)
-                if isinstance(model_info, dict) and 'model' in model_info:
-                    model = model_info['model']
-                else:
-                    model = model_info
-        except:
-            model = joblib.load(MODEL_PATH)
-
-        _model_cache['model'] = model
-        _model_cache['mtime'] = current_mtime
-        print(f"✓ Model loaded/reloaded from {MODEL_PATH}")
-    else:
-        model = _model_cache['model']
-        print("✓ Using cached model")
-
-    # Ambil GDP terakhir dari data training
-    last_gdp = model.data.orig_exog['gdp'].iloc[-1]
+# Cache tabel forecast (hasil precompute saat aktivasi / training)
+_table_cache = {
+    'table': None,
+    'loaded': False
+}
 
-    # =========================
-    # Growth Logic (FIXED)
-    # =========================
+def _resolve_growth(scenario, baseline=None):
+    """Tentukan growth GDP berdasarkan skenario dan baseline"""
     if baseline is None:
         # fallback default
         if scenario == "optimis":
-            growth = 0.06
+            return 0.06
         elif scenario == "moderat":
-            growth = 0.05
+            return 0.05
         else:
-            growth = 0.03
+            return 0.03
     else:
         if scenario == "optimis":
-            growth = baseline + 0.02
+            return baseline + 0.02
         elif scenario == "moderat":
-            growth = baseline
+            return baseline
         else:
-            growth = baseline - 0.02
+            return baseline - 0.02
+
+def _forecast_from_model(model, scenario, years, baseline=None):
+    """Jalankan forecast state-space SARIMAX untuk satu skenario"""
+    # Ambil GDP terakhir dari data training
+    last_gdp = model.data.orig_exog['gdp'].iloc[-1]
+
+    growth = _resolve_growth(scenario, baseline)
 
     # Generate future GDP
     future_gdp = []
@@ -70,7 +55,7 @@ def predict_energy_service(scenario, years, baseline=None):
     forecast = forecast_result.predicted_mean
     confidence_intervals = forecast_result.conf_int(alpha=0.05)
     last_actual_year = model.data.row_labels[-1]
-    last_actual_value = model.data.orig_endog.iloc[-1]  
+    last_actual_value = model.data.orig_endog.iloc[-1]
 
     return {
         'predictions': forecast.round(2).tolist(),
@@ -80,3 +65,205 @@ def predict_energy_service(scenario, years, baseline=None):
         "last_actual_year": int(last_actual_year),
         "last_actual_value": round(float(last_actual_value), 2)
     }
+
+def _exog_coefficients(model):
+    """
+    Koefisien regresi exog jika forecast mean linear terhadap exog
+    (regresi di persamaan observasi, bukan di state); None jika tidak.
+    """
+    sarimax = model.model
+    if not getattr(sarimax, 'mle_regression', False) or getattr(sarimax, 'k_exog', 0) == 0:
+        return None
+    return np.asarray(model.params[sarimax.exog_names], dtype=float)
+
+def forecast_scenarios(model, growth_rates, years):
+    """
+    Forecast beberapa skenario growth GDP sekaligus
+
+    Jalur GDP semua skenario dibuat dengan NumPy (last_gdp * cumprod(1+g)).
+    Forecast mean ARIMAX linear terhadap exog dan varians forecast tidak
+    bergantung pada exog, jadi cukup satu get_forecast untuk skenario
+    pertama; skenario lain = mean referensi + beta * (gdp - gdp_referensi)
+    dengan lebar interval konfidensi yang sama.
+
+    Args:
+        model: SARIMAXResults
+        growth_rates: List growth GDP per tahun (misal [0.06, 0.05, 0.03])
+        years: Horizon forecast
+
+    Returns:
+        List dict (satu per growth) dengan format yang sama seperti
+        _forecast_from_model
+    """
+    growth_rates = np.asarray(growth_rates, dtype=float)
+    last_gdp = float(model.data.orig_exog['gdp'].iloc[-1])
+    gdp_paths = last_gdp * np.cumprod(1 + np.repeat(growth_rates[:, None], years, axis=1), axis=1)
+
+    forecast_result = model.get_forecast(steps=years, exog=pd.DataFrame({"gdp": gdp_paths[0]}))
+    reference_mean = np.asarray(forecast_result.predicted_mean, dtype=float)
+    confidence_intervals = np.asarray(forecast_result.conf_int(alpha=0.05), dtype=float)
+    lower_width = reference_mean - confidence_intervals[:, 0]
+    upper_width = confidence_intervals[:, 1] - reference_mean
+
+    beta = _exog_coefficients(model)
+    if beta is not None:
+        means = reference_mean + beta[0] * (gdp_paths - gdp_paths[0])
+    else:
+        # Regresi time-varying / di state: forecast tiap skenario terpisah
+        means = np.vstack([reference_mean] + [
+            np.asarray(model.get_forecast(steps=years, exog=pd.DataFrame({"gdp": path})).predicted_mean)
+            for path in gdp_paths[1:]
+        ])
+
+    last_actual_year = int(model.data.row_labels[-1])
+    last_actual_value = round(float(model.data.orig_endog.iloc[-1]), 2)
+
+    return [
+        {
+            'predictions': np.round(mean, 2).tolist(),
+            'lower_bounds': np.round(mean - lower_width, 2).tolist(),
+            'upper_bounds': np.round(mean + upper_width, 2).tolist(),
+            'growth_used': round(float(growth) * 100, 2),
+            "last_actual_year": last_actual_year,
+            "last_actual_value": last_actual_value
+        }
+        for growth, mean in zip(growth_rates, means)
+    ]
+
+def predict_batch_service(scenarios=None, growth_rates=None, years=(3,), baseline=None):
+    """
+    Forecast banyak skenario dan horizon dalam satu panggilan
+
+    Args:
+        scenarios: List nama skenario (default: semua SCENARIOS jika
+            growth_rates tidak diberikan)
+        growth_rates: List growth GDP custom (opsional, ditambahkan setelah scenarios)
+        years: List horizon (tahun); forecast dihitung sekali untuk horizon
+            terpanjang lalu dipotong
+        baseline: Baseline growth untuk skenario bernama (opsional)
+
+    Returns:
+        List dict per (skenario, horizon)
+    """
+    if scenarios is None and not growth_rates:
+        scenarios = SCENARIOS
+    scenarios = list(scenarios or [])
+    growth_rates = list(growth_rates or [])
+    horizons = sorted(set(int(y) for y in years))
+    max_years = horizons[-1]
+
+    if not scenarios and not growth_rates:
+        raise ValueError("Minimal satu skenario atau growth rate harus diberikan")
+
+    labels = scenarios + [f"growth_{round(g * 100, 2)}" for g in growth_rates]
+    rates = [_resolve_growth(scenario, baseline) for scenario in scenarios] + growth_rates
+
+    model = model_registry.get_model(model_registry.ACTIVE_MODEL)
+    forecasts = forecast_scenarios(model, rates, max_years)
+
+    results = []
+    for label, forecast in zip(labels, forecasts):
+        for horizon in horizons:
+            results.append({
+                'scenario': label,
+                'years': horizon,
+                'predictions': forecast['predictions'][:horizon],
+                'lower_bounds': forecast['lower_bounds'][:horizon],
+                'upper_bounds': forecast['upper_bounds'][:horizon],
+                'growth_used': forecast['growth_used'],
+                "last_actual_year": forecast['last_actual_year'],
+                "last_actual_value": forecast['last_actual_value']
+            })
+    return results
+
+def build_forecast_table(model_path=MODEL_PATH, table_path=FORECAST_TABLE_PATH):
+    """
+    Precompute forecast untuk semua skenario (optimis/moderat/pesimistis)
+    dengan growth baseline default, horizon 1..MAX_FORECAST_YEARS.
+
+    Forecast h tahun = h elemen pertama dari forecast MAX_FORECAST_YEARS tahun
+    (jalur GDP dan interval konfidensi identik), jadi cukup simpan satu
+    forecast penuh per skenario dan potong saat request.
+
+    Returns:
+        dict: Tabel forecast yang juga disimpan ke table_path (JSON)
+    """
+    if model_path == MODEL_PATH:
+        # File model aktif baru saja berubah -> load ulang lewat registry
+        model_registry.invalidate(model_registry.ACTIVE_MODEL)
+        model = model_registry.get_model(model_registry.ACTIVE_MODEL)
+    else:
+        model = model_registry.read_model_file(model_path)['model']
+
+    table = {
+        'model_mtime': os.path.getmtime(model_path),
+        'max_years': MAX_FORECAST_YEARS,
+        'baseline': None,  # None = growth default (6% / 5% / 3%)
+        'scenarios': {}
+    }
+
+    rates = [_resolve_growth(scenario) for scenario in SCENARIOS]
+    for scenario, forecast in zip(SCENARIOS, forecast_scenarios(model, rates, MAX_FORECAST_YEARS)):
+        table['scenarios'][scenario] = forecast
+
+    os.makedirs(os.path.dirname(table_path), exist_ok=True)
+    with open(table_path, 'w') as f:
+        json.dump(table, f)
+
+    if table_path == FORECAST_TABLE_PATH:
+        _table_cache['table'] = table
+        _table_cache['loaded'] = True
+
+    print(f"✓ Forecast table built: {len(SCENARIOS)} skenario x {MAX_FORECAST_YEARS} tahun -> {table_path}")
+    return table
+
+def _get_forecast_table():
+    """
+    Ambil tabel forecast aktif, None jika belum ada atau tidak cocok dengan
+    file model. File hanya dibaca sekali; build_forecast_table() memperbarui
+    cache secara eksplisit.
+    """
+    if not _table_cache['loaded']:
+        table = None
+        if os.path.exists(FORECAST_TABLE_PATH):
+            try:
+                with open(FORECAST_TABLE_PATH, 'r') as f:
+                    table = json.load(f)
+            except Exception as e:
+                print(f"⚠ Warning: Could not load forecast table: {e}")
+
+        # Tabel harus dibuat dari file model yang sedang dipakai
+        model_mtime = os.path.getmtime(MODEL_PATH) if os.path.exists(MODEL_PATH) else None
+        if table and table.get('model_mtime') != model_mtime:
+            table = None
+
+        _table_cache['table'] = table
+        _table_cache['loaded'] = True
+
+    return _table_cache['table']
+
+def invalidate_cache():
+    """Reset cache model aktif dan tabel forecast (dipanggil saat file model berubah)"""
+    model_registry.invalidate(model_registry.ACTIVE_MODEL)
+    _table_cache['table'] = None
+    _table_cache['loaded'] = False
+
+def predict_energy_service(scenario, years, baseline=None):
+
+    # Fast path: ambil dari tabel precompute (tanpa get_forecast)
+    if baseline is None and 1 <= years <= MAX_FORECAST_YEARS:
+        table = _get_forecast_table()
+        if table and scenario in table['scenarios']:
+            entry = table['scenarios'][scenario]
+            return {
+                'predictions': entry['predictions'][:years],
+                'lower_bounds': entry['lower_bounds'][:years],
+                'upper_bounds': entry['upper_bounds'][:years],
+                'growth_used': entry['growth_used'],
+                "last_actual_year": entry['last_actual_year'],
+                "last_actual_value": entry['last_actual_value']
+            }
+
+    # Baseline custom (atau tabel belum tersedia) -> hitung dengan statsmodels
+    model = model_registry.get_model(model_registry.ACTIVE_MODEL)
+    return _forecast_from_model(model, scenario, years, baseline)
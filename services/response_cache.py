@@ -0,0 +1,166 @@
+"""
+Cache respons HTTP (ETag / 304) untuk endpoint dashboard yang read-only
+
+Data energi, GDP dan model hanya berubah setelah fetch/upload, training,
+aktivasi atau hapus model. Data version dibangun dari state persisten
+(versi data store, file model aktif, model aktif & counter riwayat di
+database, tanggal hari ini), sehingga ETag = versi data + URL request
+konsisten antar worker dan setelah restart:
+
+- If-None-Match sama dengan ETag sekarang -> 304 tanpa memanggil view
+  (tanpa query database maupun serialisasi JSON)
+- Body JSON yang sudah pernah dibuat untuk versi ini disajikan dari memori
+  (LRU dengan batas total ukuran body)
+
+Versi disimpan di memori maksimal DATA_VERSION_TTL detik sebagai cache di
+depan state persisten; bump_data_version() membuangnya langsung di proses
+yang melakukan perubahan, proses lain melihat versi baru setelah TTL.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import date
+from collections import OrderedDict
+from functools import wraps
+
+# Batas total ukuran body yang disimpan di memori (bytes)
+RESPONSE_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
+# Umur versi data di memori (detik) sebelum state persisten dibaca ulang
+DATA_VERSION_TTL = 2.0
+
+_version_cache = {'version': None, 'expires': 0.0}
+_version_lock = threading.Lock()
+
+_cache = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+
+
+def _persistent_state():
+    """Nilai-nilai state persisten yang menentukan isi respons dashboard"""
+    from services import data_store
+    from services import model_registry
+    from services.database_service import get_state_fingerprint
+
+    store_info = data_store.get_store_info()
+    try:
+        stat = os.stat(model_registry.ACTIVE_MODEL_PATH)
+        model_file = [stat.st_mtime_ns, stat.st_size]
+    except OSError:
+        model_file = None
+    return {
+        'store': store_info['version'] if store_info else None,
+        'model_file': model_file,
+        'database': get_state_fingerprint(),
+        # Ringkasan riwayat menghitung aktivitas "hari ini"
+        'date': date.today().isoformat()
+    }
+
+
+def get_data_version():
+    """Versi data (hash state persisten), di-cache DATA_VERSION_TTL detik"""
+    with _version_lock:
+        if _version_cache['version'] is not None and time.monotonic() < _version_cache['expires']:
+            return _version_cache['version']
+
+    state = json.dumps(_persistent_state(), sort_keys=True, default=str)
+    version = hashlib.sha1(state.encode('utf-8')).hexdigest()[:16]
+    with _version_lock:
+        if _version_cache['version'] != version:
+            clear_cache()
+        _version_cache['version'] = version
+        _version_cache['expires'] = time.monotonic() + DATA_VERSION_TTL
+    return version
+
+
+def bump_data_version():
+    """Tandai data/model berubah: versi dibaca ulang dari state persisten, body di cache dibuang"""
+    with _version_lock:
+        _version_cache['version'] = None
+        _version_cache['expires'] = 0.0
+    clear_cache()
+
+
+def clear_cache():
+    global _cache_bytes
+    with _cache_lock:
+        _cache.clear()
+        _cache_bytes = 0
+
+
+def _store(key, body, mimetype):
+    global _cache_bytes
+    size = len(body)
+    if size > RESPONSE_CACHE_MAX_BYTES:
+        return
+    with _cache_lock:
+        if key in _cache:
+            _cache_bytes -= len(_cache.pop(key)[0])
+        _cache[key] = (body, mimetype)
+        _cache_bytes += size
+        while _cache_bytes > RESPONSE_CACHE_MAX_BYTES:
+            _, (old_body, _) = _cache.popitem(last=False)
+            _cache_bytes -= len(old_body)
+
+
+def _lookup(key):
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache.move_to_end(key)
+        return entry
+
+
+def get_cache_stats():
+    with _cache_lock:
+        return {
+            'data_version': _version_cache['version'],
+            'entries': len(_cache),
+            'bytes': _cache_bytes,
+            'max_bytes': RESPONSE_CACHE_MAX_BYTES
+        }
+
+
+def cached_response(view):
+    """
+    Decorator view Flask: ETag berdasarkan data version + path + query string
+
+    Hanya respons 200 JSON yang disimpan; respons error tetap dibuat ulang
+    setiap request. Pasang di bawah decorator @route.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        from flask import request, make_response
+
+        version = get_data_version()
+        request_key = f"{request.path}?{request.query_string.decode('latin-1')}"
+        etag = f"v{version}-{hashlib.sha1(request_key.encode('utf-8')).hexdigest()[:12]}"
+        key = (request_key, version)
+
+        if etag in request.if_none_match:
+            response = make_response('', 304)
+        else:
+            entry = _lookup(key)
+            if entry is not None:
+                body, mimetype = entry
+                response = make_response(body, 200)
+                response.mimetype = mimetype
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                if response.is_json:
+                    # Versi berubah selama view berjalan: body mungkin data lama
+                    if get_data_version() != version:
+                        return response
+                    _store(key, response.get_data(), response.mimetype)
+
+        response.set_etag(etag)
+        # Browser selalu revalidasi (murah: 304) supaya data baru langsung terlihat
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    return wrapper
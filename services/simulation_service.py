@@ -0,0 +1,186 @@
+"""
+Simulasi Monte Carlo (fan chart) untuk ketidakpastian GDP
+
+Skenario biasa memakai growth GDP tetap, sehingga interval konfidensi hanya
+mencerminkan ketidakpastian model. Di sini ribuan jalur growth GDP
+di-bootstrap dari growth historis, lalu digabung dengan simulasi
+state-space SARIMAX:
+
+- Satu panggilan SARIMAXResults.simulate(repetitions=n_paths) dengan jalur
+  GDP referensi menghasilkan noise model (state + observasi) semua jalur.
+- Forecast ARIMAX linear terhadap exog, jadi pengaruh jalur GDP tiap
+  simulasi cukup ditambahkan: beta * (gdp_jalur - gdp_referensi).
+
+Hasil berupa persentil per tahun forecast, di-cache per
+(model, seed, n_paths, years, data growth).
+"""
+import hashlib
+import inspect
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+from services import model_registry
+from services import data_store
+from services.predict_service import _exog_coefficients
+
+DEFAULT_N_PATHS = 10000
+DEFAULT_SEED = 42
+MAX_N_PATHS = 50000
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+# Jumlah hasil simulasi yang disimpan di cache (LRU)
+SIMULATION_CACHE_SIZE = 32
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def historical_growth_rates(gdp_values):
+    """Growth GDP tahunan (desimal) dari deret nilai GDP yang urut per tahun"""
+    values = np.asarray(gdp_values, dtype=float)
+    prev, curr = values[:-1], values[1:]
+    valid = prev != 0
+    return (curr[valid] - prev[valid]) / prev[valid]
+
+
+def load_gdp_history():
+    """
+    Deret GDP historis (year, gdp) urut per tahun: dari database,
+    fallback ke data store lokal
+    """
+    from services.data_mysql_service import get_gdp_from_db
+
+    data = get_gdp_from_db()
+    if data:
+        df = pd.DataFrame(data)[['year', 'gdp']]
+    else:
+        df = data_store.get_gdp_series()
+        if df is None:
+            return None
+
+    df['gdp'] = pd.to_numeric(df['gdp'], errors='coerce')
+    return df.dropna().drop_duplicates(subset=['year']).sort_values('year')
+
+
+def _simulate_model_noise(model, years, n_paths, exog, seed):
+    """Simulasi state-space semua jalur sekaligus, shape (years, n_paths)"""
+    rng = np.random.default_rng(seed)
+    # statsmodels 0.14 memakai random_state, versi baru memakai rng
+    seed_kwarg = 'rng' if 'rng' in inspect.signature(model.simulate).parameters else 'random_state'
+    simulated = model.simulate(
+        nsimulations=years,
+        repetitions=n_paths,
+        anchor='end',
+        exog=exog,
+        **{seed_kwarg: rng}
+    )
+    return np.asarray(simulated, dtype=float).reshape(years, n_paths), rng
+
+
+def _model_start_year(model_info):
+    """
+    Tahun pertama forecast = tahun setelah observasi terakhir model (simulasi
+    berangkat dari state & GDP terakhir model, bukan dari histori GDP yang
+    bisa lebih baru). Fallback ke tahun terakhir data energi-GDP selaras.
+    """
+    test_years = model_info.get('test_years')
+    if test_years is not None and len(test_years):
+        return int(np.asarray(test_years)[-1]) + 1
+    aligned = data_store.get_aligned_data()
+    if aligned is not None and not aligned.empty:
+        return int(aligned['year'].iloc[-1]) + 1
+    return None
+
+
+def simulate_fan_chart(n_paths=DEFAULT_N_PATHS, years=10, seed=DEFAULT_SEED, model_id=model_registry.ACTIVE_MODEL,
+                       growth_rates=None):
+    """
+    Fan chart forecast energi dengan jalur GDP hasil bootstrap
+
+    Args:
+        n_paths: Jumlah jalur simulasi
+        years: Horizon forecast
+        seed: Seed random (hasil reproducible & bisa di-cache)
+        model_id: training_history.id atau ACTIVE_MODEL
+        growth_rates: Growth historis (desimal); default dihitung dari data GDP
+
+    Returns:
+        dict: percentiles {p: [nilai per tahun]}, mean, statistik growth GDP
+    """
+    history = None
+    if growth_rates is None:
+        history = load_gdp_history()
+        if history is None or len(history) < 2:
+            raise ValueError("Data GDP tidak cukup untuk bootstrap growth")
+        growth_rates = historical_growth_rates(history['gdp'].values)
+    growth_rates = np.asarray(growth_rates, dtype=float)
+    if len(growth_rates) == 0:
+        raise ValueError("Tidak ada growth rate yang valid")
+
+    model_path = model_registry.get_model_path(model_id)
+    model_version = os.path.getmtime(model_path) if os.path.exists(model_path) else None
+    key = (
+        str(model_id), model_version, int(seed), int(n_paths), int(years),
+        hashlib.sha1(growth_rates.tobytes()).hexdigest()
+    )
+
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    model_info = model_registry.get_model_info(model_id)
+    if model_info is None:
+        raise ValueError("Model tidak ditemukan")
+    model = model_info['model']
+
+    beta = _exog_coefficients(model)
+    if beta is None:
+        raise ValueError("Simulasi fan chart membutuhkan regresi exog di persamaan observasi")
+
+    # Jalur GDP referensi (growth median) untuk simulasi state-space
+    last_gdp = float(model.data.orig_exog['gdp'].iloc[-1])
+    reference_gdp = last_gdp * np.cumprod(np.full(years, 1 + np.median(growth_rates)))
+    noise_paths, rng = _simulate_model_noise(
+        model, years, n_paths, pd.DataFrame({"gdp": reference_gdp}), seed
+    )
+
+    # Bootstrap growth GDP: (n_paths, years) -> jalur GDP kumulatif
+    sampled_growth = growth_rates[rng.integers(0, len(growth_rates), size=(n_paths, years))]
+    gdp_paths = last_gdp * np.cumprod(1 + sampled_growth, axis=1)
+
+    energy_paths = noise_paths.T + beta[0] * (gdp_paths - reference_gdp)
+
+    percentiles = np.percentile(energy_paths, PERCENTILES, axis=0)
+    gdp_percentiles = np.percentile(gdp_paths, PERCENTILES, axis=0)
+
+    start_year = _model_start_year(model_info)
+    result = {
+        'n_paths': int(n_paths),
+        'years': int(years),
+        'seed': int(seed),
+        'model_id': str(model_id),
+        'start_year': start_year,
+        'forecast_years': list(range(start_year, start_year + years)) if start_year else list(range(1, years + 1)),
+        'mean': np.round(energy_paths.mean(axis=0), 2).tolist(),
+        'percentiles': {str(p): np.round(values, 2).tolist() for p, values in zip(PERCENTILES, percentiles)},
+        'gdp_percentiles': {str(p): np.round(values, 2).tolist() for p, values in zip(PERCENTILES, gdp_percentiles)},
+        'growth_stats': {
+            'n_observations': int(len(growth_rates)),
+            'mean': round(float(np.mean(growth_rates)) * 100, 2),
+            'std': round(float(np.std(growth_rates)) * 100, 2),
+            'min': round(float(np.min(growth_rates)) * 100, 2),
+            'max': round(float(np.max(growth_rates)) * 100, 2)
+        }
+    }
+
+    with _cache_lock:
+        _cache[key] = result
+        _cache.move_to_end(key)
+        while len(_cache) > SIMULATION_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    return result
@@ -0,0 +1,236 @@
+"""
+Analisis stasioneritas & differencing (ADF + KPSS) dengan memoization
+
+Sebelumnya retrain_model menjalankan ADF & KPSS di setiap training, dan
+show_differencing_process.py / manual_pdq_identification.identify_d
+mengulang np.diff + kedua uji untuk setiap order differencing. Di sini:
+
+- Semua level differencing 0..max_d dihitung sekali (tiap level diturunkan
+  dari level sebelumnya, bukan dari data asli)
+- ADF & KPSS per level dijalankan paralel (thread pool) jika levelnya > 1
+  dan CPU > 1
+- Hasil di-memoize per hash isi data + opsi uji, di memori (LRU) dan di
+  data/cache/stationarity/ sehingga retrain, halaman admin dan script
+  metodologi berbagi satu perhitungan. Training ulang pada data yang sama
+  tidak menjalankan uji sama sekali.
+"""
+import hashlib
+import json
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import statsmodels
+from statsmodels.tsa.stattools import adfuller, kpss
+
+STATIONARITY_CACHE_DIR = os.path.join("data", "cache", "stationarity")
+
+# Naikkan jika format hasil berubah (file cache lama otomatis tidak terpakai)
+STATIONARITY_CACHE_VERSION = 1
+
+DEFAULT_MAX_D = 2
+DEFAULT_ALPHA = 0.05
+# Regresi KPSS: 'ct' (trend) seperti retrain_model, 'c' seperti script differencing
+DEFAULT_KPSS_REGRESSION = 'ct'
+
+# Jumlah hasil yang disimpan di memori (LRU)
+STATIONARITY_CACHE_SIZE = 64
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_stats = {'hits': 0, 'disk_hits': 0, 'misses': 0}
+
+
+def configure_cache(cache_dir=None):
+    """Ubah direktori cache di disk (misal untuk benchmark)"""
+    global STATIONARITY_CACHE_DIR
+    if cache_dir is not None:
+        STATIONARITY_CACHE_DIR = cache_dir
+    clear_memory_cache()
+
+
+def get_cache_stats():
+    return dict(_stats)
+
+
+def clear_memory_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def _key(kind, values, options):
+    digest = hashlib.sha1(json.dumps({
+        'kind': kind,
+        'version': STATIONARITY_CACHE_VERSION,
+        'statsmodels': statsmodels.__version__,
+        'options': options
+    }, sort_keys=True).encode('utf-8'))
+    digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+def _memoized(key, compute):
+    """Ambil hasil dari memori / disk, atau hitung lalu simpan ke keduanya"""
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            _stats['hits'] += 1
+            return _cache[key]
+
+    path = os.path.join(STATIONARITY_CACHE_DIR, f"{key}.json")
+    result = None
+    if os.path.exists(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                result = json.load(f)
+            _stats['disk_hits'] += 1
+        except (OSError, ValueError) as e:
+            print(f"⚠ Warning: Cache stasioneritas tidak bisa dibaca: {e}")
+
+    if result is None:
+        _stats['misses'] += 1
+        result = compute()
+        try:
+            os.makedirs(STATIONARITY_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠ Warning: Cache stasioneritas tidak bisa ditulis: {e}")
+
+    with _cache_lock:
+        _cache[key] = result
+        _cache.move_to_end(key)
+        while len(_cache) > STATIONARITY_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def difference_levels(values, max_d=DEFAULT_MAX_D):
+    """Deret hasil differencing d=0..max_d (level d diturunkan dari level d-1)"""
+    levels = [np.asarray(values, dtype=float)]
+    for _ in range(int(max_d)):
+        levels.append(np.diff(levels[-1]))
+    return levels
+
+
+def _adf(values, alpha):
+    adf_result = adfuller(values, autolag='AIC')
+    result = {
+        'test_statistic': float(adf_result[0]),
+        'p_value': float(adf_result[1]),
+        'critical_values': {k: float(v) for k, v in adf_result[4].items()},
+        'used_lag': int(adf_result[2]),
+        'n_obs': int(adf_result[3]),
+        'is_stationary': bool(adf_result[1] < alpha)  # p-value < alpha = reject H0 = stasioner
+    }
+    if result['is_stationary']:
+        result['interpretation'] = f"✓ Stasioner (p-value={adf_result[1]:.4f} < {alpha})"
+    else:
+        result['interpretation'] = f"✗ Tidak Stasioner (p-value={adf_result[1]:.4f} ≥ {alpha})"
+    return result
+
+
+def _kpss(values, regression, alpha):
+    kpss_result = kpss(values, regression=regression, nlags='auto')
+    result = {
+        'test_statistic': float(kpss_result[0]),
+        'p_value': float(kpss_result[1]),
+        'critical_values': {k: float(v) for k, v in kpss_result[3].items()},
+        'used_lag': int(kpss_result[2]),
+        'is_stationary': bool(kpss_result[1] > alpha)  # p-value > alpha = fail to reject H0 = stasioner
+    }
+    if result['is_stationary']:
+        result['interpretation'] = f"✓ Stasioner (p-value={kpss_result[1]:.4f} > {alpha})"
+    else:
+        result['interpretation'] = f"✗ Tidak Stasioner (p-value={kpss_result[1]:.4f} ≤ {alpha})"
+    return result
+
+
+def _test_level(d, values, kpss_regression, alpha):
+    """ADF & KPSS untuk satu level differencing (format sama dengan test_stationarity lama)"""
+    level = {'d': int(d), 'n_obs': int(len(values)), 'adf': {}, 'kpss': {}, 'conclusion': ''}
+    with warnings.catch_warnings():
+        # InterpolationWarning KPSS: p-value di luar tabel (dibatasi 0.01 / 0.1)
+        warnings.simplefilter('ignore')
+        try:
+            level['adf'] = _adf(values, alpha)
+        except Exception as e:
+            print(f"⚠ Warning: ADF test failed (d={d}): {e}")
+            level['adf'] = {'error': str(e)}
+        try:
+            level['kpss'] = _kpss(values, kpss_regression, alpha)
+        except Exception as e:
+            print(f"⚠ Warning: KPSS test failed (d={d}): {e}")
+            level['kpss'] = {'error': str(e)}
+
+    if level['adf'].get('is_stationary') and level['kpss'].get('is_stationary'):
+        level['conclusion'] = "STASIONER (ADF & KPSS setuju)"
+    elif not level['adf'].get('is_stationary') and not level['kpss'].get('is_stationary'):
+        level['conclusion'] = "TIDAK STASIONER (ADF & KPSS setuju) - Perlu differencing"
+    else:
+        level['conclusion'] = "HASIL BERBEDA (Perlu analisis lebih lanjut)"
+    return level
+
+
+def _first_level(levels, test):
+    for level in levels:
+        if all(level[name].get('is_stationary') for name in test):
+            return level['d']
+    return None
+
+
+def analyze_stationarity(values, max_d=DEFAULT_MAX_D, kpss_regression=DEFAULT_KPSS_REGRESSION,
+                         alpha=DEFAULT_ALPHA, max_workers=None):
+    """
+    ADF & KPSS untuk setiap level differencing 0..max_d (memoized)
+
+    Args:
+        values: Deret waktu (array / Series)
+        max_d: Order differencing tertinggi yang diuji
+        kpss_regression: 'c' (level) atau 'ct' (trend)
+        alpha: Tingkat signifikansi
+        max_workers: Jumlah thread (default min(jumlah level, jumlah CPU))
+
+    Returns:
+        dict: levels (hasil per d), d_adf / d_kpss / d (d terkecil yang
+        stasioner menurut ADF, KPSS, dan keduanya; None jika tidak ada), key
+    """
+    values = np.asarray(values, dtype=float)
+    options = {'max_d': int(max_d), 'kpss_regression': kpss_regression, 'alpha': float(alpha)}
+    key = _key('levels', values, options)
+
+    def compute():
+        series = difference_levels(values, max_d)
+        workers = min(len(series), max_workers or os.cpu_count() or 1)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                levels = list(executor.map(
+                    lambda item: _test_level(item[0], item[1], kpss_regression, alpha), enumerate(series)
+                ))
+        else:
+            levels = [_test_level(d, level, kpss_regression, alpha) for d, level in enumerate(series)]
+        return {
+            **options,
+            'levels': levels,
+            'd_adf': _first_level(levels, ('adf',)),
+            'd_kpss': _first_level(levels, ('kpss',)),
+            'd': _first_level(levels, ('adf', 'kpss'))
+        }
+
+    return {**_memoized(key, compute), 'key': key}
+
+
+def estimate_d(values, test='kpss', max_d=DEFAULT_MAX_D):
+    """pmdarima ndiffs (dipakai mode auto retrain_model), memoized per hash data"""
+    values = np.asarray(values, dtype=float)
+    key = _key('ndiffs', values, {'test': test, 'max_d': int(max_d)})
+
+    def compute():
+        from pmdarima.arima import ndiffs
+        return {'d': int(ndiffs(values, test=test, max_d=max_d))}
+
+    return _memoized(key, compute)['d']
@@ -8,83 +8,36 @@ matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
 import io
 import base64
-from statsmodels.tsa.statespace.sarimax import SARIMAX
-from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
 from statsmodels.stats.diagnostic import acorr_ljungbox
-from statsmodels.tsa.stattools import adfuller, kpss  # Uji stasioneritas
 from scipy import stats
 from sklearn.metrics import mean_absolute_error, mean_squared_error
-from pmdarima import auto_arima
 from services.database_service import save_training_history
+from services.predict_service import build_forecast_table
+from services.model_artifact import save_model_artifact
+from services import data_store
+from services.order_search import build_order_grid, search_orders
+from services.fit_cache import fit_sarimax
+from services.stationarity import analyze_stationarity, estimate_d
+from services.correlation import correlations, identify_order, plot_correlation
 
 def test_stationarity(data, series_name="Series"):
     """
     Uji stasioneritas menggunakan Augmented Dickey-Fuller (ADF) dan KPSS test
+    (data asli, d=0). Hasil diambil dari services.stationarity yang menguji
+    semua level differencing sekaligus dan di-memoize per hash data.
     
     Returns:
         dict: Hasil uji stasioneritas dengan interpretasi
     """
-    results = {
+    analysis = analyze_stationarity(data)
+    level = analysis['levels'][0]
+    return {
         'series_name': series_name,
-        'adf': {},
-        'kpss': {},
-        'conclusion': ''
+        'adf': level['adf'],
+        'kpss': level['kpss'],
+        'conclusion': level['conclusion'],
+        'differencing': analysis
     }
-    
-    # 1. Augmented Dickey-Fuller Test (H0: Data memiliki unit root / tidak stasioner)
-    try:
-        adf_result = adfuller(data, autolag='AIC')
-        results['adf'] = {
-            'test_statistic': float(adf_result[0]),
-            'p_value': float(adf_result[1]),
-            'critical_values': {k: float(v) for k, v in adf_result[4].items()},
-            'used_lag': int(adf_result[2]),
-            'n_obs': int(adf_result[3]),
-            'is_stationary': adf_result[1] < 0.05  # p-value < 0.05 = reject H0 = stasioner
-        }
-        
-        # Interpretasi ADF
-        if results['adf']['is_stationary']:
-            adf_interpretation = f"✓ Stasioner (p-value={adf_result[1]:.4f} < 0.05)"
-        else:
-            adf_interpretation = f"✗ Tidak Stasioner (p-value={adf_result[1]:.4f} ≥ 0.05)"
-        results['adf']['interpretation'] = adf_interpretation
-        
-    except Exception as e:
-        print(f"Warning: ADF test failed: {e}")
-        results['adf']['error'] = str(e)
-    
-    # 2. KPSS Test (H0: Data stasioner)
-    try:
-        kpss_result = kpss(data, regression='ct', nlags='auto')
-        results['kpss'] = {
-            'test_statistic': float(kpss_result[0]),
-            'p_value': float(kpss_result[1]),
-            'critical_values': {k: float(v) for k, v in kpss_result[3].items()},
-            'used_lag': int(kpss_result[2]),
-            'is_stationary': kpss_result[1] > 0.05  # p-value > 0.05 = fail to reject H0 = stasioner
-        }
-        
-        # Interpretasi KPSS
-        if results['kpss']['is_stationary']:
-            kpss_interpretation = f"✓ Stasioner (p-value={kpss_result[1]:.4f} > 0.05)"
-        else:
-            kpss_interpretation = f"✗ Tidak Stasioner (p-value={kpss_result[1]:.4f} ≤ 0.05)"
-        results['kpss']['interpretation'] = kpss_interpretation
-        
-    except Exception as e:
-        print(f"Warning: KPSS test failed: {e}")
-        results['kpss']['error'] = str(e)
-    
-    # Kesimpulan gabungan
-    if results['adf'].get('is_stationary') and results['kpss'].get('is_stationary'):
-        results['conclusion'] = "STASIONER (ADF & KPSS setuju)"
-    elif not results['adf'].get('is_stationary') and not results['kpss'].get('is_stationary'):
-        results['conclusion'] = "TIDAK STASIONER (ADF & KPSS setuju) - Perlu differencing"
-    else:
-        results['conclusion'] = "HASIL BERBEDA (Perlu analisis lebih lanjut)"
-    
-    return results
 
 def plot_to_base64(fig):
     """Convert matplotlib figure to base64 string"""
@@ -100,10 +53,17 @@ def generate_preprocessing_plots(y, y_train, y_test, train_size):
     """Generate preprocessing visualization plots"""
     plots = {}
     
+    # ACF & PACF dihitung sekali (cache services.correlation) untuk kedua plot
+    try:
+        correlation = correlations(y, nlags=20)
+    except Exception as e:
+        print(f"Warning: ACF/PACF failed: {e}")
+        correlation = None
+    
     # 1. ACF Plot
     try:
         fig, ax = plt.subplots(figsize=(10, 4))
-        plot_acf(y, lags=20, ax=ax)
+        plot_correlation(ax, correlation, 'acf')
         ax.set_title('Autocorrelation Function (ACF)', fontsize=12, fontweight='bold')
         ax.set_xlabel('Lag')
         ax.set_ylabel('Correlation')
@@ -115,7 +75,7 @@ def generate_preprocessing_plots(y, y_train, y_test, train_size):
     # 2. PACF Plot
     try:
         fig, ax = plt.subplots(figsize=(10, 4))
-        plot_pacf(y, lags=20, ax=ax, method='ywm')
+        plot_correlation(ax, correlation, 'pacf')
         ax.set_title('Partial Autocorrelation Function (PACF)', fontsize=12, fontweight='bold')
         ax.set_xlabel('Lag')
         ax.set_ylabel('Correlation')
@@ -158,11 +118,8 @@ def generate_preprocessing_plots(y, y_train, y_test, train_size):
     
     return plots
 
-def generate_residual_diagnostics(residuals):
-    """
-    Generate residual diagnostic plots and statistical tests
-    Returns dict with plots and test results
-    """
+def generate_residual_plots(residuals):
+    """Generate residual diagnostic plots (residual, ACF residual, Q-Q)"""
     diagnostics = {}
     
     # 1. Residual Plot Over Time
@@ -183,7 +140,7 @@ def generate_residual_diagnostics(residuals):
     # 2. ACF Plot of Residuals (White Noise Check)
     try:
         fig, ax = plt.subplots(figsize=(10, 4))
-        plot_acf(residuals, lags=min(20, len(residuals)//2), ax=ax)
+        plot_correlation(ax, correlations(residuals, nlags=min(20, len(residuals)//2)), 'acf')
         ax.set_title('ACF of Residuals (White Noise Test)', fontsize=12, fontweight='bold')
         ax.set_xlabel('Lag')
         ax.set_ylabel('Autocorrelation')
@@ -203,6 +160,12 @@ def generate_residual_diagnostics(residuals):
         print(f"Warning: Q-Q plot failed: {e}")
         diagnostics['qq_plot'] = None
     
+    return diagnostics
+
+def residual_statistics(residuals):
+    """Uji statistik residual (Ljung-Box, Jarque-Bera) dan ringkasan nilainya"""
+    diagnostics = {}
+    
     # 4. Ljung-Box Test (White Noise)
     try:
         lb_test = acorr_ljungbox(residuals, lags=min(10, len(residuals)//5), return_df=True)
@@ -235,15 +198,45 @@ def generate_residual_diagnostics(residuals):
     
     return diagnostics
 
-def retrain_model(train_test_split=0.8, order_mode='auto', manual_order=None, forecast_years=3):
+TOTAL_TRAINING_STEPS = 9
+
+# Cara membuat model final (semua data) dari hasil fit data training:
+# - 'warm'  : fit ulang di semua data, mulai dari parameter hasil fit training
+# - 'full'  : fit ulang dari awal (cara lama, paling lambat)
+# - 'append': tanpa fit ulang, hasil fit training diperluas dengan data test
+FINAL_FIT_MODES = ('warm', 'full', 'append')
+
+def fit_final_model(train_result, y, exog, order, y_test, exog_test, final_fit='warm'):
+    """
+    Buat model final untuk forecast dari hasil fit data training
+    
+    Returns:
+        SARIMAXResults atas seluruh data (y, exog)
+    """
+    if final_fit not in FINAL_FIT_MODES:
+        raise ValueError(f"final_fit harus salah satu dari {FINAL_FIT_MODES}")
+    
+    if final_fit == 'append':
+        return train_result.append(y_test, exog=exog_test, refit=False)
+    
+    if final_fit == 'warm':
+        return fit_sarimax(y, exog, order, fit_kwargs={'start_params': np.asarray(train_result.params)})
+    return fit_sarimax(y, exog, order)
+
+def retrain_model(train_test_split=0.8, order_mode='auto', manual_order=None, forecast_years=3, progress_callback=None, final_fit='warm', patience=None):
     """
     Retrain ARIMAX model dengan data terbaru
     
     Args:
         train_test_split (float): Ratio untuk train data (0.0-1.0). Default 0.8 (80% training, 20% testing)
-        order_mode (str): 'auto' untuk auto_arima atau 'manual' untuk set manual. Default 'auto'
+        order_mode (str): 'auto' untuk pencarian order paralel (order_search) atau 'manual' untuk set manual. Default 'auto'
         manual_order (tuple): (p,d,q) jika order_mode='manual'. Default None
         forecast_years (int): Number of years to forecast in dashboard. Default 3
+        progress_callback (callable): Dipanggil dengan dict step setiap kali satu
+            dari TOTAL_TRAINING_STEPS step preprocessing selesai (untuk job background)
+        final_fit (str): Cara membuat model final, salah satu FINAL_FIT_MODES. Default 'warm'
+        patience (int): Pembatalan dini pencarian order (lihat order_search.search_orders).
+            Default None: semua kandidat di-fit, order terpilih = hasil grid penuh
     """
     try:
         # Start timer
@@ -256,48 +249,21 @@ def retrain_model(train_test_split=0.8, order_mode='auto', manual_order=None, fo
                 "message": "File data tidak ditemukan. Lakukan fetch/upload data terlebih dahulu."
             }
         
-        energy = pd.read_csv("data/raw/energy.csv")
-        gdp = pd.read_csv("data/raw/gdp.csv")
-        
-        # Identifikasi kolom tahun
-        energy_year_col = "Year" if "Year" in energy.columns else "year"
-        gdp_year_col = "year" if "year" in gdp.columns else "Year"
-        
-        # Identifikasi kolom nilai energi
-        energy_value_col = None
-        for col in ["fossil_fuels__twh", "fossil_fuels", "value", "Energy"]:
-            if col in energy.columns:
-                energy_value_col = col
-                break
-        
-        if not energy_value_col:
-            return {
-                "status": "error",
-                "message": f"Kolom nilai energi tidak ditemukan. Kolom tersedia: {list(energy.columns)}"
-            }
-        
-        # Validasi kolom GDP
-        if "gdp" not in gdp.columns and "GDP" not in gdp.columns:
+        # Dataset ter-normalisasi dari data store (kolom year/energy/gdp,
+        # parsing CSV & deteksi nama kolom sudah dilakukan saat fetch/upload)
+        try:
+            dataset = data_store.get_dataset()
+        except ValueError as column_error:
             return {
                 "status": "error",
-                "message": f"Kolom GDP tidak ditemukan. Kolom tersedia: {list(gdp.columns)}"
+                "message": str(column_error)
             }
         
-        gdp_value_col = "gdp" if "gdp" in gdp.columns else "GDP"
-        
-        # Standardize column names untuk merge
-        energy_clean = energy[[energy_year_col, energy_value_col]].copy()
-        energy_clean.columns = ["year", "energy"]
-        
-        gdp_clean = gdp[[gdp_year_col, gdp_value_col]].copy()
-        gdp_clean.columns = ["year", "gdp"]
-        
-        # Remove duplicates dan sort
-        energy_clean = energy_clean.drop_duplicates(subset=["year"]).sort_values("year")
-        gdp_clean = gdp_clean.drop_duplicates(subset=["year"]).sort_values("year")
+        energy_clean = dataset.loc[dataset["has_energy"], ["year", "energy"]].reset_index(drop=True)
+        gdp_clean = dataset.loc[dataset["has_gdp"], ["year", "gdp"]].reset_index(drop=True)
         
         # INNER JOIN - ambil hanya tahun yang ada di kedua dataset
-        df = pd.merge(energy_clean, gdp_clean, on="year", how="inner")
+        df = dataset.loc[dataset["has_energy"] & dataset["has_gdp"], ["year", "energy", "gdp"]].reset_index(drop=True)
         
         # Validasi: harus ada minimal 10 data points untuk training
         if len(df) < 10:
@@ -315,6 +281,23 @@ def retrain_model(train_test_split=0.8, order_mode='auto', manual_order=None, fo
         # CAPTURE PREPROCESSING STEPS FOR DISPLAY IN HISTORY
         # ==================================================================
         preprocessing_steps = []
+        step_timer = {'last': start_time}
+        
+        def add_step(step):
+            # Catat durasi step dan kirim event progress (jika dijalankan sebagai job)
+            now = time.time()
+            step['duration'] = round(now - step_timer['last'], 3)
+            step_timer['last'] = now
+            preprocessing_steps.append(step)
+            if progress_callback:
+                progress_callback({
+                    "step": step['step'],
+                    "total_steps": TOTAL_TRAINING_STEPS,
+                    "title": step['title'],
+                    "status": step['status'],
+                    "duration": step['duration'],
+                    "elapsed": round(now - start_time, 3)
+                })
         
         # STEP 1: Identifikasi Data
         step1 = {
@@ -330,7 +313,7 @@ def retrain_model(train_test_split=0.8, order_mode='auto', manual_order=None, fo
             ],
             "status": "success"
         }
-        preprocessing_steps.append(step1)
+        add_step(step1)
         
         # STEP 2: Pengecekan Missing Values
         total_records = len(df)
@@ -389,7 +372,7 @@ def retrain_model(train_test_split=0.8, order_mode='auto', manual_order=None, fo
                 "status": "success"
             }
         
-        preprocessing_steps.append(step2)
+        add_step(step2)
         print(f"{'='*60}\n")
         
         # Prepare data for ARIMAX
@@ -410,7 +393,7 @@ def retrain_model(train_test_split=0.8, order_mode='auto', manual_order=None, fo
             ],
             "status": "info"
         }
-        preprocessing_steps.append(step3)
+        add_step(step3)
         
         # STEP 4: Uji Stasioneritas (ADF & KPSS Test)
         print(f"{'='*60}")
@@ -458,7 +441,7 @@ def retrain_model(train_test_split=0.8, order_mode='auto', manual_order=None, fo
             ],
             "status": "success" if stationarity_test['adf'].get('is_stationary') else "warning"
         }
-        preprocessing_steps.append(step4)
+        add_step(step4)
         print(f"{'='*60}\n")
         
         # Train-test split untuk evaluasi (gunakan parameter dari user)
@@ -481,13 +464,32 @@ def retrain_model(train_test_split=0.8, order_mode='auto', manual_order=None, fo
             ],
             "status": "success"
         }
-        preprocessing_steps.append(step5)
-        
-        # Generate preprocessing plots
-        print("Generating visualization plots...")
-        viz_plots = generate_preprocessing_plots(y, y_train, y_test, train_size)
+        add_step(step5)
+        
+        # Plot tidak di-render di sini: simpan array-nya saja, PNG dibuat
+        # saat pertama kali diminta (plot_store.get_plot_file)
+        plot_data = {
+            'y_values': y.values,
+            'y_index': np.asarray(y.index),
+            'train_size': train_size
+        }
         
         # STEP 6: Identifikasi Parameter ACF & PACF
+        # Lag signifikan ACF/PACF pada data training yang sudah di-differencing
+        # (d dari uji stasioneritas; korelasi yang sama dipakai ulang oleh plot)
+        acf_pacf_details = []
+        identify_d = stationarity_test['differencing']['d']
+        if identify_d is None:
+            identify_d = stationarity_test['differencing']['max_d']
+        try:
+            identified = identify_order(correlations(y_train.values, nlags=20, d=identify_d))
+            acf_pacf_details = [
+                f"🔎 Lag signifikan (d={identify_d}) PACF: {identified['p_candidates'] or '-'}, ACF: {identified['q_candidates'] or '-'}",
+                f"   → Identifikasi ACF/PACF: p={identified['p']}, d={identify_d}, q={identified['q']}"
+            ]
+        except Exception as e:
+            print(f"Warning: ACF/PACF identification failed: {e}")
+        
         step6 = {
             "step": 6,
             "title": "Identifikasi Parameter (p,d,q)",
@@ -496,30 +498,40 @@ def retrain_model(train_test_split=0.8, order_mode='auto', manual_order=None, fo
                 "📊 ACF Plot digunakan untuk identifikasi MA order (q)",
                 "📊 PACF Plot digunakan untuk identifikasi AR order (p)",
                 "💡 Grafik menunjukkan korelasi lag yang signifikan",
-                "⚠️ Nilai p,d,q bisa ditentukan otomatis (auto_arima) atau manual"
+                *acf_pacf_details,
+                "⚠️ Nilai p,d,q bisa ditentukan otomatis (grid search paralel) atau manual"
             ],
             "status": "success"
         }
-        preprocessing_steps.append(step6)
+        add_step(step6)
         
         # Determine ARIMA order based on mode
+        order_search = None
         if order_mode == 'auto':
-            print("Using AUTO ARIMA to find best parameters...")
-            # Auto ARIMA untuk mencari parameter optimal
-            auto_model = auto_arima(
-                y_train,
-                exogenous=exog_train,
-                start_p=1, start_q=1,
-                max_p=5, max_q=10,
-                d=None,  # Let auto_arima determine d
-                seasonal=False,
-                stepwise=True,
-                suppress_warnings=True,
-                error_action='ignore',
-                trace=True  # Print progress
+            print("Using parallel order search to find best parameters...")
+            # Tentukan d dengan KPSS test (sama seperti auto_arima d=None)
+            d = estimate_d(y_train, test='kpss', max_d=2)
+            candidates = build_order_grid(d, max_p=5, max_q=10)
+            
+            order_search = search_orders(
+                y_train, exog_train, candidates,
+                y_test=y_test, exog_test=exog_test,
+                criterion='aic', patience=patience
             )
-            best_order = auto_model.order
-            print(f"Auto ARIMA found optimal order: {best_order}")
+            best_order = order_search['best_order']
+            if best_order is None:
+                return {
+                    "status": "error",
+                    "message": "Pencarian order gagal: tidak ada kandidat yang berhasil di-fit"
+                }
+            print(f"Order search found optimal order: {best_order} "
+                  f"({len(order_search['results'])} kandidat, {order_search['elapsed_seconds']:.2f}s)")
+            
+            top_candidates = [
+                f"   {row['rank']}. ({row['p']},{row['d']},{row['q']}) - AIC {row['aic']:.2f}"
+                + (f", MAPE {row['mape']:.2f}%" if row.get('mape') is not None else "")
+                for row in order_search['results'][:5] if row.get('rank')
+            ]
             
             # STEP 6: Auto ARIMA
             step6 = {
@@ -532,7 +544,11 @@ def retrain_model(train_test_split=0.8, order_mode='auto', manual_order=None, fo
                     f"   - p (AR): {best_order[0]} - Autoregressive order",
                     f"   - d (I): {best_order[1]} - Differencing order",
                     f"   - q (MA): {best_order[2]} - Moving Average order",
-                    f"🎯 Parameter dipilih berdasarkan AIC terendah"
+                    f"🎯 Parameter dipilih berdasarkan AIC terendah",
+                    f"⚡ {len(order_search['results'])} kandidat di-fit paralel dalam {order_search['elapsed_seconds']:.2f}s"
+                    + (f" ({len(order_search['cancelled'])} dibatalkan lebih awal)" if order_search['cancelled'] else ""),
+                    f"🏆 Peringkat kandidat teratas:",
+                    *top_candidates
                 ],
                 "status": "success"
             }
@@ -562,7 +578,7 @@ def retrain_model(train_test_split=0.8, order_mode='auto', manual_order=None, fo
                 "status": "success"
             }
         
-        preprocessing_steps.append(step6)
+        add_step(step6)
         
         print(f"Training with {len(df)} records (train: {train_size}, test: {len(y_test)})")
         
@@ -581,18 +597,17 @@ def retrain_model(train_test_split=0.8, order_mode='auto', manual_order=None, fo
             ],
             "status": "success"
         }
-        preprocessing_steps.append(step7)
+        add_step(step7)
         
         # Train ARIMAX model dengan parameter optimal
-        model = SARIMAX(
-            y_train,
-            exog=exog_train,
-            order=best_order,
-            enforce_stationarity=False,
-            enforce_invertibility=False
-        )
-        
-        result = model.fit(disp=False)
+        # Mode auto: kandidat terpilih sudah di-fit saat pencarian order,
+        # parameternya dipakai sebagai titik awal optimizer
+        best_row = None
+        if order_search:
+            best_row = next((row for row in order_search['results'] if row.get('rank') == 1), None)
+        fit_kwargs = {'start_params': best_row['params']} if best_row and best_row.get('params') else None
+        # Fit yang sama (data, order, split, opsi) diambil dari cache disk
+        result = fit_sarimax(y_train, exog_train, best_order, fit_kwargs=fit_kwargs)
         
         # Predict on test set untuk evaluasi
         predictions = result.forecast(steps=len(y_test), exog=exog_test)
@@ -625,11 +640,13 @@ def retrain_model(train_test_split=0.8, order_mode='auto', manual_order=None, fo
             ],
             "status": "success" if mape < 20 else "warning" if mape < 30 else "danger"
         }
-        preprocessing_steps.append(step8)
+        add_step(step8)
         
         # Generate Residual Diagnostics
         print("Performing residual diagnostics...")
-        residual_diagnostics = generate_residual_diagnostics(residuals)
+        residual_diagnostics = residual_statistics(residuals)
+        plot_data['residual_values'] = np.asarray(residuals, dtype=float)
+        plot_data['residual_index'] = np.asarray(residuals.index)
         
         # STEP 9: Diagnosis Residual
         diag_details = [
@@ -673,53 +690,44 @@ def retrain_model(train_test_split=0.8, order_mode='auto', manual_order=None, fo
             "details": diag_details,
             "status": "success" if overall_pass else "warning"
         }
-        preprocessing_steps.append(step9)
-        
-        # Merge residual plots with existing viz_plots
-        viz_plots.update(residual_diagnostics)
-        
-        # Retrain dengan semua data untuk final model
-        final_model = SARIMAX(
-            y,
-            exog=exog,
-            order=best_order,
-            enforce_stationarity=False,
-            enforce_invertibility=False
-        )
+        add_step(step9)
         
-        final_result = final_model.fit(disp=False)
+        # Model final dengan semua data (warm start / append dari hasil fit training)
+        final_fit_start = time.time()
+        final_result = fit_final_model(result, y, exog, best_order, y_test, exog_test, final_fit)
+        print(f"Final model ({final_fit}) ready in {time.time() - final_fit_start:.2f}s")
         
         # Save final model with test data for dashboard
         os.makedirs("models", exist_ok=True)
         
-        # Save model object
-        joblib.dump(final_result, "models/arimax_model.pkl")
-        
         # Get test years for dashboard
         test_years = df['year'].iloc[train_size:].values
         
-        # Save model info with test data
-        model_info = {
-            'model': final_result,
-            'y_test': y_test.values,
-            'y_pred': predictions,
-            'test_years': test_years,
-            'order': best_order,
-            'metrics': {
+        # Calculate training duration
+        training_duration = time.time() - start_time
+        
+        # Save model sebagai artifact ringkas (params + state akhir + data test),
+        # bukan pickle SARIMAXResults penuh
+        save_model_artifact(
+            "models/arimax_model.pkl",
+            final_result,
+            y_test=y_test.values,
+            y_pred=np.asarray(predictions),
+            test_years=test_years,
+            metrics={
                 'mae': float(mae),
                 'rmse': float(rmse),
                 'mape': float(mape),
                 'r2': float(r2)
-            }
-        }
-        
-        # Calculate training duration
-        training_duration = time.time() - start_time
+            },
+            order_search=order_search['results'] if order_search else None
+        )
         
-        # Save complete model info with pickle for better object support
-        import pickle
-        with open("models/arimax_model.pkl", 'wb') as f:
-            pickle.dump(model_info, f)
+        # Precompute forecast table (skenario x horizon) untuk model baru
+        try:
+            build_forecast_table()
+        except Exception as table_error:
+            print(f"Warning: Failed to build forecast table: {table_error}")
         
         # Save metrics
         metrics = {
@@ -762,9 +770,9 @@ def retrain_model(train_test_split=0.8, order_mode='auto', manual_order=None, fo
                 energy_stats, 
                 gdp_stats, 
                 forecast_years, 
-                viz_plots, 
-                preprocessing_steps,
-                training_duration  # Pass training duration to database
+                preprocessing_steps=preprocessing_steps,
+                training_duration=training_duration,  # Pass training duration to database
+                plot_data=plot_data
             )
         except Exception as db_error:
             print(f"Warning: Failed to save to database: {db_error}")
@@ -784,7 +792,8 @@ def retrain_model(train_test_split=0.8, order_mode='auto', manual_order=None, fo
             "year_range": year_range,
             "metrics": metrics,
             "energy_stats": energy_stats,
-            "gdp_stats": gdp_stats
+            "gdp_stats": gdp_stats,
+            "order_search": order_search['results'] if order_search else None
         }
         
     except Exception as e:
@@ -1,27 +1,107 @@
 import pandas as pd
-import requests
 from flask import jsonify
 from datetime import datetime
+import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from services.data_mysql_service import save_energy_to_db, save_gdp_to_db, init_data_tables
 from services.database_service import save_data_update_history
+from services.energy_ingest import read_energy_csv, ENERGY_URL, ENERGY_ENTITY
+from services import http_cache
+from services import data_store
 
-def update_from_api():
-    # Headers untuk menghindari 403 Forbidden
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+# GDP constant 2015 US$ (dipakai training) dan current US$ (preview / update lama)
+GDP_URL = "https://api.worldbank.org/v2/country/IDN/indicator/NY.GDP.MKTP.KD?format=json&per_page=100"
+GDP_CURRENT_URL = "https://api.worldbank.org/v2/country/IDN/indicator/NY.GDP.MKTP.CD?format=json"
+
+# Batas waktu total download energi + GDP (detik); keduanya dibatalkan jika lewat
+FETCH_DEADLINE = 120
+# Retry per sumber (backoff eksponensial mulai http_cache.HTTP_RETRY_BACKOFF)
+FETCH_RETRIES = 2
+
+
+def download_sources(urls, deadline=FETCH_DEADLINE, retries=FETCH_RETRIES):
+    """
+    Download beberapa sumber sekaligus (thread pool) lewat http_cache
+
+    Latency total ~ sumber paling lambat, bukan jumlah semuanya. Satu deadline
+    berlaku untuk semua sumber; jika terlampaui, download yang masih berjalan
+    dibatalkan dan TimeoutError di-raise.
+
+    Args:
+        urls: dict {nama: url}
+        deadline: Batas waktu total (detik)
+        retries: Jumlah retry per sumber
+
+    Returns:
+        dict {nama: CachedResponse}
+    """
+    deadline_at = time.monotonic() + deadline
+    cancel_event = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max(len(urls), 1), thread_name_prefix="fetch")
+    futures = {
+        executor.submit(
+            http_cache.fetch, url,
+            retries=retries, deadline=deadline_at, cancel_event=cancel_event
+        ): name
+        for name, url in urls.items()
     }
-    
-    # OWID Energy
-    energy_url = "https://ourworldindata.org/grapher/fossil-fuel-primary-energy.csv?v=1&csvType=full&useColumnShortNames=true"
-    energy_df = pd.read_csv(energy_url, storage_options=headers)
+    try:
+        done, pending = wait(futures, timeout=max(deadline_at - time.monotonic(), 0))
+        if pending:
+            cancel_event.set()
+            names = ', '.join(sorted(futures[future] for future in pending))
+            raise TimeoutError(f"Batas waktu fetch {deadline} detik terlampaui ({names})")
+        return {futures[future]: future.result() for future in done}
+    finally:
+        # Jangan tunggu thread yang dibatalkan; request-nya berhenti sendiri
+        # karena timeout per request dibatasi deadline
+        cancel_event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
 
-    # Filter Indonesia
-    energy_df = energy_df[energy_df["Entity"] == "Indonesia"]
 
-    # World Bank GDP
-    gdp_url = "https://api.worldbank.org/v2/country/IDN/indicator/NY.GDP.MKTP.CD?format=json"
-    gdp_json = requests.get(gdp_url, headers=headers).json()
+# Status fetch terakhir yang berhasil: jika sumber tidak berubah (304) dan
+# parameter sama, fetch berikutnya tidak mem-parse & upsert ulang
+LAST_FETCH_FILE = "last_fetch.json"
+
+
+def _raw_file_versions():
+    """mtime data/raw/*.csv (berubah jika ada upload manual di antara fetch)"""
+    return {
+        name: os.path.getmtime(path) if os.path.exists(path) else None
+        for name, path in (("energy", "data/raw/energy.csv"), ("gdp", "data/raw/gdp.csv"))
+    }
+
+
+def _load_last_fetch():
+    path = os.path.join(http_cache.HTTP_CACHE_DIR, LAST_FETCH_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_last_fetch(signature, result):
+    os.makedirs(http_cache.HTTP_CACHE_DIR, exist_ok=True)
+    state = {'signature': signature, 'raw_files': _raw_file_versions(), 'result': result}
+    with open(os.path.join(http_cache.HTTP_CACHE_DIR, LAST_FETCH_FILE), 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+
+def update_from_api():
+    # User-Agent (hindari 403 Forbidden) sudah di-set di session http_cache
+    # OWID Energy & World Bank GDP diunduh bersamaan (cache disk)
+    downloads = download_sources({'energy': ENERGY_URL, 'gdp': GDP_CURRENT_URL})
+
+    # Streaming, hanya baris Indonesia yang disimpan
+    energy_df = read_energy_csv(downloads['energy'].path, entity=ENERGY_ENTITY)
+
+    with open(downloads['gdp'].path, encoding='utf-8') as f:
+        gdp_json = json.load(f)
 
     gdp_df = pd.DataFrame([
         {"year": int(d["date"]), "gdp": d["value"]}
@@ -33,6 +113,7 @@ def update_from_api():
 
     energy_df.to_csv("data/raw/energy.csv", index=False)
     gdp_df.to_csv("data/raw/gdp.csv", index=False)
+    data_store.update_store(energy_df, gdp_df)
 
     return {
         "energy_columns": list(energy_df.columns),
@@ -84,76 +165,67 @@ def fetch_data_from_api(data_type='all', start_year=1990, end_year=2023):
         # Ensure data directory exists
         os.makedirs("data/raw", exist_ok=True)
         
-        # Headers untuk menghindari 403 Forbidden
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
         energy_df = None
         gdp_df = None
         
-        # Fetch Energy Data
+        # Download energi & GDP bersamaan lewat cache disk (request kondisional,
+        # 304 -> payload lama), dengan satu deadline untuk keduanya
+        urls = {}
         if data_type in ['all', 'energy']:
-            energy_url = "https://ourworldindata.org/grapher/fossil-fuel-primary-energy.csv?v=1&csvType=full&useColumnShortNames=true"
-            energy_df = pd.read_csv(energy_url, storage_options=headers)
-            
-            entity_col = None
-            for col in ['Entity', 'entity', 'Country', 'country', 'location', 'Location', 'entityname']:
-                if col in energy_df.columns:
-                    entity_col = col
-                    break
-            
-            if entity_col:
-                # Try exact match first
-                filtered = energy_df[energy_df[entity_col].astype(str).str.lower().str.strip() == 'indonesia']
-                # If empty, try substring match
-                if filtered.empty:
-                    filtered = energy_df[energy_df[entity_col].astype(str).str.lower().str.contains('indonesia')]
-                energy_df = filtered
-                # If still empty, show available values for debugging
-                if energy_df.empty:
-                    available_entities = energy_df[entity_col].unique()
-                    return {
-                        "success": False,
-                        "message": f"Tidak ada data Indonesia di kolom '{entity_col}'. Nilai yang tersedia: {', '.join(map(str, available_entities))}"
-                    }
-                # Normalize column name to 'Entity'
-                if entity_col != 'Entity':
-                    energy_df = energy_df.rename(columns={entity_col: 'Entity'})
-            else:
-                return {
-                    "success": False,
-                    "message": f"Kolom Entity/Country tidak ditemukan. Kolom tersedia: {', '.join(energy_df.columns[:10])}"
-                }
-            
-            # Filter tahun - cek berbagai kemungkinan nama kolom
-            year_col = None
-            for col in ['Year', 'year', 'Date', 'date', 'Time', 'time']:
-                if col in energy_df.columns:
-                    year_col = col
-                    break
-            
-            if year_col:
-                energy_df = energy_df[
-                    (energy_df[year_col] >= start_year) & 
-                    (energy_df[year_col] <= end_year)
-                ]
-                # Normalize column name
-                if year_col != 'Year':
-                    energy_df = energy_df.rename(columns={year_col: 'Year'})
-            else:
+            urls['energy'] = ENERGY_URL
+        if data_type in ['all', 'gdp']:
+            urls['gdp'] = GDP_URL
+        try:
+            downloads = download_sources(urls)
+        except TimeoutError as timeout_error:
+            return {
+                "success": False,
+                "message": f"Gagal mengambil data dari API: {timeout_error}"
+            }
+        energy_raw = downloads.get('energy')
+        gdp_raw = downloads.get('gdp')
+        # Request gagal tetapi ada payload lama di cache: tetap diproses,
+        # kegagalannya dilaporkan ke pemanggil
+        stale_sources = sorted(name for name, raw in downloads.items() if raw.status == 'stale')
+        
+        # Sumber tidak berubah & parameter sama dengan fetch terakhir: data di
+        # CSV/MySQL sudah sesuai, lewati parsing dan upsert
+        signature = {
+            "data_type": data_type,
+            "start_year": start_year,
+            "end_year": end_year,
+            "energy_version": energy_raw.version if energy_raw else None,
+            "gdp_version": gdp_raw.version if gdp_raw else None
+        }
+        last_fetch = _load_last_fetch()
+        if (last_fetch and last_fetch.get('signature') == signature
+                and last_fetch.get('raw_files') == _raw_file_versions()
+                and all(raw.not_modified for raw in (energy_raw, gdp_raw) if raw)):
+            result = dict(last_fetch['result'])
+            result["unchanged"] = True
+            result["message"] = "Data sumber tidak berubah sejak fetch terakhir, data tidak diproses ulang. " + result.get("message", "")
+            return result
+        
+        # Fetch Energy Data
+        if energy_raw:
+            # Streaming: CSV OWID dibaca per chunk, hanya baris Indonesia di
+            # rentang tahun yang diminta yang disimpan (kolom Entity & Year
+            # sudah dinormalisasi)
+            try:
+                energy_df = read_energy_csv(energy_raw.path, ENERGY_ENTITY, start_year, end_year)
+            except ValueError as parse_error:
                 return {
                     "success": False,
-                    "message": f"Kolom Year tidak ditemukan. Kolom tersedia: {', '.join(energy_df.columns[:10])}"
+                    "message": str(parse_error)
                 }
         
         # Fetch GDP Data
-        if data_type in ['all', 'gdp']:
+        if gdp_raw:
             # Gunakan GDP constant 2015 US$ (NY.GDP.MKTP.KD) - lebih baik untuk time series
             # Data tersedia mulai 1960 (vs NY.GDP.MKTP.CD yang baru mulai 1967)
             # Constant price sudah adjusted for inflation
-            gdp_url = "https://api.worldbank.org/v2/country/IDN/indicator/NY.GDP.MKTP.KD?format=json&per_page=100"
-            gdp_json = requests.get(gdp_url, headers=headers).json()
+            with open(gdp_raw.path, encoding='utf-8') as f:
+                gdp_json = json.load(f)
             
             gdp_df = pd.DataFrame([
                 {"year": int(d["date"]), "gdp": d["value"]}
@@ -253,6 +325,12 @@ def fetch_data_from_api(data_type='all', start_year=1990, end_year=2023):
             except Exception as db_err:
                 print(f"Warning: Failed to save GDP to MySQL: {db_err}")
         
+        # Normalisasi sekali ke data store (dibaca training, validator, statistik)
+        try:
+            data_store.update_store(energy_df, gdp_df)
+        except Exception as store_err:
+            print(f"Warning: Failed to update data store: {store_err}")
+        
         # Save to history
         try:
             total_records = energy_records + gdp_records
@@ -263,10 +341,20 @@ def fetch_data_from_api(data_type='all', start_year=1990, end_year=2023):
                 records_updated=total_records,
                 status='success',
                 message=f"Energy: {energy_records} records, GDP: {gdp_records} records"
+                        + (f" (cache lama: {', '.join(stale_sources)})" if stale_sources else "")
             )
         except Exception as hist_err:
             print(f"Warning: Failed to save update history: {hist_err}")
         
+        if stale_sources:
+            result["staleSources"] = stale_sources
+            result["message"] += f" ⚠️ Gagal mengambil data terbaru ({', '.join(stale_sources)}), memakai data cache lama."
+        else:
+            try:
+                _save_last_fetch(signature, result)
+            except OSError as state_err:
+                print(f"Warning: Failed to save fetch state: {state_err}")
+        
         return result
         
     except Exception as e:
@@ -649,6 +737,12 @@ def upload_data_from_files(energy_file=None, gdp_file=None):
             except Exception as db_err:
                 print(f"Warning: Failed to save GDP to MySQL: {db_err}")
         
+        # Normalisasi sekali ke data store (dibaca training, validator, statistik)
+        try:
+            data_store.update_store(energy_df, gdp_df)
+        except Exception as store_err:
+            print(f"Warning: Failed to update data store: {store_err}")
+        
         # Save to history
         try:
             total_records = energy_records + gdp_records
@@ -689,26 +783,13 @@ def get_data_stats():
             "lastUpdate": "-"
         }
         
-        # Check energy file
-        energy_path = "data/raw/energy.csv"
-        if os.path.exists(energy_path):
-            energy_df = pd.read_csv(energy_path)
-            stats["energyCount"] = len(energy_df)
-            stats["lastUpdate"] = datetime.fromtimestamp(
-                os.path.getmtime(energy_path)
-            ).strftime("%d %b %Y %H:%M")
-        
-        # Check GDP file
-        gdp_path = "data/raw/gdp.csv"
-        if os.path.exists(gdp_path):
-            gdp_df = pd.read_csv(gdp_path)
-            stats["gdpCount"] = len(gdp_df)
-            
-            # Update last update time if GDP is newer
-            if os.path.exists(gdp_path):
-                gdp_time = datetime.fromtimestamp(os.path.getmtime(gdp_path))
-                if stats["lastUpdate"] == "-" or gdp_time > datetime.strptime(stats["lastUpdate"], "%d %b %Y %H:%M"):
-                    stats["lastUpdate"] = gdp_time.strftime("%d %b %Y %H:%M")
+        info = data_store.get_store_info()
+        if info:
+            stats["energyCount"] = info["energy_records"]
+            stats["gdpCount"] = info["gdp_records"]
+            raw_times = [mtime for mtime in info["raw_mtimes"].values() if mtime]
+            if raw_times:
+                stats["lastUpdate"] = datetime.fromtimestamp(max(raw_times)).strftime("%d %b %Y %H:%M")
         
         return stats
         
@@ -725,32 +806,25 @@ def get_energy_data(limit=10):
     Get preview data energi
     """
     try:
-        energy_path = "data/raw/energy.csv"
-        if not os.path.exists(energy_path):
+        energy_df = data_store.get_energy_series()
+        if energy_df is None:
             return []
         
-        energy_df = pd.read_csv(energy_path)
-        
-        # Sort by year descending
-        if "Year" in energy_df.columns:
-            energy_df = energy_df.sort_values("Year", ascending=False)
-        
-        # Get limited records
-        energy_df = energy_df.head(limit)
+        # Tahun terbaru dulu
+        energy_df = energy_df.sort_values("year", ascending=False).head(limit)
         
         # Prepare data for frontend
-        records = []
-        for _, row in energy_df.iterrows():
-            # Coba berbagai nama kolom yang mungkin untuk nilai energi
-            value = row.get("fossil_fuels__twh", row.get("fossil_fuels", row.get("value", 0)))
-            
-            records.append({
-                "year": row.get("Year", row.get("year", "-")),
-                "country": row.get("Entity", "Indonesia"),
-                "value": value,
+        updated = datetime.now().strftime("%d %b %Y")
+        records = [
+            {
+                "year": int(year),
+                "country": ENERGY_ENTITY,
+                "value": float(value) if pd.notna(value) else None,
                 "unit": "TWh",  # Tambahkan info satuan
-                "updated": datetime.now().strftime("%d %b %Y")
-            })
+                "updated": updated
+            }
+            for year, value in zip(energy_df["year"], energy_df["energy"])
+        ]
         
         return records
         
@@ -764,29 +838,25 @@ def get_gdp_data(limit=10):
     Get preview data GDP
     """
     try:
-        gdp_path = "data/raw/gdp.csv"
-        if not os.path.exists(gdp_path):
+        gdp_df = data_store.get_gdp_series()
+        if gdp_df is None:
             return []
         
-        gdp_df = pd.read_csv(gdp_path)
-        
-        # Sort by year descending
-        if "year" in gdp_df.columns:
-            gdp_df = gdp_df.sort_values("year", ascending=False)
-        
-        # Get limited records
-        gdp_df = gdp_df.head(limit)
+        # Tahun terbaru dulu
+        gdp_df = gdp_df.sort_values("year", ascending=False).head(limit)
         
         # Prepare data for frontend
-        records = []
-        for _, row in gdp_df.iterrows():
-            records.append({
-                "year": row.get("year", "-"),
+        updated = datetime.now().strftime("%d %b %Y")
+        records = [
+            {
+                "year": int(year),
                 "country": "Indonesia",
-                "value": row.get("gdp", 0),
+                "value": float(value) if pd.notna(value) else None,
                 "unit": "Billion USD",  # Tambahkan info satuan
-                "updated": datetime.now().strftime("%d %b %Y")
-            })
+                "updated": updated
+            }
+            for year, value in zip(gdp_df["year"], gdp_df["gdp"])
+        ]
         
         return records
         
@@ -797,18 +867,18 @@ def get_gdp_data(limit=10):
 
 def preview_api_data():
     # AMBIL LANGSUNG DARI API (BUKAN FILE)
-    energy_url = "https://ourworldindata.org/grapher/fossil-fuel-primary-energy.csv?v=1&csvType=full&useColumnShortNames=true"
-    energy_df = pd.read_csv(energy_url)
+    # Preview boleh memakai payload cache yang masih dalam PREVIEW_CACHE_TTL
+    energy_df = read_energy_csv(http_cache.fetch(ENERGY_URL, ttl=http_cache.PREVIEW_CACHE_TTL).path,
+                                entity=ENERGY_ENTITY)
 
     energy_preview = (
-        energy_df[energy_df["Entity"] == "Indonesia"]
+        energy_df
         .sort_values("Year", ascending=False)
         .head(5)
         .to_dict(orient="records")
     )
 
-    gdp_url = "https://api.worldbank.org/v2/country/IDN/indicator/NY.GDP.MKTP.CD?format=json"
-    gdp_json = requests.get(gdp_url).json()
+    gdp_json, _ = http_cache.fetch_json(GDP_CURRENT_URL, ttl=http_cache.PREVIEW_CACHE_TTL)
 
     gdp_preview = [
         {"year": d["date"], "gdp": d["value"]}
@@ -8,62 +8,57 @@ Menggunakan:
 
 import pandas as pd
 import numpy as np
-import mysql.connector
-from statsmodels.tsa.stattools import adfuller, kpss
+from services.db_pool import get_connection
+from services.stationarity import analyze_stationarity, difference_levels
 import matplotlib.pyplot as plt
 import warnings
 warnings.filterwarnings('ignore')
 
 def get_db_connection():
-    return mysql.connector.connect(
-        host='localhost',
-        user='root',
-        password='',
-        database='arimax_forecasting'
-    )
-
-def adf_test(series, name="Series"):
-    """Augmented Dickey-Fuller test"""
-    result = adfuller(series, autolag='AIC')
+    return get_connection()
+
+def adf_test(level, name="Series"):
+    """Augmented Dickey-Fuller test (hasil dari analyze_stationarity)"""
+    result = level['adf']
     
     print(f"\n{'='*80}")
     print(f"ADF Test untuk: {name}")
     print(f"{'='*80}")
-    print(f"ADF Statistic:     {result[0]:.6f}")
-    print(f"P-value:           {result[1]:.6f}")
+    print(f"ADF Statistic:     {result['test_statistic']:.6f}")
+    print(f"P-value:           {result['p_value']:.6f}")
     print(f"Critical Values:")
-    for key, value in result[4].items():
+    for key, value in result['critical_values'].items():
         print(f"  {key}: {value:.4f}")
     
-    if result[1] <= 0.05:
-        print(f"\n✓ STASIONER (p-value = {result[1]:.6f} < 0.05)")
+    if result['p_value'] <= 0.05:
+        print(f"\n✓ STASIONER (p-value = {result['p_value']:.6f} < 0.05)")
         print(f"  → Reject H0: Data TIDAK memiliki unit root")
         return True
     else:
-        print(f"\n✗ NON-STASIONER (p-value = {result[1]:.6f} >= 0.05)")
+        print(f"\n✗ NON-STASIONER (p-value = {result['p_value']:.6f} >= 0.05)")
         print(f"  → Fail to reject H0: Data memiliki unit root")
         print(f"  → Perlu differencing!")
         return False
 
-def kpss_test(series, name="Series"):
-    """KPSS test"""
-    result = kpss(series, regression='c', nlags='auto')
+def kpss_test(level, name="Series"):
+    """KPSS test (hasil dari analyze_stationarity)"""
+    result = level['kpss']
     
     print(f"\n{'='*80}")
     print(f"KPSS Test untuk: {name}")
     print(f"{'='*80}")
-    print(f"KPSS Statistic:    {result[0]:.6f}")
-    print(f"P-value:           {result[1]:.6f}")
+    print(f"KPSS Statistic:    {result['test_statistic']:.6f}")
+    print(f"P-value:           {result['p_value']:.6f}")
     print(f"Critical Values:")
-    for key, value in result[3].items():
+    for key, value in result['critical_values'].items():
         print(f"  {key}: {value:.4f}")
     
-    if result[1] >= 0.05:
-        print(f"\n✓ STASIONER (p-value = {result[1]:.6f} >= 0.05)")
+    if result['p_value'] >= 0.05:
+        print(f"\n✓ STASIONER (p-value = {result['p_value']:.6f} >= 0.05)")
         print(f"  → Fail to reject H0: Data stasioner")
         return True
     else:
-        print(f"\n✗ NON-STASIONER (p-value = {result[1]:.6f} < 0.05)")
+        print(f"\n✗ NON-STASIONER (p-value = {result['p_value']:.6f} < 0.05)")
         print(f"  → Reject H0: Data tidak stasioner")
         print(f"  → Perlu differencing!")
         return False
@@ -80,8 +75,12 @@ conn.close()
 
 print(f"\n✓ Data loaded: {len(data)} years ({data['year'].min()}-{data['year'].max()})")
 
-# Original series
+# Original series + semua level differencing, ADF & KPSS (KPSS regresi 'c')
+# untuk d=0..2 dihitung sekali
 original = data['fossil_fuels_twh'].values
+_, diff_1, diff_2 = difference_levels(original, max_d=2)
+analysis = analyze_stationarity(original, max_d=2, kpss_regression='c')
+level_0, level_1, level_2 = analysis['levels']
 print(f"\n{'='*80}")
 print(f"LEVEL 0: DATA ASLI (d=0)")
 print(f"{'='*80}")
@@ -99,11 +98,10 @@ print(f"  Max:    {np.max(original):.2f} TWh")
 print(f"  Range:  {np.max(original) - np.min(original):.2f} TWh")
 
 # Test stationarity level 0
-adf_result_0 = adf_test(original, "Data Asli (d=0)")
-kpss_result_0 = kpss_test(original, "Data Asli (d=0)")
+adf_result_0 = adf_test(level_0, "Data Asli (d=0)")
+kpss_result_0 = kpss_test(level_0, "Data Asli (d=0)")
 
 # First difference
-diff_1 = np.diff(original)
 print(f"\n{'='*80}")
 print(f"LEVEL 1: FIRST DIFFERENCE (d=1)")
 print(f"{'='*80}")
@@ -126,11 +124,10 @@ print(f"  Max:    {np.max(diff_1):.2f} TWh")
 print(f"  Range:  {np.max(diff_1) - np.min(diff_1):.2f} TWh")
 
 # Test stationarity level 1
-adf_result_1 = adf_test(diff_1, "First Difference (d=1)")
-kpss_result_1 = kpss_test(diff_1, "First Difference (d=1)")
+adf_result_1 = adf_test(level_1, "First Difference (d=1)")
+kpss_result_1 = kpss_test(level_1, "First Difference (d=1)")
 
 # Second difference
-diff_2 = np.diff(diff_1)
 print(f"\n{'='*80}")
 print(f"LEVEL 2: SECOND DIFFERENCE (d=2)")
 print(f"{'='*80}")
@@ -157,8 +154,8 @@ print(f"  Max:    {np.max(diff_2):.2f} TWh")
 print(f"  Range:  {np.max(diff_2) - np.min(diff_2):.2f} TWh")
 
 # Test stationarity level 2
-adf_result_2 = adf_test(diff_2, "Second Difference (d=2)")
-kpss_result_2 = kpss_test(diff_2, "Second Difference (d=2)")
+adf_result_2 = adf_test(level_2, "Second Difference (d=2)")
+kpss_result_2 = kpss_test(level_2, "Second Difference (d=2)")
 
 # Summary
 print(f"\n{'='*80}")
@@ -168,20 +165,9 @@ print(f"{'='*80}")
 print(f"\n{'Level':<20} {'ADF p-value':<15} {'ADF Result':<20} {'KPSS p-value':<15} {'KPSS Result':<20}")
 print(f"{'-'*90}")
 
-levels = [
-    ("Original (d=0)", adf_test(original, ""), kpss_test(original, "")),
-    ("Diff_1 (d=1)", adf_test(diff_1, ""), kpss_test(diff_1, "")),
-    ("Diff_2 (d=2)", adf_test(diff_2, ""), kpss_test(diff_2, ""))
-]
-
-# Re-run tests without printing
-adf_0 = adfuller(original, autolag='AIC')[1]
-adf_1 = adfuller(diff_1, autolag='AIC')[1]
-adf_2 = adfuller(diff_2, autolag='AIC')[1]
-
-kpss_0 = kpss(original, regression='c', nlags='auto')[1]
-kpss_1 = kpss(diff_1, regression='c', nlags='auto')[1]
-kpss_2 = kpss(diff_2, regression='c', nlags='auto')[1]
+# p-value dari hasil yang sama (tanpa menjalankan ulang uji)
+adf_0, adf_1, adf_2 = (level['adf']['p_value'] for level in analysis['levels'])
+kpss_0, kpss_1, kpss_2 = (level['kpss']['p_value'] for level in analysis['levels'])
 
 print(f"{'Original (d=0)':<20} {adf_0:<15.6f} {'Non-stasioner':<20} {kpss_0:<15.6f} {'Non-stasioner':<20}")
 print(f"{'Diff_1 (d=1)':<20} {adf_1:<15.6f} {'Non-stasioner' if adf_1 >= 0.05 else 'Stasioner':<20} {kpss_1:<15.6f} {'Non-stasioner' if kpss_1 < 0.05 else 'Stasioner':<20}")
@@ -7,16 +7,14 @@ Bandingkan:
 
 import pandas as pd
 import numpy as np
-import mysql.connector
-from statsmodels.tsa.statespace.sarimax import SARIMAX
+from services.db_pool import get_connection
+from services.fit_cache import fit_sarimax
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 import warnings
 warnings.filterwarnings('ignore')
 
 def get_db_connection():
-    return mysql.connector.connect(
-        host='localhost', user='root', password='', database='arimax_forecasting'
-    )
+    return get_connection()
 
 def calculate_mape(actual, predicted):
     actual, predicted = np.array(actual), np.array(predicted)
@@ -50,8 +48,7 @@ results = []
 # Model 1: ARIMA(0,2,1) - Auto_arima choice for ARIMA
 print("\n[1/3] ARIMA(0,2,1) - Order yang dipilih auto_arima TANPA GDP...")
 try:
-    model = SARIMAX(y_train, order=(0, 2, 1), enforce_stationarity=False, enforce_invertibility=False)
-    fitted = model.fit(disp=False)
+    fitted = fit_sarimax(y_train, None, (0, 2, 1))
     pred = fitted.forecast(steps=len(test_data))
     
     mape = calculate_mape(y_test, pred)
@@ -77,8 +74,7 @@ except Exception as e:
 # Model 2: ARIMA(3,2,1) - Same order as ARIMAX but without GDP
 print("\n[2/3] ARIMA(3,2,1) - Order yang sama dengan ARIMAX tapi TANPA GDP...")
 try:
-    model = SARIMAX(y_train, order=(3, 2, 1), enforce_stationarity=False, enforce_invertibility=False)
-    fitted = model.fit(disp=False)
+    fitted = fit_sarimax(y_train, None, (3, 2, 1))
     pred = fitted.forecast(steps=len(test_data))
     
     mape = calculate_mape(y_test, pred)
@@ -104,8 +100,7 @@ except Exception as e:
 # Model 3: ARIMAX(3,2,1) - With GDP
 print("\n[3/3] ARIMAX(3,2,1) - Order yang sama DENGAN GDP...")
 try:
-    model = SARIMAX(y_train, exog=X_train, order=(3, 2, 1), enforce_stationarity=False, enforce_invertibility=False)
-    fitted = model.fit(disp=False)
+    fitted = fit_sarimax(y_train, X_train, (3, 2, 1))
     pred = fitted.forecast(steps=len(test_data), exog=X_test)
     
     mape = calculate_mape(y_test, pred)